@@ -0,0 +1,101 @@
+# app/bedrock/client.py
+import logging
+import threading
+from typing import Optional
+
+import boto3
+from botocore.config import Config
+
+from .invoker import BedrockInvoker
+
+logger = logging.getLogger(__name__)
+
+
+class BedrockClientRegistry:
+    """
+    프로세스 전체에서 공유하는 Bedrock 클라이언트 레지스트리
+    - boto3 세션과 bedrock-runtime 클라이언트를 한 번만 생성해 모든 서비스가 재사용
+    - 커넥션 풀 크기, keep-alive, 타임아웃, 재시도 모드를 Settings 에서 설정
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.model_id = settings.BEDROCK_MODEL_ID
+        self._session: Optional[boto3.Session] = None
+        self._client = None
+        self._invoker: Optional[BedrockInvoker] = None
+        self._lock = threading.Lock()
+        # 호출 계층 생성은 클라이언트 생성(느림)과 다른 잠금 사용 (이벤트 루프에서 기다리지 않도록)
+        self._invoker_lock = threading.Lock()
+
+    def _build_config(self) -> Config:
+        return Config(
+            max_pool_connections=self.settings.BEDROCK_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=self.settings.BEDROCK_TCP_KEEPALIVE,
+            connect_timeout=self.settings.BEDROCK_CONNECT_TIMEOUT,
+            read_timeout=self.settings.BEDROCK_READ_TIMEOUT,
+            retries={
+                "max_attempts": self.settings.BEDROCK_MAX_ATTEMPTS,
+                "mode": self.settings.BEDROCK_RETRY_MODE,
+            },
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        """공유 클라이언트가 생성되었는지 여부"""
+        return self._client is not None
+
+    def warm_up(self):
+        """클라이언트를 미리 생성 (블로킹, 애플리케이션 시작 시 스레드에서 호출)"""
+        self.get_client()
+
+    def get_client(self):
+        """
+        공유 bedrock-runtime 클라이언트 반환 (최초 호출 시 생성)
+        - 생성은 블로킹이므로 이벤트 루프가 아닌 스레드(시작 시 warm_up, Bedrock 호출 스레드 풀)에서만 호출
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._session = boto3.Session(
+                        aws_access_key_id=self.settings.AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=self.settings.AWS_SECRET_ACCESS_KEY,
+                        region_name=self.settings.AWS_REGION
+                    )
+                    # boto3 클라이언트는 스레드 안전하므로 하나를 모든 호출 스레드가 공유
+                    self._client = self._session.client(
+                        "bedrock-runtime",
+                        config=self._build_config(),
+                        endpoint_url=self.settings.BEDROCK_ENDPOINT_URL,
+                    )
+                    logger.info(
+                        f"Bedrock 공유 클라이언트 생성 (pool: {self.settings.BEDROCK_MAX_POOL_CONNECTIONS}, "
+                        f"retry: {self.settings.BEDROCK_RETRY_MODE})"
+                    )
+        return self._client
+
+    def get_invoker(self) -> BedrockInvoker:
+        """
+        공유 클라이언트를 사용하는 비동기 호출 계층 반환
+        - 클라이언트는 만들지 않으므로 이벤트 루프에서 바로 호출 가능
+          (아직 없으면 첫 Bedrock 호출이 호출 스레드에서 생성)
+        """
+        if self._invoker is None:
+            with self._invoker_lock:
+                if self._invoker is None:
+                    self._invoker = BedrockInvoker(self.get_client, self.settings)
+        return self._invoker
+
+
+_registry: Optional[BedrockClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_bedrock_registry(settings) -> BedrockClientRegistry:
+    """프로세스 전체에서 공유하는 Bedrock 클라이언트 레지스트리 반환"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = BedrockClientRegistry(settings)
+    return _registry
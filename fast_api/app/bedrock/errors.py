@@ -0,0 +1,84 @@
+# app/bedrock/errors.py
+from typing import Iterator, Optional
+
+from botocore import exceptions as botocore_exceptions
+
+# 스로틀링 오류 코드 (ClientError 의 Error.Code, 스트림 예외 이벤트 이름)
+THROTTLING_ERROR_CODES = {"ThrottlingException", "TooManyRequestsException"}
+# 잠시 후 다시 시도하면 성공할 수 있는 오류 코드 / HTTP 상태
+TRANSIENT_ERROR_CODES = THROTTLING_ERROR_CODES | {
+    "InternalServerException",
+    "ServiceUnavailableException",
+    "ModelTimeoutException",
+    "ModelNotReadyException",
+}
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+# 응답을 받지 못한 네트워크 오류 (연결 / 읽기 시간 초과, 연결 끊김 - 모두 BotoCoreError 하위 클래스)
+TRANSIENT_BOTOCORE_ERRORS = (
+    botocore_exceptions.ReadTimeoutError,
+    botocore_exceptions.ConnectTimeoutError,
+    botocore_exceptions.EndpointConnectionError,
+    botocore_exceptions.ConnectionClosedError,
+)
+
+
+class BedrockStreamError(RuntimeError):
+    """
+    응답 스트림 도중 받은 예외 이벤트 ({"throttlingException": {...}} 등)
+    - code: 이벤트 이름을 ClientError 와 같은 형식으로 바꾼 오류 코드 (ThrottlingException)
+    - status_code: modelStreamErrorException 의 originalStatusCode (없으면 None)
+    """
+
+    def __init__(self, event: dict):
+        self.event = event
+        name = next(iter(event), "")
+        self.code = name[:1].upper() + name[1:]
+        detail = event.get(name) if isinstance(event.get(name), dict) else {}
+        self.status_code: Optional[int] = detail.get("originalStatusCode")
+        super().__init__(f"Bedrock 스트림 오류: {event}")
+
+
+def error_chain(error: BaseException) -> Iterator[BaseException]:
+    """error 와 그 원인 예외들 (서비스가 HTTPException 으로 감싼 원래 오류까지 확인)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def error_code(error: BaseException) -> Optional[str]:
+    """botocore ClientError 의 Error.Code 또는 스트림 예외 이벤트의 오류 코드"""
+    if isinstance(error, BedrockStreamError):
+        return error.code
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """botocore ClientError 응답의 HTTP 상태 또는 스트림 예외 이벤트의 원래 상태"""
+    if isinstance(error, BedrockStreamError):
+        return error.status_code
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return None
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    return any(
+        error_code(cause) in THROTTLING_ERROR_CODES or status_code(cause) == 429
+        for cause in error_chain(error)
+    )
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """스로틀링 / 일시적인 서버 오류 / 시간 초과 등 네트워크 오류인지 (오류 코드, HTTP 상태, 예외 타입으로 판단)"""
+    return any(
+        isinstance(cause, TRANSIENT_BOTOCORE_ERRORS)
+        or error_code(cause) in TRANSIENT_ERROR_CODES
+        or status_code(cause) in TRANSIENT_STATUS_CODES
+        for cause in error_chain(error)
+    )
@@ -0,0 +1,180 @@
+# app/bedrock/invoker.py
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Optional
+
+from ..utils.tracing import MODEL_CALL, RATE_LIMIT_WAIT, span
+from ..metrics import BEDROCK_IN_FLIGHT, BEDROCK_LATENCY, BEDROCK_THROTTLES, BEDROCK_TOKENS
+from .errors import BedrockStreamError, is_throttling_error
+from .rate_limiter import Priority, estimate_payload_tokens, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Bedrock 호출 전용 스레드 풀 (프로세스 전체에서 공유)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# 스트림 종료 표시
+_STREAM_END = object()
+
+
+def get_bedrock_executor(settings) -> ThreadPoolExecutor:
+    """
+    Bedrock 호출 전용 스레드 풀을 반환 (최초 호출 시 생성)
+    - 스레드 수가 곧 동시에 진행 가능한 모델 호출 수
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BEDROCK_MAX_CONCURRENCY,
+                    thread_name_prefix="bedrock",
+                )
+                logger.info(f"Bedrock 호출 스레드 풀 생성 (최대 {settings.BEDROCK_MAX_CONCURRENCY}개)")
+    return _executor
+
+
+class BedrockInvoker:
+    """
+    boto3 invoke_model 을 전용 스레드 풀에서 실행하는 비동기 호출 계층
+    - 동기 boto3 호출과 응답 본문 읽기가 이벤트 루프를 막지 않도록 함
+    - 모든 호출은 공유 속도 제한기를 거침 (우선순위가 높은 호출부터 통과)
+    - 호출 시간, 사용 토큰(응답 usage), 스로틀링 횟수를 호출한 서비스별로 기록
+    - boto3 클라이언트는 호출 스레드에서 client_factory 로 가져옴 (첫 호출 시 생성되어도 이벤트 루프를 막지 않음)
+    """
+
+    def __init__(self, client_factory: Callable[[], Any], settings):
+        self._client_factory = client_factory
+        self._executor = get_bedrock_executor(settings)
+        self.rate_limiter = get_rate_limiter(settings)
+
+    @property
+    def client(self):
+        # 호출 스레드 풀에서만 사용
+        return self._client_factory()
+
+    async def invoke(self, model_id: str, payload: dict, priority: int = Priority.BULK,
+                     service: str = "unknown") -> dict:
+        """모델을 호출하고 파싱된 응답 본문(dict)을 반환"""
+        estimated = await self._acquire(payload, priority)
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+        BEDROCK_IN_FLIGHT.labels(service).inc()
+        try:
+            with span(MODEL_CALL):
+                result = await loop.run_in_executor(self._executor, self._invoke_sync, model_id, payload)
+        except Exception as e:
+            self._record_failure(e, service)
+            raise
+        finally:
+            BEDROCK_IN_FLIGHT.labels(service).dec()
+            BEDROCK_LATENCY.labels(service, "invoke").observe(time.perf_counter() - start_time)
+        self._record_success(estimated, result.get('usage'), service)
+        return result
+
+    async def _acquire(self, payload: dict, priority: int) -> int:
+        estimated = estimate_payload_tokens(payload)
+        if self.rate_limiter is not None:
+            with span(RATE_LIMIT_WAIT):
+                await self.rate_limiter.acquire(estimated, priority)
+        return estimated
+
+    def _record_success(self, estimated: int, usage: Optional[dict], service: str):
+        used = None
+        if usage:
+            input_tokens = usage.get('input_tokens', 0)
+            output_tokens = usage.get('output_tokens', 0)
+            BEDROCK_TOKENS.labels(service, "input").inc(input_tokens)
+            BEDROCK_TOKENS.labels(service, "output").inc(output_tokens)
+            used = input_tokens + output_tokens
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_success(estimated, used)
+
+    def _record_failure(self, error: Exception, service: str):
+        if not is_throttling_error(error):
+            return
+        BEDROCK_THROTTLES.labels(service).inc()
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_throttle()
+
+    def _invoke_sync(self, model_id: str, payload: dict) -> dict:
+        response = self.client.invoke_model(
+            modelId=model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps(payload)
+        )
+        return json.loads(response['body'].read().decode("utf-8"))
+
+    async def invoke_stream(self, model_id: str, payload: dict, priority: int = Priority.BULK,
+                            service: str = "unknown") -> AsyncIterator[dict]:
+        """
+        응답 스트림 API(invoke_model_with_response_stream)로 모델을 호출
+        - 스트림 읽기는 전용 스레드 풀에서 수행하고, 이벤트(dict)를 도착하는 대로 반환
+        - 호출 측이 중간에 소비를 멈추면 스트림을 닫고 스레드를 반환
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 경우
+                cancelled.set()
+
+        def produce():
+            try:
+                response = self.client.invoke_model_with_response_stream(
+                    modelId=model_id,
+                    contentType="application/json",
+                    accept="application/json",
+                    body=json.dumps(payload)
+                )
+                stream = response['body']
+                try:
+                    for event in stream:
+                        if cancelled.is_set():
+                            break
+                        chunk = event.get('chunk')
+                        if chunk is None:
+                            # 스트림 도중 발생한 예외 이벤트 (throttlingException 등)
+                            raise BedrockStreamError(event)
+                        put(json.loads(chunk['bytes'].decode("utf-8")))
+                finally:
+                    stream.close()
+            except Exception as e:
+                put(e)
+            finally:
+                put(_STREAM_END)
+
+        estimated = await self._acquire(payload, priority)
+        start_time = time.perf_counter()
+        BEDROCK_IN_FLIGHT.labels(service).inc()
+        loop.run_in_executor(self._executor, produce)
+        usage = {}
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    self._record_failure(item, service)
+                    raise item
+                # 입력 토큰은 message_start, 출력 토큰은 message_delta 이벤트에 포함
+                if item.get('type') == 'message_start':
+                    usage.update(item.get('message', {}).get('usage', {}))
+                elif item.get('type') == 'message_delta':
+                    usage.update(item.get('usage', {}))
+                yield item
+            self._record_success(estimated, usage, service)
+        finally:
+            cancelled.set()
+            BEDROCK_IN_FLIGHT.labels(service).dec()
+            BEDROCK_LATENCY.labels(service, "stream").observe(time.perf_counter() - start_time)
@@ -0,0 +1,167 @@
+# app/bedrock/rate_limiter.py
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from enum import IntEnum
+from typing import List, Optional, Tuple
+
+from ..utils.prompt_compaction import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 버킷 최대 용량 (몇 초 분량의 요청을 한 번에 보낼 수 있는지)
+_BURST_SECONDS = 10
+
+
+class Priority(IntEnum):
+    """Bedrock 호출 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0  # 제목 생성, HTTP 스트리밍 (사용자가 바로 기다리는 요청)
+    BULK = 1         # 회고록 / 경험 생성 (큐 메시지, 일반 HTTP 요청)
+
+
+def estimate_payload_tokens(payload: dict) -> int:
+    """요청 payload 의 예상 토큰 수 (프롬프트 근사치 + 최대 출력 토큰)"""
+    prompt_tokens = 0
+    for message in payload.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            prompt_tokens += estimate_tokens(content)
+        else:
+            prompt_tokens += sum(estimate_tokens(part.get("text", "")) for part in content)
+    return prompt_tokens + payload.get("max_tokens", 0)
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute / 60 * _BURST_SECONDS)
+        self.level = self.capacity
+
+    def refill(self, elapsed: float, ratio: float):
+        self.level = min(self.capacity, self.level + elapsed * self.per_minute / 60 * ratio)
+
+    def wait_time(self, amount: float, ratio: float) -> float:
+        """amount 만큼 사용 가능해질 때까지 남은 시간 (초)"""
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / (self.per_minute / 60 * ratio)
+
+
+class AdaptiveRateLimiter:
+    """
+    프로세스 전체에서 공유하는 Bedrock 호출 속도 제한기
+    - 분당 요청 수(RPM)와 분당 토큰 수(TPM) 두 개의 토큰 버킷으로 호출을 조절
+    - 스로틀링 응답을 받으면 허용 속도를 절반으로 줄이고, 성공할 때마다 조금씩 회복 (AIMD)
+    - 대기 중인 요청은 우선순위 순으로 처리 (같은 우선순위는 먼저 온 순서)
+    - 429 와 긴 재시도 대기 대신 짧은 대기열로 흡수하는 것이 목적
+    """
+
+    def __init__(self, settings):
+        self.requests = _TokenBucket(settings.BEDROCK_REQUESTS_PER_MINUTE)
+        self.tokens = _TokenBucket(settings.BEDROCK_TOKENS_PER_MINUTE)
+        self.min_ratio = settings.BEDROCK_RATE_LIMIT_MIN_RATIO
+        self.recovery_step = settings.BEDROCK_RATE_LIMIT_RECOVERY_STEP
+        self.ratio = 1.0  # 현재 허용 속도 비율 (min_ratio ~ 1.0)
+        self.throttled = 0
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._updated = time.monotonic()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, tokens: int, priority: int = Priority.BULK):
+        """호출 전에 요청 1건과 예상 토큰만큼 버킷에서 차감 (부족하면 대기)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # 버킷 용량보다 큰 요청은 용량만큼만 차감 (영원히 대기하지 않도록)
+        amount = min(float(tokens), self.tokens.capacity)
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), amount, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.done() or future.cancelled():
+                self._waiters = [waiter for waiter in self._waiters if waiter[3] is not future]
+                heapq.heapify(self._waiters)
+                self._dispatch()
+            else:
+                # 차감된 직후 취소된 경우 사용하지 않은 만큼 반환
+                self.tokens.level += amount
+                self.requests.level += 1
+            raise
+
+    def record_success(self, estimated_tokens: int, used_tokens: Optional[int] = None):
+        """
+        성공한 호출 반영
+        - 실제 사용 토큰(응답 usage)과 예상치의 차이를 버킷에 보정
+        - 허용 속도를 조금씩 회복
+        """
+        if used_tokens is not None:
+            self.tokens.level = min(
+                self.tokens.capacity,
+                self.tokens.level + min(float(estimated_tokens), self.tokens.capacity) - used_tokens,
+            )
+        if self.ratio < 1.0:
+            self.ratio = min(1.0, self.ratio + self.recovery_step)
+
+    def record_throttle(self):
+        """스로틀링 응답 반영 - 허용 속도를 절반으로 줄이고 버킷을 비움"""
+        self.throttled += 1
+        self.ratio = max(self.min_ratio, self.ratio / 2)
+        self.requests.level = min(self.requests.level, 0.0)
+        logger.warning(f"Bedrock 스로틀링 감지 - 허용 속도 {self.ratio:.0%} 로 감소 (대기 {self.waiting}건)")
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self.requests.refill(elapsed, self.ratio)
+        self.tokens.refill(elapsed, self.ratio)
+
+    def _dispatch(self):
+        """대기열 맨 앞(가장 높은 우선순위)부터 버킷이 허용하는 만큼 통과시킴"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+
+        while self._waiters:
+            _, _, amount, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            wait = max(self.requests.wait_time(1, self.ratio), self.tokens.wait_time(amount, self.ratio))
+            if wait > 0:
+                # 앞선 요청이 통과할 수 있을 때 다시 확인 (뒤 요청이 앞지르지 않도록 대기)
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.level -= 1
+            self.tokens.level -= amount
+            future.set_result(None)
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(settings) -> Optional[AdaptiveRateLimiter]:
+    """프로세스 전체에서 공유하는 속도 제한기 반환 (비활성화 시 None)"""
+    global _limiter
+    if not settings.BEDROCK_RATE_LIMIT_ENABLED:
+        return None
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = AdaptiveRateLimiter(settings)
+                logger.info(
+                    f"Bedrock 속도 제한 설정 (RPM: {settings.BEDROCK_REQUESTS_PER_MINUTE}, "
+                    f"TPM: {settings.BEDROCK_TOKENS_PER_MINUTE})"
+                )
+    return _limiter
@@ -0,0 +1,173 @@
+# app/cache/generation_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(namespace: str, data: Any, model_id: str, prompt_version: str) -> str:
+    """
+    정규화된 입력과 모델 ID, 프롬프트 버전으로 캐시 키 생성
+    - data 는 호출 측에서 정규화한 JSON 직렬화 가능 값
+    - 프롬프트를 바꾸면 prompt_version 을 올려 이전 결과가 재사용되지 않도록 함
+    """
+    canonical = json.dumps(
+        {"ns": namespace, "model": model_id, "prompt": prompt_version, "data": data},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return f"{namespace}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+
+class GenerationCache:
+    """
+    생성 결과 2단 캐시
+    - 1단: 프로세스 메모리 LRU (TTL 적용, 최대 항목 수 제한)
+    - 2단: 로컬 SQLite 파일 (재시작 후에도 유지)
+    - 네임스페이스(title / retrospective / experience)별 사용 여부와 적중/실패 횟수 관리
+    """
+
+    def __init__(self, settings):
+        self.enabled = settings.CACHE_ENABLED
+        self.ttl = settings.CACHE_TTL_SECONDS
+        self.max_entries = settings.CACHE_MEMORY_MAX_ENTRIES
+        self.db_path = settings.CACHE_DB_PATH
+        self.namespace_enabled = {
+            "title": settings.CACHE_TITLE_ENABLED,
+            "retrospective": settings.CACHE_RETROSPECTIVE_ENABLED,
+            "experience": settings.CACHE_EXPERIENCE_ENABLED,
+        }
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+
+    def is_enabled(self, namespace: str) -> bool:
+        return self.enabled and self.namespace_enabled.get(namespace, True)
+
+    def _count(self, namespace: str, field: str):
+        counters = self.stats.setdefault(namespace, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+        counters[field] += 1
+        CACHE_LOOKUPS.labels(namespace, field).inc()
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        """캐시된 값 반환 (없거나 만료되었으면 None)"""
+        if not self.is_enabled(namespace):
+            return None
+
+        value = self._memory_get(key)
+        if value is not None:
+            self._count(namespace, "memory_hits")
+            return value
+
+        value = await asyncio.to_thread(self._disk_get, key)
+        if value is not None:
+            self._count(namespace, "disk_hits")
+            self._memory_set(key, value)
+            return value
+
+        self._count(namespace, "misses")
+        return None
+
+    async def set(self, namespace: str, key: str, value: Any):
+        """값 저장 (JSON 직렬화 가능한 값만 저장)"""
+        if not self.is_enabled(namespace) or value is None:
+            return
+        self._memory_set(key, value)
+        await asyncio.to_thread(self._disk_set, namespace, key, value)
+
+    # 메모리 LRU
+    def _memory_get(self, key: str) -> Optional[Any]:
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return value
+
+    def _memory_set(self, key: str, value: Any):
+        with self._memory_lock:
+            self._memory[key] = (time.time() + self.ttl, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # 디스크 저장소 (SQLite) - 실패해도 생성 자체는 계속 진행
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS generation_cache ("
+                " key TEXT PRIMARY KEY,"
+                " namespace TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        try:
+            with self._db_lock:
+                db = self._connect()
+                row = db.execute(
+                    "SELECT value, created_at FROM generation_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, created_at = row
+                if created_at + self.ttl < time.time():
+                    db.execute("DELETE FROM generation_cache WHERE key = ?", (key,))
+                    db.commit()
+                    return None
+            return json.loads(value)
+        except Exception as e:
+            logger.warning(f"캐시 조회 실패 (디스크): {e}")
+            return None
+
+    def _disk_set(self, namespace: str, key: str, value: Any):
+        try:
+            with self._db_lock:
+                db = self._connect()
+                db.execute(
+                    "INSERT OR REPLACE INTO generation_cache (key, namespace, value, created_at) VALUES (?, ?, ?, ?)",
+                    (key, namespace, json.dumps(value, ensure_ascii=False), time.time()),
+                )
+                db.commit()
+        except Exception as e:
+            logger.warning(f"캐시 저장 실패 (디스크): {e}")
+
+
+_cache: Optional[GenerationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_generation_cache(settings) -> GenerationCache:
+    """프로세스 전체에서 공유하는 생성 결과 캐시 반환"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GenerationCache(settings)
+    return _cache
@@ -0,0 +1,260 @@
+# app/cache/near_duplicate.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# MinHash 해시 함수 (a * x + b) mod P 에 사용하는 메르센 소수
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    공백 / 문장부호를 모두 제거한 뒤 글자 단위 n-gram 집합 생성
+    - 띄어쓰기나 문장부호만 다른 입력은 같은 집합이 됨 (한국어는 어절보다 글자 n-gram 이 안정적)
+    """
+    compact = "".join(char for char in str(text).lower() if char.isalnum())
+    if len(compact) <= size:
+        return {compact} if compact else set()
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+
+class MinHasher:
+    """고정 시드로 만든 num_perm 개의 해시 함수로 MinHash 서명 생성 (재시작 후에도 같은 서명)"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        generator = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (generator.randrange(1, _PRIME), generator.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, items: Set[str]) -> Tuple[int, ...]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little")
+            for item in items
+        ] or [0]
+        return tuple(
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes) for a, b in self._params
+        )
+
+
+def estimate_similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """두 서명에서 같은 값의 비율 (자카드 유사도 추정치)"""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class _Bucket:
+    """네임스페이스 하나의 서명 / 결과와 LSH 밴드 테이블"""
+
+    def __init__(self):
+        self.entries: "OrderedDict[int, Tuple[Tuple[int, ...], Any, float]]" = OrderedDict()
+        self.bands: Dict[Tuple[int, int], Set[int]] = {}
+
+
+class NearDuplicateIndex:
+    """
+    유사 입력 인덱스 (MinHash + LSH 밴딩)
+    - 정확히 같은 입력만 찾는 생성 결과 캐시(generation_cache)를 보완
+      (띄어쓰기 / 문장부호 / 한두 문장만 다른 개발일지나 회고 내용의 이전 결과를 재사용)
+    - 서명을 밴드로 나눠 같은 밴드 값을 가진 항목만 후보로 비교 (전체 항목과 비교하지 않음)
+    - 서명과 결과는 메모리에 두고 로컬 SQLite 파일에도 저장 (재시작 후 첫 조회 시 불러옴)
+    - 네임스페이스(title / experience)별 사용 여부, 모델 ID / 프롬프트 버전(scope)이 다르면 재사용하지 않음
+    """
+
+    def __init__(self, settings):
+        # 전체 캐시를 끄면(CACHE_ENABLED=false) 유사 입력 재사용도 사용하지 않음
+        self.enabled = settings.CACHE_ENABLED and settings.NEAR_DUPLICATE_ENABLED
+        self.threshold = settings.NEAR_DUPLICATE_THRESHOLD
+        self.min_chars = settings.NEAR_DUPLICATE_MIN_CHARS
+        self.max_entries = settings.NEAR_DUPLICATE_MAX_ENTRIES
+        self.ttl = settings.CACHE_TTL_SECONDS
+        self.db_path = settings.NEAR_DUPLICATE_DB_PATH
+        self.namespace_enabled = {
+            "title": settings.CACHE_TITLE_ENABLED,
+            "experience": settings.CACHE_EXPERIENCE_ENABLED,
+        }
+        self.bands = settings.NEAR_DUPLICATE_BANDS
+        self.rows = max(1, settings.NEAR_DUPLICATE_NUM_PERM // self.bands)
+        self.hasher = MinHasher(self.bands * self.rows)
+
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._local_id = 0
+
+    def is_enabled(self, namespace: str) -> bool:
+        return self.enabled and self.namespace_enabled.get(namespace, True)
+
+    async def query(self, namespace: str, scope: str, text: str) -> List[Tuple[float, Any]]:
+        """
+        유사도가 기준 이상인 이전 결과를 (유사도, 결과) 목록으로 반환 (유사도 높은 순)
+        - 서명 계산과 디스크 조회는 스레드에서 실행 (긴 회고 내용도 이벤트 루프를 막지 않음)
+        """
+        if not self.is_enabled(namespace) or len(text) < self.min_chars:
+            return []
+        matches = await asyncio.to_thread(self._query, f"{namespace}|{scope}", text)
+        if matches:
+            CACHE_LOOKUPS.labels(namespace, "similar_hits").inc()
+        return matches
+
+    async def add(self, namespace: str, scope: str, text: str, value: Any):
+        if not self.is_enabled(namespace) or len(text) < self.min_chars or value is None:
+            return
+        await asyncio.to_thread(self._add, f"{namespace}|{scope}", text, value)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+        return [
+            (band, hash(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def _query(self, key: str, text: str) -> List[Tuple[float, Any]]:
+        signature = self.hasher.signature(shingles(text))
+        now = time.time()
+        with self._lock:
+            bucket = self._bucket(key)
+            candidates: Set[int] = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(bucket.bands.get(band_key, ()))
+            matches = []
+            for entry_id in candidates:
+                stored, value, created_at = bucket.entries[entry_id]
+                if created_at + self.ttl < now:
+                    continue
+                similarity = estimate_similarity(signature, stored)
+                if similarity >= self.threshold:
+                    matches.append((similarity, value))
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return matches
+
+    def _add(self, key: str, text: str, value: Any):
+        signature = self.hasher.signature(shingles(text))
+        created_at = time.time()
+        with self._lock:
+            bucket = self._bucket(key)
+            # 디스크 저장에 실패해도 메모리 인덱스에는 추가 (음수 ID 사용)
+            entry_id = self._disk_insert(key, signature, value, created_at)
+            if entry_id is None:
+                self._local_id -= 1
+                entry_id = self._local_id
+            self._insert(bucket, entry_id, signature, value, created_at)
+            evicted = []
+            while len(bucket.entries) > self.max_entries:
+                oldest = next(iter(bucket.entries))
+                self._remove(bucket, oldest)
+                evicted.append(oldest)
+            if evicted:
+                self._disk_delete(evicted)
+
+    # 디스크 저장소 (SQLite) - 실패해도 생성 자체는 계속 진행
+    def _disk_insert(self, key: str, signature: Tuple[int, ...], value: Any, created_at: float) -> Optional[int]:
+        try:
+            db = self._connect()
+            cursor = db.execute(
+                "INSERT INTO near_duplicate_index (namespace, signature, value, created_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(signature), json.dumps(value, ensure_ascii=False), created_at),
+            )
+            db.commit()
+            return cursor.lastrowid
+        except Exception as e:
+            logger.warning(f"유사 입력 인덱스 저장 실패 (디스크): {e}")
+            return None
+
+    def _disk_delete(self, entry_ids: List[int]):
+        try:
+            db = self._connect()
+            db.executemany("DELETE FROM near_duplicate_index WHERE id = ?", [(i,) for i in entry_ids if i > 0])
+            db.commit()
+        except Exception as e:
+            logger.warning(f"유사 입력 인덱스 삭제 실패 (디스크): {e}")
+
+    def _insert(self, bucket: _Bucket, entry_id: int, signature: Tuple[int, ...], value: Any, created_at: float):
+        bucket.entries[entry_id] = (signature, value, created_at)
+        for band_key in self._band_keys(signature):
+            bucket.bands.setdefault(band_key, set()).add(entry_id)
+
+    def _remove(self, bucket: _Bucket, entry_id: int):
+        signature, _, _ = bucket.entries.pop(entry_id)
+        for band_key in self._band_keys(signature):
+            ids = bucket.bands.get(band_key)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del bucket.bands[band_key]
+
+    def _bucket(self, key: str) -> _Bucket:
+        """네임스페이스의 인덱스 반환 (처음 사용할 때 디스크에서 만료되지 않은 항목을 불러옴)"""
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+        bucket = _Bucket()
+        self._buckets[key] = bucket
+        try:
+            db = self._connect()
+            db.execute(
+                "DELETE FROM near_duplicate_index WHERE namespace = ? AND created_at < ?",
+                (key, time.time() - self.ttl),
+            )
+            db.commit()
+            rows = db.execute(
+                "SELECT id, signature, value, created_at FROM near_duplicate_index"
+                " WHERE namespace = ? ORDER BY id DESC LIMIT ?",
+                (key, self.max_entries),
+            ).fetchall()
+            for entry_id, signature, value, created_at in reversed(rows):
+                stored = tuple(json.loads(signature))
+                if len(stored) == self.hasher.num_perm:
+                    self._insert(bucket, entry_id, stored, json.loads(value), created_at)
+            if rows:
+                logger.info(f"유사 입력 인덱스 불러옴 ({key.split('|')[0]}): {len(bucket.entries)}개")
+        except Exception as e:
+            logger.warning(f"유사 입력 인덱스 불러오기 실패: {e}")
+        return bucket
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS near_duplicate_index ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " namespace TEXT NOT NULL,"
+                " signature TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS near_duplicate_index_namespace ON near_duplicate_index (namespace, id)"
+            )
+            self._db.commit()
+        return self._db
+
+
+_index: Optional[NearDuplicateIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_near_duplicate_index(settings) -> NearDuplicateIndex:
+    """프로세스 전체에서 공유하는 유사 입력 인덱스 반환"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = NearDuplicateIndex(settings)
+    return _index
@@ -0,0 +1,53 @@
+# app/cache/singleflight.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    동일한 키로 동시에 들어온 호출을 하나의 실행으로 합침 (single-flight)
+    - 처음 들어온 호출만 실제로 실행하고, 나머지는 그 결과(또는 예외)를 함께 받음
+    - 실행은 별도 태스크로 돌리므로 한 호출자가 취소되어도 다른 호출자는 결과를 받음
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.executed = 0
+        self.shared = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: str) -> bool:
+        """key 로 실행 중인 호출이 있는지 여부"""
+        return key in self._calls
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        return await asyncio.shield(self.start(key, func))
+
+    def start(self, key: str, func: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        key 로 실행 중인 태스크를 반환하고, 없으면 func 실행을 시작해 등록 (await 없이 바로 등록)
+        - 여러 키를 한 번에 확인 / 등록해야 하는 경우 사용 (묶음 생성)
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        else:
+            self.shared += 1
+            logger.info(f"진행 중인 동일 요청 결과를 공유합니다: {key[:24]}")
+        return task
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 모든 호출자가 취소된 경우에도 예외가 회수되지 않았다는 경고가 남지 않도록 처리
+        if not task.cancelled():
+            task.exception()
@@ -1,14 +1,93 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Optional
 
 class Settings(BaseSettings):
     # AWS 설정
     AWS_REGION: str
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
+
+    # Bedrock 설정
+    BEDROCK_MODEL_ID: str = "anthropic.claude-3-haiku-20240307-v1:0"
+    # Bedrock 호출 전용 스레드 수 (동시에 진행 가능한 모델 호출 수)
+    BEDROCK_MAX_CONCURRENCY: int = 32
+    # 공유 클라이언트 커넥션 풀 (호출 스레드 수 이상으로 설정)
+    BEDROCK_MAX_POOL_CONNECTIONS: int = 32
+    BEDROCK_TCP_KEEPALIVE: bool = True
+    BEDROCK_CONNECT_TIMEOUT: int = 5   # 초
+    BEDROCK_READ_TIMEOUT: int = 120    # 초
+    BEDROCK_RETRY_MODE: str = "adaptive"
+    BEDROCK_MAX_ATTEMPTS: int = 3
+    # 엔드포인트 직접 지정 (벤치마크용 로컬 가짜 서버 등, 기본값은 AWS 리전 엔드포인트)
+    BEDROCK_ENDPOINT_URL: Optional[str] = None
+
+    # Bedrock 호출 속도 제한 (계정의 모델 할당량에 맞게 설정)
+    BEDROCK_RATE_LIMIT_ENABLED: bool = True
+    BEDROCK_REQUESTS_PER_MINUTE: int = 500
+    BEDROCK_TOKENS_PER_MINUTE: int = 1_000_000
+    # 스로틀링 시 줄어드는 허용 속도의 하한 비율과 성공 1건당 회복 비율
+    BEDROCK_RATE_LIMIT_MIN_RATIO: float = 0.1
+    BEDROCK_RATE_LIMIT_RECOVERY_STEP: float = 0.05
     
-    # 데이터베이스 설정
-    # DATABASE_URL: str
+    # 애플리케이션 시작 시 외부 연결 시간 제한 (초)
+    STARTUP_BEDROCK_TIMEOUT_SECONDS: int = 10
+    STARTUP_RABBITMQ_TIMEOUT_SECONDS: int = 10
+
+    # 데이터베이스 설정 (기본값은 로컬 SQLite 파일, 운영에서는 .env 에서 MySQL 등으로 지정)
+    DATABASE_URL: str = f"sqlite:///{Path(__file__).parent.parent / '.cache' / 'bbogle_ai.db'}"
+
+    # 회고록 구간 요약 저장 - 이전 요청에서 만든 구간(window) 요약을 재사용해
+    # 새로 추가되거나 바뀐 기간만 다시 요약 (app/services/retrospective_state.py)
+    RETROSPECTIVE_STATE_ENABLED: bool = True
+    # 마지막 사용 후 이 시간(초)이 지난 구간 요약은 정리 (기본 30일)
+    RETROSPECTIVE_STATE_TTL_SECONDS: int = 30 * 24 * 60 * 60
+    # 프로젝트 ID 없이 저장된 구간 요약 최대 개수 (넘으면 오래 사용하지 않은 것부터 정리)
+    RETROSPECTIVE_STATE_MAX_UNOWNED: int = 5000
+
+    # 회고록 map-reduce 생성 설정
+    # 개발일지 분량(글자 수)이 기준을 넘으면 기간별 요약(map) 후 회고록 생성(reduce)
+    RETROSPECTIVE_MAP_REDUCE_THRESHOLD: int = 12000
+    RETROSPECTIVE_WINDOW_MAX_CHARS: int = 6000
+    RETROSPECTIVE_MAP_CONCURRENCY: int = 4
+
+    # 프롬프트 압축 (반복 질문을 한 번만 적고 빈 답변 생략)
+    PROMPT_COMPACTION_ENABLED: bool = True
+
+    # 제목 일괄 생성 설정
+    # 한 번의 모델 호출로 생성할 최대 제목 수
+    TITLE_BATCH_MAX_SIZE: int = 10
+    # titleQueue 마이크로 배칭 대기 시간 (밀리초, 0 이면 사용하지 않음)
+    TITLE_BATCH_WINDOW_MS: int = 0
+
+    # 생성 결과 캐시 설정 (메모리 LRU + 로컬 SQLite)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    CACHE_MEMORY_MAX_ENTRIES: int = 1024
+    CACHE_DB_PATH: str = str(Path(__file__).parent.parent / ".cache" / "generation_cache.db")
+    # 엔드포인트별 캐시 사용 여부
+    CACHE_TITLE_ENABLED: bool = True
+    CACHE_RETROSPECTIVE_ENABLED: bool = True
+    CACHE_EXPERIENCE_ENABLED: bool = True
+
+    # 유사 입력 재사용 (MinHash/LSH) - 띄어쓰기 / 문장부호 / 일부 문장만 다른 입력의 이전 결과 사용
+    # (CACHE_ENABLED=false 이면 함께 꺼짐)
+    NEAR_DUPLICATE_ENABLED: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = 0.85  # 추정 자카드 유사도 기준
+    NEAR_DUPLICATE_MIN_CHARS: int = 40  # 이보다 짧은 입력은 정확히 일치하는 캐시만 사용
+    NEAR_DUPLICATE_NUM_PERM: int = 128
+    NEAR_DUPLICATE_BANDS: int = 16  # 밴드당 8행 - 유사도 약 0.7 이상이면 후보로 비교
+    NEAR_DUPLICATE_MAX_ENTRIES: int = 10000  # 네임스페이스별 최대 항목 수
+    NEAR_DUPLICATE_DB_PATH: str = str(Path(__file__).parent.parent / ".cache" / "near_duplicate.db")
+
+    # 경험 추출 키워드 선별 - 회고 내용과 관련 높은 키워드만 프롬프트에 포함 (0 이면 전체 포함)
+    EXPERIENCE_KEYWORD_TOP_K: int = 20
+    # 모델이 반환한 키워드 이름을 목록의 키워드와 맞출 때의 최소 유사도 (0.0 ~ 1.0)
+    EXPERIENCE_KEYWORD_MATCH_CUTOFF: float = 0.8
+
+    # 메시지 / 응답 / 프롬프트 본문 로깅 (샘플링 비율 0.0 ~ 1.0, 최대 기록 글자 수)
+    PAYLOAD_LOG_SAMPLE_RATE: float = 0.01
+    PAYLOAD_LOG_MAX_CHARS: int = 500
 
     # RabbitMQ 설정
     RABBITMQ_USER: str
@@ -16,6 +95,32 @@ class Settings(BaseSettings):
     RABBITMQ_HOST: str
     RABBITMQ_PORT: int
     RABBITMQ_EXCHANGE: str = ""
+    RABBITMQ_HEARTBEAT: int = 60  # 초 (끊어진 연결을 빨리 감지)
+
+    # RabbitMQ 재연결 대기 시간 (지터가 적용된 지수 백오프, 초)
+    RABBITMQ_RECONNECT_BASE_SECONDS: float = 1.0
+    RABBITMQ_RECONNECT_MAX_SECONDS: float = 30.0
+
+    # RabbitMQ 큐별 동시 처리 수와 prefetch (큐마다 전용 채널 사용)
+    # prefetch 를 지정하지 않으면 동시 처리 수와 같은 값 사용
+    TITLE_QUEUE_CONCURRENCY: int = 16
+    TITLE_QUEUE_PREFETCH: Optional[int] = None
+    RETROSPECTIVE_QUEUE_CONCURRENCY: int = 8
+    RETROSPECTIVE_QUEUE_PREFETCH: Optional[int] = None
+    EXPERIENCE_QUEUE_CONCURRENCY: int = 8
+    EXPERIENCE_QUEUE_PREFETCH: Optional[int] = None
+
+    # RabbitMQ 응답 발행 설정 (publisher confirms 채널 수, 한 번에 발행할 최대 메시지 수)
+    RESPONSE_PUBLISHER_CHANNELS: int = 2
+    RESPONSE_PUBLISH_BATCH_SIZE: int = 50
+
+    # 큐 대기 메시지 수 조회 주기 (초, /metrics 용)
+    METRICS_QUEUE_POLL_SECONDS: int = 15
+
+    # RabbitMQ 재시도 설정 (지연 큐 TTL 이후 원래 큐로 재전달)
+    QUEUE_RETRY_MAX_ATTEMPTS: int = 5        # 최초 처리를 포함한 최대 처리 횟수
+    QUEUE_RETRY_BACKOFF_SECONDS: int = 2     # 초기 대기 시간 (초)
+    QUEUE_RETRY_MAX_BACKOFF_SECONDS: int = 60  # 최대 대기 시간 (초)
     
     class Config:
         # .env 파일의 절대 경로 설정
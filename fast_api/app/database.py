@@ -1,4 +1,6 @@
+import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
@@ -6,8 +8,16 @@ from .config import settings
 # 데이터베이스 URL 설정
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-# 데이터베이스 엔진 생성
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# SQLite 는 파일 디렉터리를 만들고, 스레드 풀에서 사용할 수 있도록 설정
+connect_args = {}
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    connect_args = {"check_same_thread": False}
+    database_path = make_url(SQLALCHEMY_DATABASE_URL).database
+    if database_path and database_path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+
+# 데이터베이스 엔진 생성 (끊어진 연결은 사용 전에 확인)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
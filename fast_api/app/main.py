@@ -1,10 +1,10 @@
-from typing import List
-from fastapi import FastAPI, HTTPException, Body
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import asyncio
 import json
 import logging
-import pika
 
 from dotenv import load_dotenv
 from .services.devlog_summary_service import DevLogSummaryService
@@ -12,10 +12,23 @@ from .services.retrospective_service import RetrospectiveService
 from .services.experience_service import ExperienceService
 from .schemas.experience_schema import Keyword, ExperienceResponse, ExperienceRequest
 from .schemas.retrospective_schema import DailyLog, RetrospectiveResponse
+from .rabbitmq.consumer import RabbitConsumer
+from .bedrock.client import get_bedrock_registry
+from .bedrock.rate_limiter import Priority, get_rate_limiter
+from .rabbitmq.retry import RetryableError, should_retry
+from .utils.sse import format_sse, SSE_HEADERS
+from .utils.micro_batcher import MicroBatcher
+from .utils.tracing import (
+    DECODE, VALIDATE, configure_payload_logging, log_payload, new_trace_id, span, start_trace,
+)
+from .metrics import (
+    HTTP_IN_FLIGHT, HTTP_REQUEST_LATENCY, PUBLISHER_PENDING, QUEUE_DEPTH,
+    RATE_LIMITER_RATIO, RATE_LIMITER_WAITING, SINGLEFLIGHT_IN_FLIGHT,
+    add_refresh_hook, render_metrics,
+)
+from prometheus_client import CONTENT_TYPE_LATEST
 from .config import settings
-from botocore.exceptions import ClientError, BotoCoreError
 import time
-import random
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -46,309 +59,161 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 본문 로깅 샘플링 설정
+configure_payload_logging(settings)
+
+
+@app.middleware("http")
+async def record_http_metrics(request: Request, call_next):
+    """
+    엔드포인트별 처리 시간과 처리 중인 요청 수 기록 (스트리밍 응답은 첫 바이트까지)
+    - X-Correlation-ID 헤더(없으면 새로 생성)를 trace_id 로 단계별 소요 시간 기록
+    """
+    start_time = time.perf_counter()
+    trace_id = request.headers.get("X-Correlation-ID") or new_trace_id()
+    HTTP_IN_FLIGHT.inc()
+    status = 500
+    try:
+        with start_trace("http", trace_id, detail=f"{request.method} {request.url.path}"):
+            response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Correlation-ID"] = trace_id
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # 경로 템플릿 기준으로 집계 (등록되지 않은 경로는 하나로 묶음)
+        route = request.scope.get("route")
+        HTTP_REQUEST_LATENCY.labels(
+            request.method, route.path if route is not None else "unmatched", status
+        ).observe(time.perf_counter() - start_time)
+
 # 서비스 초기화
 summary_service = DevLogSummaryService(settings)
 retrospective_service = RetrospectiveService(settings)
 experience_service = ExperienceService(settings)
 
-# RabbitMQ 연결 정보
-# rabbitmq_user = "bbogle"
-# rabbitmq_pass = "ayebimil"
-# rabbitmq_host = "bbogle-rabbitmq"  # Docker 컨테이너 이름 또는 호스트
-# rabbitmq_port = 5672
-# rabbitmq_exchange = ""
-rabbitmq_user = settings.RABBITMQ_USER
-rabbitmq_pass = settings.RABBITMQ_PASS
-rabbitmq_host = settings.RABBITMQ_HOST
-rabbitmq_port = settings.RABBITMQ_PORT
-rabbitmq_exchange = settings.RABBITMQ_EXCHANGE
-
-# RabbitMQ 연결 및 채널 설정
-connection_parameters = pika.ConnectionParameters(
-    host=rabbitmq_host,
-    port=rabbitmq_port,
-    credentials=pika.PlainCredentials(rabbitmq_user, rabbitmq_pass),
-    heartbeat=600,  # heartbeat 설정 (초 단위)
-    blocked_connection_timeout=500,
-)
-connection = pika.BlockingConnection(connection_parameters)
-channel = connection.channel()
+# titleQueue 마이크로 배칭 (TITLE_BATCH_WINDOW_MS 가 0 이면 메시지마다 개별 생성)
+title_batcher = None
+if settings.TITLE_BATCH_WINDOW_MS > 0:
+    title_batcher = MicroBatcher(
+        summary_service.generate_summaries,
+        window_seconds=settings.TITLE_BATCH_WINDOW_MS / 1000,
+        max_size=settings.TITLE_BATCH_MAX_SIZE,
+    )
 
-# 큐 선언
-channel.queue_declare(queue='summaryQueue', durable=True)
-channel.queue_declare(queue='retrospectiveQueue', durable=True)
-channel.queue_declare(queue='experienceQueue', durable=True)
-channel.queue_declare(queue='responseQueue', durable=True)
+# RabbitMQ 소비자 (연결은 애플리케이션 시작 시 생성)
+rabbit_consumer = RabbitConsumer(settings)
+queue_depth_task = None
+initialize_task = None
+rabbit_task = None
 
-# 재시도 로직을 위한 설정
-MAX_RETRIES = 5
-BACKOFF_FACTOR = 2  # 초기 대기 시간 (초)
-MAX_BACKOFF = 60    # 최대 대기 시간 (초)
+# Bedrock 공유 클라이언트 (생성은 애플리케이션 시작 후 백그라운드에서)
+bedrock_registry = get_bedrock_registry(settings)
 
-def calculate_sleep_time(attempt: int) -> float:
-    """
-    재시도 대기 시간을 계산하는 함수
-    - 초기 대기 시간(BACKOFF_FACTOR)에 지수 증가를 적용
-    - 최대 대기 시간(MAX_BACKOFF)을 초과하지 않도록 제한
-    """
-    sleep_time = min(BACKOFF_FACTOR * (2 ** (attempt - 1)), MAX_BACKOFF)
-    return sleep_time
-
-def should_retry(error):
-    error_message = str(error)
-    if 'ThrottlingException' in error_message or 'TooManyRequestsException' in error_message:
-        return True
-    elif '500' in error_message or '429' in error_message:
-        return True
-    else:
-        return False
-
-def execute_with_retry(func, *args, **kwargs):
-    """
-    재시도 로직을 처리하는 함수
-    """
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            return func(*args, **kwargs)
-        except Exception as e:
-            logger.error(f"예외 발생: {type(e)} - {e}")
-            if should_retry(e) and attempt < MAX_RETRIES:
-                sleep_time = calculate_sleep_time(attempt)
-                logger.warning(f"재시도할 예정입니다. {sleep_time:.2f}초 후 재시도합니다. (시도 횟수: {attempt}/{MAX_RETRIES})")
-                time.sleep(sleep_time)
-            else:
-                logger.error(f"최대 재시도 횟수 초과 또는 재시도 불가 오류 발생: {e}")
-                raise
+# 대기 메시지 수를 조회할 큐
+MONITORED_QUEUES = ['titleQueue', 'retrospectiveQueue', 'experienceQueue', 'responseQueue']
 
 
+def refresh_runtime_metrics():
+    """/metrics 조회 시점의 진행 중인 작업 수, 속도 제한 상태, 발행 대기 수 반영"""
+    SINGLEFLIGHT_IN_FLIGHT.labels("title").set(summary_service.singleflight.in_flight)
+    SINGLEFLIGHT_IN_FLIGHT.labels("retrospective").set(retrospective_service.singleflight.in_flight)
+    SINGLEFLIGHT_IN_FLIGHT.labels("experience").set(experience_service.singleflight.in_flight)
+    rate_limiter = get_rate_limiter(settings)
+    if rate_limiter is not None:
+        RATE_LIMITER_WAITING.set(rate_limiter.waiting)
+        RATE_LIMITER_RATIO.set(rate_limiter.ratio)
+    PUBLISHER_PENDING.set(rabbit_consumer.publisher.pending)
 
 
+add_refresh_hook(refresh_runtime_metrics)
 
-def send_response(queue: str, correlation_id: str, response_body: dict):
-    """
-    RabbitMQ로 응답을 전송하는 헬퍼 함수
-    """
-    channel.basic_publish(
-        exchange=rabbitmq_exchange,
-        routing_key=queue,
-        body=json.dumps(response_body),
-        properties=pika.BasicProperties(
-            correlation_id=correlation_id,
-            content_type='application/json',
-            delivery_mode=2  # 메시지를 디스크에 저장 (영구적)
-        )
-    )
+
+async def poll_queue_depths():
+    """큐별 대기 메시지 수를 주기적으로 조회"""
+    while True:
+        try:
+            depths = await rabbit_consumer.get_queue_depths(MONITORED_QUEUES)
+            for queue_name, depth in depths.items():
+                QUEUE_DEPTH.labels(queue_name).set(depth)
+        except Exception as e:
+            logger.warning(f"큐 대기 메시지 수 조회 실패: {e}")
+        await asyncio.sleep(settings.METRICS_QUEUE_POLL_SECONDS)
+
+# 일시적인 오류(스로틀링 등)는 RetryableError 로 던져 브로커 지연 큐에서 재시도
+# - 대기 중인 메시지는 워커를 점유하지 않음 (RetryScheduler 참고)
 
 
-# # 메시지 소비 함수들
-# def on_title_queue_message(ch, method, properties, body):
-#     """
-#     titleQueue에서 메시지를 소비하는 콜백 함수
-#     """
-#     try:
-#         data = json.loads(body)
-#         logger.info("titleQueue 메시지 수신: %s", data)
-#         if not data.get("data"):
-#             raise ValueError("요약 생성에 필요한 데이터가 없습니다.")
-#
-#         # summary_service를 사용하여 요약 생성
-#         result = asyncio.run(summary_service.generate_summary(data["data"]))  # 서비스는 async 함수로 가정
-#
-#         # 응답 전송
-#         response = {
-#             "type": "title_response",
-#             "result": result
-#         }
-#         channel.basic_publish(
-#             exchange='',
-#             routing_key=properties.reply_to,
-#             body=json.dumps(response),
-#             properties=pika.BasicProperties(
-#                 correlation_id=properties.correlation_id),
-#         )
-#         logger.info("titleQueue 응답 전송: %s", response)
-#     except Exception as e:
-#         logger.error(f"titleQueue 처리 중 오류 발생: {e}")
-#     finally:
-#         ch.basic_ack(delivery_tag=method.delivery_tag)
-#
-#
-# def on_retrospective_queue_message(ch, method, properties, body):
-#     """
-#     retrospectiveQueue에서 메시지를 소비하는 콜백 함수
-#     """
-#     try:
-#         data = json.loads(body)
-#         logger.info("retrospectiveQueue 메시지 수신: %s", data)
-#         if not data.get("data"):
-#             raise ValueError("회고록 생성에 필요한 데이터가 없습니다.")
-#
-#         # Pydantic 모델 변환
-#         # data["data"]는 List[dict] 형식이므로, 이를 List[DailyLog]로 변환합니다.
-#         daily_logs = [DailyLog(**item) for item in data["data"]]
-#
-#         # retrospective_service를 사용하여 회고록 생성
-#         result = asyncio.run(retrospective_service.generate_retrospective(daily_logs))  # 서비스는 async 함수로 가정
-#
-#         response = {
-#             "retrospective": result
-#         }
-#         ch.basic_publish(
-#             exchange='',
-#             routing_key=properties.reply_to,
-#             body=json.dumps(response, ensure_ascii=False),
-#             properties=pika.BasicProperties(
-#                 correlation_id=properties.correlation_id,
-#                 content_type='application/json'
-#             ),
-#         )
-#         logger.info("retrospectiveQueue 응답 전송: %s", response)
-#     except Exception as e:
-#         logger.error(f"retrospectiveQueue 처리 중 오류 발생: {e}")
-#     finally:
-#         ch.basic_ack(delivery_tag=method.delivery_tag)
-#
-#
-# def on_experience_queue_message(ch, method, properties, body):
-#     """
-#     experienceQueue에서 메시지를 소비하는 콜백 함수
-#     """
-#     try:
-#         data = json.loads(body)
-#         logger.info("experienceQueue 메시지 수신: %s", data)
-#         if not data.get("data"):
-#             raise ValueError("경험 생성에 필요한 데이터가 없습니다.")
-#
-#         # 데이터 파싱
-#
-#         retrospective_content = data["data"].get("retrospective_content", "")
-#         keywords_data = data["data"].get("keywords", [])
-#
-#         # 키워드를 Pydantic 모델로 변환
-#         from .schemas.experience_schema import Keyword as KeywordModel
-#         keywords = [KeywordModel(**kw) for kw in keywords_data]
-#
-#         # experience_service를 사용하여 경험 생성
-#         result = asyncio.run(experience_service.generate_experience(retrospective_content, keywords))  # async 함수로 가정
-#
-#         # 응답 전송
-#         response = result.dict()
-#         ch.basic_publish(
-#             exchange='',
-#             routing_key=properties.reply_to,
-#             body=json.dumps(response, ensure_ascii=False),
-#             properties=pika.BasicProperties(
-#                 correlation_id=properties.correlation_id,
-#                 content_type='application/json'
-#             ),
-#         )
-#         logger.info("experienceQueue 응답 전송: %s", response)
-#     except Exception as e:
-#         logger.error(f"experienceQueue 처리 중 오류 발생: {e}")
-#     finally:
-#         ch.basic_ack(delivery_tag=method.delivery_tag)
-def on_title_queue_message(ch, method, properties, body):
+async def on_title_queue_message(body):
+    """
+    titleQueue 메시지 처리 - 애플리케이션 이벤트 루프에서 실행되며 응답 dict 를 반환
+    """
     try:
-        data = json.loads(body)  # 메시지 본문을 JSON으로 디코드
-        logger.info("titleQueue 메시지 수신: %s", data)
+        with span(DECODE):
+            data = json.loads(body)  # 메시지 본문을 JSON으로 디코드
+        log_payload(logger, "titleQueue 메시지 수신", data)
         if not data.get("data"):  # 데이터 유효성 검사
             raise ValueError("요약 생성에 필요한 데이터가 없습니다.")
 
-        # 매 재시도마다 새로운 코루틴 객체 생성
-        result = execute_with_retry(lambda: asyncio.run(
-            summary_service.generate_summary(data["data"])
-        ))
+        # 마이크로 배칭 사용 시 다른 메시지와 묶어서 생성
+        if title_batcher is not None:
+            result = await title_batcher.submit(data["data"])
+        else:
+            result = await summary_service.generate_summary(data["data"])
 
-        # 응답 전송
-        response = {
+        # 응답은 소비자가 reply_to 로 전송
+        return {
             "type": "title_response",
             "result": result
         }
-        channel.basic_publish(
-            exchange='',
-            routing_key=properties.reply_to,
-            body=json.dumps(response),
-            properties=pika.BasicProperties(
-                correlation_id=properties.correlation_id
-            ),
-        )
-        logger.info("titleQueue 응답 전송: %s", response)
     except Exception as e:
+        if should_retry(e):
+            raise RetryableError(str(e)) from e
         logger.error(f"titleQueue 처리 중 오류 발생: {e}")
-    finally:
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-
-# def on_title_queue_message(ch, method, properties, body):
-#     try:
-#         data = json.loads(body)
-#         logger.info("titleQueue 메시지 수신: %s", data)
-#         if not data.get("data"):
-#             raise ValueError("요약 생성에 필요한 데이터가 없습니다.")
-
-#      # 재시도 로직 적용
-#         result = execute_with_retry(asyncio.run, summary_service.generate_summary(data["data"]))
-
-
-#         # 응답 전송
-#         response = {
-#             "type": "title_response",
-#             "result": result
-#         }
-#         channel.basic_publish(
-#             exchange='',
-#             routing_key=properties.reply_to,
-#             body=json.dumps(response),
-#             properties=pika.BasicProperties(
-#                 correlation_id=properties.correlation_id
-#             ),
-#         )
-#         logger.info("titleQueue 응답 전송: %s", response)
-#     except Exception as e:
-#         logger.error(f"titleQueue 처리 중 오류 발생: {e}")
-#     finally:
-#         ch.basic_ack(delivery_tag=method.delivery_tag)
-
-
-def on_retrospective_queue_message(ch, method, properties, body):
+        return None
+
+
+async def on_retrospective_queue_message(body):
+    """
+    retrospectiveQueue 메시지 처리 - 애플리케이션 이벤트 루프에서 실행되며 응답 dict 를 반환
+    """
     try:
-        data = json.loads(body)
-        logger.info("retrospectiveQueue 메시지 수신: %s", data)
+        with span(DECODE):
+            data = json.loads(body)
+        log_payload(logger, "retrospectiveQueue 메시지 수신", data)
         if not data.get("data"):
             raise ValueError("회고록 생성에 필요한 데이터가 없습니다.")
 
         # Pydantic 모델 변환
-        daily_logs = [DailyLog(**item) for item in data["data"]]
-
-        # 비동기 작업 실행
-        async def generate_retrospective_task():
-            return await retrospective_service.generate_retrospective(daily_logs)
+        with span(VALIDATE):
+            daily_logs = [DailyLog(**item) for item in data["data"]]
 
-        # 매 재시도마다 새로운 코루틴 객체 생성
-        result = execute_with_retry(lambda: asyncio.run(generate_retrospective_task()))
+        # 프로젝트 ID 가 있으면 그 프로젝트의 이전 구간 요약 정리에 사용
+        project_id = data.get("project_id") or data.get("projectId")
+        result = await retrospective_service.generate_retrospective(
+            daily_logs, str(project_id) if project_id is not None else None
+        )
 
-        # 응답 전송
-        response = {
+        # 응답은 소비자가 reply_to 로 전송
+        return {
             "retrospective": result
         }
-        channel.basic_publish(
-            exchange='',
-            routing_key=properties.reply_to,
-            body=json.dumps(response, ensure_ascii=False),
-            properties=pika.BasicProperties(
-                correlation_id=properties.correlation_id,
-                content_type='application/json'
-            ),
-        )
-        logger.info("retrospectiveQueue 응답 전송: %s", response)
     except Exception as e:
+        if should_retry(e):
+            raise RetryableError(str(e)) from e
         logger.error(f"retrospectiveQueue 처리 중 오류 발생: {e}")
-    finally:
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+        return None
 
-def on_experience_queue_message(ch, method, properties, body):
+async def on_experience_queue_message(body, reply_partial=None):
+    """
+    experienceQueue 메시지 처리 - 애플리케이션 이벤트 루프에서 실행되며 응답 dict 를 반환
+    - 요청 메시지가 부분 응답을 요청한 경우(reply_partial) 경험이 하나 완성될 때마다
+      {"index": 0, "experience": {...}} 를 먼저 발행하고, 마지막에 전체 결과를 응답
+    """
     try:
-        data = json.loads(body)  # 메시지 본문을 JSON으로 디코드
-        logger.info("experienceQueue 메시지 수신: %s", data)
+        with span(DECODE):
+            data = json.loads(body)  # 메시지 본문을 JSON으로 디코드
+        log_payload(logger, "experienceQueue 메시지 수신", data)
         if not data.get("data"):  # 데이터 유효성 검사
             raise ValueError("경험 생성에 필요한 데이터가 없습니다.")
 
@@ -356,130 +221,107 @@ def on_experience_queue_message(ch, method, properties, body):
         keywords_data = data["data"].get("keywords", [])
 
         # 키워드를 Pydantic 모델로 변환
-        keywords = [Keyword(**kw) for kw in keywords_data]
-
-        # 매 재시도마다 새로운 코루틴 객체 생성
-        result = execute_with_retry(lambda: asyncio.run(
-            experience_service.generate_experience(retrospective_content, keywords)
-        ))
-
-        # 응답 전송
-        response = result.dict()
-        channel.basic_publish(
-            exchange='',
-            routing_key=properties.reply_to,
-            body=json.dumps(response, ensure_ascii=False),
-            properties=pika.BasicProperties(
-                correlation_id=properties.correlation_id,
-                content_type='application/json'
-            ),
-        )
-        logger.info("experienceQueue 응답 전송: %s", response)
+        with span(VALIDATE):
+            keywords = [Keyword(**kw) for kw in keywords_data]
+
+        if reply_partial is not None:
+            experiences = []
+            async for experience in experience_service.stream_experience(
+                retrospective_content, keywords, priority=Priority.BULK
+            ):
+                await reply_partial({"index": len(experiences), "experience": experience.dict()})
+                experiences.append(experience)
+            return ExperienceResponse(experiences=experiences).dict()
+
+        result = await experience_service.generate_experience(retrospective_content, keywords)
+
+        # 응답은 소비자가 reply_to 로 전송
+        return result.dict()
     except Exception as e:
+        if should_retry(e):
+            raise RetryableError(str(e)) from e
         logger.error(f"experienceQueue 처리 중 오류 발생: {e}")
-    finally:
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-
-
-# def on_retrospective_queue_message(ch, method, properties, body):
-#     try:
-#         data = json.loads(body)
-#         logger.info("retrospectiveQueue 메시지 수신: %s", data)
-#         if not data.get("data"):
-#             raise ValueError("회고록 생성에 필요한 데이터가 없습니다.")
-
-#         # Pydantic 모델 변환
-#         daily_logs = [DailyLog(**item) for item in data["data"]]
-
-#    # 재시도 로직 적용
-#         result = execute_with_retry(asyncio.run, retrospective_service.generate_retrospective(daily_logs))
-
-
-#         response = {
-#             "retrospective": result
-#         }
-#         ch.basic_publish(
-#             exchange='',
-#             routing_key=properties.reply_to,
-#             body=json.dumps(response, ensure_ascii=False),
-#             properties=pika.BasicProperties(
-#                 correlation_id=properties.correlation_id,
-#                 content_type='application/json'
-#             ),
-#         )
-#         logger.info("retrospectiveQueue 응답 전송: %s", response)
-#     except Exception as e:
-#         logger.error(f"retrospectiveQueue 처리 중 오류 발생: {e}")
-#     finally:
-#         ch.basic_ack(delivery_tag=method.delivery_tag)
-
-
-
-# # experienceQueue에서 사용하는 콜백 함수
-# def on_experience_queue_message(ch, method, properties, body):
-#     try:
-#         data = json.loads(body)
-#         logger.info("experienceQueue 메시지 수신: %s", data)
-#         if not data.get("data"):
-#             raise ValueError("경험 생성에 필요한 데이터가 없습니다.")
-
-#         retrospective_content = data["data"].get("retrospective_content", "")
-#         keywords_data = data["data"].get("keywords", [])
-
-#         # 키워드를 Pydantic 모델로 변환
-#         keywords = [Keyword(**kw) for kw in keywords_data]
-
-#         # 재시도 로직 외부에서 asyncio.run 호출
-#         async def generate_experience_task():
-#             return await experience_service.generate_experience(retrospective_content, keywords)
-
-#         result = execute_with_retry(asyncio.run, generate_experience_task())
-
-#         # 응답 전송
-#         response = result.dict()
-#         channel.basic_publish(
-#             exchange='',
-#             routing_key=properties.reply_to,
-#             body=json.dumps(response, ensure_ascii=False),
-#             properties=pika.BasicProperties(
-#                 correlation_id=properties.correlation_id,
-#                 content_type='application/json'
-#             ),
-#         )
-#         logger.info("experienceQueue 응답 전송: %s", response)
-#     except Exception as e:
-#         logger.error(f"experienceQueue 처리 중 오류 발생: {e}")
-#     finally:
-#         ch.basic_ack(delivery_tag=method.delivery_tag)
-
-
-
-
-# RabbitMQ 소비자 설정
-channel.basic_qos(prefetch_count=1)
-channel.basic_consume(queue='titleQueue', on_message_callback=on_title_queue_message)
-channel.basic_consume(queue='retrospectiveQueue', on_message_callback=on_retrospective_queue_message)
-channel.basic_consume(queue='experienceQueue', on_message_callback=on_experience_queue_message)
+        return None
+
+
+rabbit_consumer.register('titleQueue', on_title_queue_message,
+                         settings.TITLE_QUEUE_CONCURRENCY, settings.TITLE_QUEUE_PREFETCH)
+rabbit_consumer.register('retrospectiveQueue', on_retrospective_queue_message,
+                         settings.RETROSPECTIVE_QUEUE_CONCURRENCY, settings.RETROSPECTIVE_QUEUE_PREFETCH)
+rabbit_consumer.register('experienceQueue', on_experience_queue_message,
+                         settings.EXPERIENCE_QUEUE_CONCURRENCY, settings.EXPERIENCE_QUEUE_PREFETCH,
+                         partial_replies=True)
+
+
+async def initialize():
+    """
+    외부 연결 초기화 (HTTP 서버 시작을 막지 않도록 백그라운드에서 실행)
+    - Bedrock 클라이언트를 미리 생성 (실패하면 첫 호출 시 다시 생성)
+    - RabbitMQ 연결은 시간 제한을 두고, 실패하거나 끊기면 대기 후 다시 연결
+    """
+    global queue_depth_task, rabbit_task
+    try:
+        await asyncio.wait_for(
+            asyncio.to_thread(bedrock_registry.warm_up), settings.STARTUP_BEDROCK_TIMEOUT_SECONDS
+        )
+        logger.info("Bedrock 클라이언트 준비 완료")
+    except Exception as e:
+        logger.error(f"Bedrock 클라이언트 준비 실패 (첫 호출 시 다시 생성): {e!r}")
+
+    # 연결이 끊기면 자동으로 다시 연결 (RabbitConsumer.run)
+    rabbit_task = asyncio.create_task(rabbit_consumer.run())
+    queue_depth_task = asyncio.create_task(poll_queue_depths())
 
 
 @app.on_event("startup")
 async def startup():
     """
-    FastAPI 애플리케이션이 시작될 때 RabbitMQ 소비를 시작
+    FastAPI 애플리케이션이 시작될 때 외부 연결 초기화를 백그라운드로 시작
+    - 브로커가 느리거나 내려가 있어도 HTTP 서버(/healthz 등)는 바로 응답
     """
-    logger.info("RabbitMQ 메시지 소비 시작")
-    loop = asyncio.get_event_loop()
-    loop.run_in_executor(None, channel.start_consuming)
+    global initialize_task
+    initialize_task = asyncio.create_task(initialize())
 
 
 @app.on_event("shutdown")
-def shutdown():
+async def shutdown():
     """
     애플리케이션 종료 시 RabbitMQ 연결 종료
     """
     logger.info("애플리케이션 종료 - RabbitMQ 연결 종료")
-    if connection.is_open:
-        connection.close()
+    if initialize_task is not None:
+        initialize_task.cancel()
+    if queue_depth_task is not None:
+        queue_depth_task.cancel()
+    await rabbit_consumer.stop()
+    if rabbit_task is not None:
+        rabbit_task.cancel()
+
+
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    """프로세스 생존 여부 (외부 연결 상태와 무관)"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    """요청 처리 준비 여부 (RabbitMQ 연결, Bedrock 클라이언트 생성)"""
+    checks = {
+        "rabbitmq": rabbit_consumer.is_connected,
+        "bedrock": bedrock_registry.is_ready,
+    }
+    ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "checks": checks},
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 메트릭"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 # 기존 API 엔드포인트 복원 및 유지
@@ -524,6 +366,46 @@ async def summarize_devlog(qna_list: List[dict] = Body(...)):
         )
 
 
+@app.post(
+    "/generate/titles",
+    response_model=dict,
+    summary="개발일지 제목 일괄 생성",
+    description="""여러 개발일지의 질문-답변 리스트를 받아 각각의 제목을 생성합니다.
+여러 개발일지를 묶어 한 번의 모델 호출로 생성하므로 과거 개발일지를 일괄 처리할 때 사용합니다.
+
+입력/출력 형식
+- 입력: 개발일지별 질문-답변 리스트의 리스트 (JSON)
+- 출력: 입력과 같은 순서의 제목 리스트
+
+요청 예시:
+[
+    [{"question": "오늘 수행한 작업은 무엇인가요?", "answer": "사이드바 상태관리 수정과 공통 컴포넌트 구현"}],
+    [{"question": "오늘 수행한 작업은 무엇인가요?", "answer": "로그인 API 연동"}]
+]
+
+응답 예시:
+{"titles": ["사이드바 상태관리 및 공통 컴포넌트 구현", "로그인 API 연동"]}
+
+주의사항
+- 빈 리스트나 질문-답변이 없는 개발일지는 허용되지 않습니다.""",
+    response_description="생성된 개발일지 제목 목록"
+)
+async def summarize_devlogs(qna_lists: List[List[dict]] = Body(...)):
+    logger.info(f"개발일지 제목 일괄 생성 API 호출 (HTTP) - {len(qna_lists)}건")
+    if not qna_lists or any(not qna_list for qna_list in qna_lists):
+        raise HTTPException(status_code=400, detail="질문과 답이 없는 개발일지가 있습니다.")
+    try:
+        titles = await summary_service.generate_summaries(qna_lists)
+        logger.info("제목 일괄 생성 성공 (HTTP)")
+        return {"titles": titles}
+    except Exception as e:
+        logger.error(f"제목 일괄 생성 중 에러 발생 (HTTP): {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="제목 생성 중 오류가 발생했습니다."
+        )
+
+
 
 @app.post(
     "/generate/summary",
@@ -549,16 +431,18 @@ async def summarize_devlog(qna_list: List[dict] = Body(...)):
 
 응답 예시:
 {"retrospective": "이번 프로젝트는 NLP 모델 개선과 한국어 모델 탐색을 중심으로..."}
+
+project_id (선택, 쿼리 파라미터): 지정하면 긴 프로젝트의 구간 요약을 프로젝트 단위로 관리합니다 (현재 기간에 없는 이전 구간 요약 정리).
 """,
     response_description="생성된 프로젝트 회고록"
 )
 
-async def generate_retrospective(request: List[DailyLog]):
+async def generate_retrospective(request: List[DailyLog], project_id: Optional[str] = None):
     logger.info("개발일지 회고록 생성 API 호출 (HTTP)")
     try:
         if not request:
             raise HTTPException(status_code=400, detail="회고록 생성에 필요한 데이터가 없습니다.")
-        result = await retrospective_service.generate_retrospective(request)
+        result = await retrospective_service.generate_retrospective(request, project_id)
         logger.info("회고록 생성 성공 (HTTP)")
         return RetrospectiveResponse(retrospective=result)
     except Exception as e:
@@ -569,6 +453,104 @@ async def generate_retrospective(request: List[DailyLog]):
         )
 
 
+@app.post(
+    "/generate/summary/stream",
+    summary="개발일지 회고록 생성 (스트리밍)",
+    description="""/generate/summary 와 같은 입력으로 회고록을 생성하되, 생성되는 텍스트를 Server-Sent Events 로 즉시 전달합니다.
+
+입력/출력 형식
+- 입력: /generate/summary 와 동일한 일별 개발 로그 리스트 (JSON), 선택 쿼리 파라미터 project_id
+- 출력: text/event-stream
+
+이벤트 형식:
+data: {"text": "이번 프로젝트는"}            (생성된 텍스트 조각, 여러 번 전송)
+event: done
+data: {"retrospective": "이번 프로젝트는 ..."} (완성된 회고록, 마지막에 한 번 전송)
+event: error
+data: {"detail": "회고록 생성 중 오류가 발생했습니다."}
+""",
+    response_description="회고록 텍스트 스트림 (text/event-stream)"
+)
+async def generate_retrospective_stream(request: List[DailyLog], project_id: Optional[str] = None):
+    logger.info("개발일지 회고록 스트리밍 API 호출 (HTTP)")
+    if not request:
+        raise HTTPException(status_code=400, detail="회고록 생성에 필요한 데이터가 없습니다.")
+
+    async def event_stream():
+        parts = []
+        try:
+            async for text in retrospective_service.stream_retrospective(request, project_id):
+                parts.append(text)
+                yield format_sse({"text": text})
+            yield format_sse({"retrospective": "".join(parts).strip()}, event="done")
+            logger.info("회고록 스트리밍 생성 성공 (HTTP)")
+        except Exception as e:
+            logger.error(f"회고록 스트리밍 생성 중 오류 발생 (HTTP): {e}")
+            yield format_sse({"detail": "회고록 생성 중 오류가 발생했습니다."}, event="error")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post(
+    "/generate/experience/stream",
+    summary="경험 추출 생성 (스트리밍)",
+    description="""/generate/experience 와 같은 입력으로 경험을 추출하되, 경험이 하나 완성될 때마다 즉시 전달합니다.
+
+입력/출력 형식
+- 입력: /generate/experience 와 동일한 회고 내용과 키워드 목록 (JSON)
+- 출력: Accept 헤더가 text/event-stream 이면 Server-Sent Events, 그 외에는 NDJSON (application/x-ndjson)
+
+NDJSON 형식 (한 줄에 하나의 JSON):
+{"type": "experience", "index": 0, "experience": {"title": "...", "content": "...", "keywords": [...]}}
+{"type": "done", "count": 4}
+{"type": "error", "detail": "경험 생성 중 오류가 발생했습니다."}
+
+SSE 형식:
+event: experience
+data: {"index": 0, "experience": {...}}
+event: done
+data: {"experiences": [...]}
+event: error
+data: {"detail": "경험 생성 중 오류가 발생했습니다."}
+""",
+    response_description="경험 스트림 (application/x-ndjson 또는 text/event-stream)"
+)
+async def generate_experience_stream(request: ExperienceRequest, http_request: Request):
+    logger.info(f"경험 추출 스트리밍 API 호출 - 키워드 수: {len(request.keywords)}")
+    try:
+        keyword_index = experience_service.keyword_index(request.keywords)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    use_sse = "text/event-stream" in http_request.headers.get("accept", "")
+
+    def ndjson(data: dict) -> str:
+        return json.dumps(data, ensure_ascii=False) + "\n"
+
+    async def event_stream():
+        experiences = []
+        try:
+            async for experience in experience_service.stream_experience(
+                request.retrospective_content, keyword_index
+            ):
+                item = {"index": len(experiences), "experience": experience.dict()}
+                experiences.append(item["experience"])
+                yield format_sse(item, event="experience") if use_sse else ndjson({"type": "experience", **item})
+            if use_sse:
+                yield format_sse({"experiences": experiences}, event="done")
+            else:
+                yield ndjson({"type": "done", "count": len(experiences)})
+            logger.info(f"경험 추출 스트리밍 완료 - 추출된 경험 수: {len(experiences)}")
+        except Exception as e:
+            logger.error(f"경험 스트리밍 생성 중 오류 발생: {e}")
+            # 요청 검증은 스트림 시작 전에 끝나므로 여기서는 모델 응답 오류 등 서버 오류만 발생 (내부 내용은 숨김)
+            detail = "경험 생성 중 오류가 발생했습니다."
+            yield format_sse({"detail": detail}, event="error") if use_sse else ndjson({"type": "error", "detail": detail})
+
+    if use_sse:
+        return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson", headers=SSE_HEADERS)
+
+
 @app.post(
     "/generate/experience",
     response_model=ExperienceResponse,
@@ -618,13 +600,11 @@ async def generate_experience(request: ExperienceRequest):
             if not isinstance(keyword.id, int) or not isinstance(keyword.name, str):
                 raise ValueError("키워드의 'id'는 정수여야 하며, 'name'은 문자열이어야 합니다.")
 
-        # 키워드 중복 검사
-        keyword_ids = [keyword.id for keyword in request.keywords]
-        if len(set(keyword_ids)) != len(keyword_ids):
-            raise ValueError("키워드 목록에 중복된 ID가 있습니다.")
+        # 키워드 인덱스 생성 (중복 ID 가 있으면 ValueError)
+        keyword_index = experience_service.keyword_index(request.keywords)
         result = await experience_service.generate_experience(
             request.retrospective_content,
-            request.keywords
+            keyword_index
         )
         logger.info(f"경험 추출 완료 - 추출된 경험 수: {len(result.experiences)}")
         return result
@@ -634,6 +614,9 @@ async def generate_experience(request: ExperienceRequest):
             status_code=400,
             detail=str(e)
         )
+    except HTTPException:
+        # 서비스가 정한 상태 코드 유지 (모델 응답 오류는 500, 400 은 위의 요청 검증에만 사용)
+        raise
     except Exception as e:
         logger.error(f"경험 생성 중 예상치 못한 오류 발생: {str(e)}")
         raise HTTPException(
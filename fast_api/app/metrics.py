@@ -0,0 +1,76 @@
+# app/metrics.py
+import logging
+from typing import Callable, List
+
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
+
+logger = logging.getLogger(__name__)
+
+# 모델 생성 시간을 고려한 지연 시간 구간 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 45, 60, 90, 120)
+
+# HTTP
+HTTP_REQUEST_LATENCY = Histogram(
+    "bbogle_ai_http_request_seconds", "HTTP 요청 처리 시간",
+    ["method", "path", "status"], buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("bbogle_ai_http_in_flight", "처리 중인 HTTP 요청 수")
+
+# RabbitMQ
+QUEUE_MESSAGE_LATENCY = Histogram(
+    "bbogle_ai_queue_message_seconds", "큐 메시지 처리 시간 (응답 발행 포함)",
+    ["queue", "outcome"], buckets=LATENCY_BUCKETS,
+)
+RABBITMQ_CONNECTION_STATE = Gauge(
+    "bbogle_ai_rabbitmq_connection_state", "RabbitMQ 연결 상태 (현재 상태만 1)", ["state"]
+)
+RABBITMQ_RECONNECTS = Counter("bbogle_ai_rabbitmq_reconnects_total", "연결이 끊어져 다시 연결한 횟수")
+RABBITMQ_CHANNEL_RESTARTS = Counter(
+    "bbogle_ai_rabbitmq_channel_restarts_total", "채널이 닫혀 큐 소비자를 다시 시작한 횟수", ["queue"]
+)
+QUEUE_IN_FLIGHT = Gauge("bbogle_ai_queue_in_flight", "처리 중인 큐 메시지 수", ["queue"])
+QUEUE_RETRIES = Counter("bbogle_ai_queue_retries_total", "지연 큐로 재시도 예약된 메시지 수", ["queue"])
+QUEUE_DEPTH = Gauge("bbogle_ai_queue_depth", "브로커에 대기 중인 메시지 수 (주기적으로 조회)", ["queue"])
+PUBLISHER_PENDING = Gauge("bbogle_ai_publisher_pending", "발행 대기 중인 응답 메시지 수")
+
+# Bedrock
+BEDROCK_LATENCY = Histogram(
+    "bbogle_ai_bedrock_call_seconds", "Bedrock 모델 호출 시간 (속도 제한 대기 제외)",
+    ["service", "operation"], buckets=LATENCY_BUCKETS,
+)
+BEDROCK_IN_FLIGHT = Gauge("bbogle_ai_bedrock_in_flight", "진행 중인 Bedrock 호출 수", ["service"])
+BEDROCK_TOKENS = Counter("bbogle_ai_bedrock_tokens_total", "응답 usage 기준 사용 토큰 수", ["service", "type"])
+BEDROCK_THROTTLES = Counter("bbogle_ai_bedrock_throttles_total", "Bedrock 스로틀링 응답 수", ["service"])
+RATE_LIMITER_WAITING = Gauge("bbogle_ai_rate_limiter_waiting", "속도 제한기에서 대기 중인 호출 수")
+RATE_LIMITER_RATIO = Gauge("bbogle_ai_rate_limiter_ratio", "속도 제한기의 현재 허용 속도 비율")
+
+# 요청 처리 단계 (app/utils/tracing.py)
+STAGE_LATENCY = Histogram(
+    "bbogle_ai_stage_seconds", "요청 처리 단계별 소요 시간",
+    ["trace", "stage"], buckets=(0.001, 0.005, 0.01, 0.05) + LATENCY_BUCKETS,
+)
+
+# 캐시
+CACHE_LOOKUPS = Counter("bbogle_ai_cache_lookups_total", "생성 결과 캐시 조회 수", ["namespace", "result"])
+RESPONSE_PARSE_RESULTS = Counter(
+    "bbogle_ai_response_parse_total", "모델 JSON 응답 파싱 결과 (parsed / repaired / salvaged / continued / failed)",
+    ["service", "result"]
+)
+SINGLEFLIGHT_IN_FLIGHT = Gauge("bbogle_ai_singleflight_in_flight", "진행 중인 생성 작업 수 (중복 제거 후)", ["service"])
+
+# /metrics 조회 시점에 현재 상태를 게이지에 반영하는 함수 목록
+_refresh_hooks: List[Callable[[], None]] = []
+
+
+def add_refresh_hook(func: Callable[[], None]):
+    _refresh_hooks.append(func)
+
+
+def render_metrics() -> bytes:
+    for hook in _refresh_hooks:
+        try:
+            hook()
+        except Exception as e:
+            logger.warning(f"메트릭 갱신 실패: {e}")
+    return generate_latest()
+
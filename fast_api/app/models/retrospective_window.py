@@ -0,0 +1,34 @@
+# app/models/retrospective_window.py
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String, Text, func
+
+from ..database import Base
+
+# 프로젝트 ID 없이 요청된 구간 요약의 project_id 값
+UNOWNED = ""
+
+
+def utcnow() -> datetime:
+    """used_at 기록 / 비교용 현재 시각 (UTC, DB 에는 timezone 없이 저장)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RetrospectiveWindow(Base):
+    """
+    회고록 map 단계에서 만든 구간(window) 요약
+    - content_hash: 구간 개발일지 내용 + 모델 ID + 프롬프트 버전으로 만든 해시 (내용이 바뀌면 다시 요약)
+    - project_id: 요약을 사용한 프로젝트 (프로젝트 ID 없는 요청은 UNOWNED)
+      같은 구간을 여러 프로젝트가 사용하면 프로젝트마다 행을 두어 한 프로젝트의 정리가 다른 프로젝트에 영향을 주지 않음
+    - used_at: 마지막으로 사용한 시각 (오래된 요약 정리 기준)
+    """
+    __tablename__ = "retrospective_window"
+
+    project_id = Column(String(64), primary_key=True, default=UNOWNED)
+    content_hash = Column(String(128), primary_key=True, index=True)
+    start_date = Column(String(32), nullable=False)
+    end_date = Column(String(32), nullable=False)
+    log_count = Column(Integer, nullable=False)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    used_at = Column(DateTime, default=utcnow, index=True, nullable=False)
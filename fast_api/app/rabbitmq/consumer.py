@@ -0,0 +1,359 @@
+# app/rabbitmq/consumer.py
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractIncomingMessage, AbstractQueue
+
+from ..metrics import (
+    QUEUE_IN_FLIGHT, QUEUE_MESSAGE_LATENCY, QUEUE_RETRIES, RABBITMQ_CHANNEL_RESTARTS, RABBITMQ_CONNECTION_STATE,
+    RABBITMQ_RECONNECTS,
+)
+from ..utils.tracing import PUBLISH, log_payload, span, start_trace
+from .publisher import ResponsePublisher
+from .retry import RetryableError, RetryScheduler
+
+logger = logging.getLogger(__name__)
+
+# 메시지 본문(bytes)을 받아 응답(dict)을 반환하는 코루틴 핸들러
+# - 응답이 None 이면 reply 를 보내지 않음
+# - 모든 핸들러는 애플리케이션의 이벤트 루프 하나에서 실행되므로
+#   서비스가 가진 비동기 자원(세션, 캐시 등)을 메시지 간에 재사용할 수 있음
+# - 일시적인 오류는 RetryableError 로 던지면 지연 큐를 거쳐 다시 처리됨
+MessageHandler = Callable[[bytes], Awaitable[Optional[dict]]]
+
+# 부분 응답을 발행하는 콜백 (partial_replies 로 등록한 핸들러에 reply_partial 인자로 전달)
+PartialReply = Callable[[dict], Awaitable[None]]
+
+# 요청 메시지에 이 헤더가 true 이면 최종 응답 전에 부분 응답을 같은 reply_to 로 발행
+# - Spring 의 direct reply-to(sendAndReceive)는 첫 응답만 받으므로 요청한 경우에만 전송
+PARTIAL_REPLY_HEADER = "x-partial-replies"
+# 응답 메시지에 붙는 부분 응답 여부 / 순번 헤더 (최종 응답은 x-partial=false)
+PARTIAL_HEADER = "x-partial"
+PARTIAL_INDEX_HEADER = "x-partial-index"
+
+
+class QueueConsumer:
+    """
+    단일 큐 소비자
+    - 큐마다 전용 채널을 사용해 다른 큐의 처리량/흐름 제어에 영향을 받지 않음
+    - 큐별 동시 처리 수(concurrency)만큼 메시지를 동시에 처리
+    - prefetch 는 기본적으로 concurrency 와 같게 설정해 처리 가능한 만큼만 브로커에서 받아옴
+    - partial_replies 이면 부분 응답을 요청한 메시지에 한해 핸들러에 reply_partial 콜백 전달
+    """
+
+    def __init__(self, queue_name: str, handler: MessageHandler, concurrency: int,
+                 publisher: ResponsePublisher, prefetch: Optional[int] = None,
+                 retry_scheduler: Optional[RetryScheduler] = None, partial_replies: bool = False):
+        self.queue_name = queue_name
+        self.handler = handler
+        self.partial_replies = partial_replies
+        self.publisher = publisher
+        self.concurrency = max(1, concurrency)
+        self.prefetch = max(1, prefetch) if prefetch else self.concurrency
+        self.retry_scheduler = retry_scheduler
+        self.in_flight = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._channel: Optional[AbstractChannel] = None
+        self._queue: Optional[AbstractQueue] = None
+        self._consumer_tag: Optional[str] = None
+
+    @property
+    def channel(self) -> Optional[AbstractChannel]:
+        return self._channel
+
+    async def start(self, channel: AbstractChannel):
+        self._channel = channel
+        # 채널을 다시 열어도 처리 중인 메시지를 포함해 동시 처리 수를 유지하도록 세마포어는 한 번만 생성
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        # basic_qos(global=False)는 이후 등록되는 소비자에게만 적용되므로 consume 직전에 설정
+        await channel.set_qos(prefetch_count=self.prefetch)
+        self._queue = await channel.declare_queue(self.queue_name, durable=True)
+        self._consumer_tag = await self._queue.consume(self._on_message)
+        logger.info(f"{self.queue_name} 소비 시작 (동시 처리 수: {self.concurrency}, prefetch: {self.prefetch})")
+
+    async def stop(self):
+        if self._queue is not None and self._consumer_tag is not None:
+            await self._queue.cancel(self._consumer_tag)
+            self._consumer_tag = None
+        if self._channel is not None and not self._channel.is_closed:
+            await self._channel.close()
+
+    async def _on_message(self, message: AbstractIncomingMessage):
+        async with self._semaphore:
+            with start_trace(self.queue_name, message.correlation_id):
+                self.in_flight += 1
+                QUEUE_IN_FLIGHT.labels(self.queue_name).inc()
+                start_time = time.perf_counter()
+                outcome = "success"
+                try:
+                    if self._wants_partial(message):
+                        response = await self.handler(message.body, reply_partial=self._partial_reply(message))
+                    else:
+                        response = await self.handler(message.body)
+                    if response is None:
+                        # 핸들러가 오류를 처리하고 응답을 보내지 않은 경우
+                        outcome = "error"
+                    elif message.reply_to:
+                        with span(PUBLISH):
+                            await self._reply(message, response)
+                        log_payload(logger, f"{self.queue_name} 응답 전송", response)
+                except RetryableError as e:
+                    outcome = "retry"
+                    await self._retry(message, e)
+                except Exception as e:
+                    outcome = "error"
+                    logger.error(f"{self.queue_name} 처리 중 오류 발생: {e}")
+                finally:
+                    self.in_flight -= 1
+                    QUEUE_IN_FLIGHT.labels(self.queue_name).dec()
+                    QUEUE_MESSAGE_LATENCY.labels(self.queue_name, outcome).observe(time.perf_counter() - start_time)
+                    await self._ack(message)
+
+    async def _ack(self, message: AbstractIncomingMessage):
+        try:
+            await message.ack()
+        except Exception as e:
+            # 처리 중 연결이 끊긴 경우 - ack 되지 않은 메시지는 브로커가 다시 전달
+            logger.warning(f"{self.queue_name} ack 실패 (재연결 후 다시 전달됨): {e!r}")
+
+    async def _retry(self, message: AbstractIncomingMessage, error: RetryableError):
+        """
+        지연 큐로 재발행 후 원본은 ack (워커는 바로 다음 메시지 처리)
+        - 재시도 횟수를 모두 소진했거나 재발행에 실패하면 응답 없이 종료
+        """
+        if self.retry_scheduler is None:
+            logger.error(f"{self.queue_name} 처리 중 오류 발생: {error}")
+            return
+        try:
+            attempt = await self.retry_scheduler.schedule(self.publisher, self.queue_name, message)
+        except Exception as e:
+            logger.error(f"{self.queue_name} 재시도 예약 실패: {e}")
+            return
+        if attempt is None:
+            logger.error(f"{self.queue_name} 최대 재시도 횟수 초과: {error}")
+        else:
+            QUEUE_RETRIES.labels(self.queue_name).inc()
+
+    def _wants_partial(self, message: AbstractIncomingMessage) -> bool:
+        if not self.partial_replies or not message.reply_to:
+            return False
+        value = (message.headers or {}).get(PARTIAL_REPLY_HEADER)
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value is True or str(value).lower() in ("true", "1")
+
+    def _partial_reply(self, message: AbstractIncomingMessage) -> PartialReply:
+        index = 0
+
+        async def reply_partial(response: dict):
+            nonlocal index
+            headers = {PARTIAL_HEADER: True, PARTIAL_INDEX_HEADER: index}
+            index += 1
+            with span(PUBLISH):
+                await self._reply(message, response, headers)
+
+        return reply_partial
+
+    async def _reply(self, message: AbstractIncomingMessage, response: dict, headers: Optional[dict] = None):
+        # 응답은 전용 발행기에서 발행되며 브로커 확인 후 원본 메시지를 ack
+        if headers is None and self._wants_partial(message):
+            headers = {PARTIAL_HEADER: False}
+        await self.publisher.publish(
+            aio_pika.Message(
+                body=json.dumps(response, ensure_ascii=False).encode("utf-8"),
+                correlation_id=message.correlation_id,
+                content_type="application/json",
+                headers=headers,
+            ),
+            routing_key=message.reply_to,
+        )
+
+
+class RabbitConsumer:
+    """
+    RabbitMQ 연결과 큐별 소비자를 관리
+    - FastAPI 이벤트 루프 위에서 동작 (aio-pika)
+    - 큐마다 전용 채널과 독립적인 동시 처리 수 / prefetch 적용
+      (짧은 제목 생성이 긴 회고록/경험 생성 뒤에서 기다리지 않도록 함)
+    - run() 은 연결을 감시하며 끊기면 지터가 적용된 지수 백오프로 다시 연결하고
+      큐 선언 / 소비자 / 응답 발행 채널을 복구 (ack 되지 않은 메시지는 브로커가 다시 전달)
+    - 연결은 유지된 채 소비 채널만 닫히면(채널 오류 등) 그 큐의 소비자만 새 채널로 다시 시작
+    """
+
+    # 연결 상태 (메트릭 라벨)
+    STATES = ("disconnected", "connecting", "connected")
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.consumers: Dict[str, QueueConsumer] = {}
+        self.retry_scheduler = RetryScheduler(settings)
+        self.publisher = ResponsePublisher(settings)
+        self.connection: Optional[AbstractConnection] = None
+        self.channel: Optional[AbstractChannel] = None
+        self.state = "disconnected"
+        self._stopping = False
+        self._closed: Optional[asyncio.Event] = None
+        # 큐별 소비자 재시작 태스크 (재시작 도중 채널이 다시 닫혀도 하나만 실행)
+        self._restart_tasks: Dict[str, asyncio.Task] = {}
+        self._set_state("disconnected")
+
+    @property
+    def is_connected(self) -> bool:
+        return self.connection is not None and not self.connection.is_closed
+
+    def register(self, queue_name: str, handler: MessageHandler, concurrency: int,
+                 prefetch: Optional[int] = None, partial_replies: bool = False):
+        self.consumers[queue_name] = QueueConsumer(
+            queue_name, handler, concurrency, self.publisher, prefetch, self.retry_scheduler, partial_replies
+        )
+
+    def _set_state(self, state: str):
+        self.state = state
+        for name in self.STATES:
+            RABBITMQ_CONNECTION_STATE.labels(name).set(1 if name == state else 0)
+
+    def _backoff(self, attempt: int) -> float:
+        """재연결 대기 시간 (full jitter: 0 ~ min(최대, 기본 * 2^attempt) 사이 임의 값)"""
+        ceiling = min(
+            self.settings.RABBITMQ_RECONNECT_MAX_SECONDS,
+            self.settings.RABBITMQ_RECONNECT_BASE_SECONDS * (2 ** attempt),
+        )
+        return random.uniform(0, ceiling)
+
+    def _on_connection_closed(self, *args):
+        if self._closed is not None:
+            self._closed.set()
+
+    def _on_channel_closed(self, consumer: QueueConsumer, connection: AbstractConnection,
+                           channel: AbstractChannel, exc: Optional[BaseException]):
+        # 연결 종료 / 재연결 / 애플리케이션 종료로 닫힌 채널은 run() 이 처리
+        if self._stopping or connection is not self.connection or connection.is_closed:
+            return
+        if consumer.channel is not channel:
+            return
+        running = self._restart_tasks.get(consumer.queue_name)
+        if running is not None and not running.done():
+            return
+        logger.warning(f"{consumer.queue_name} 채널이 닫혔습니다. 소비자를 다시 시작합니다: {exc!r}")
+        self._restart_tasks[consumer.queue_name] = asyncio.create_task(self._restart_consumer(consumer, connection))
+
+    async def _restart_consumer(self, consumer: QueueConsumer, connection: AbstractConnection):
+        """같은 연결에서 새 채널을 열어 소비자 재시작 (실패하면 지터 백오프 후 다시 시도)"""
+        attempt = 0
+        while not self._stopping and connection is self.connection and not connection.is_closed:
+            try:
+                await self._start_consumer(consumer, connection)
+                RABBITMQ_CHANNEL_RESTARTS.labels(consumer.queue_name).inc()
+                return
+            except Exception as e:
+                delay = self._backoff(attempt)
+                attempt += 1
+                logger.error(f"{consumer.queue_name} 소비자 재시작 실패, {delay:.1f}초 후 다시 시도합니다: {e!r}")
+                await asyncio.sleep(delay)
+
+    async def _start_consumer(self, consumer: QueueConsumer, connection: AbstractConnection):
+        channel = await connection.channel()
+        channel.close_callbacks.add(
+            lambda sender, exc=None: self._on_channel_closed(consumer, connection, channel, exc)
+        )
+        await consumer.start(channel)
+
+    async def run(self):
+        """
+        연결 감시 루프 (애플리케이션 종료 시까지 실행)
+        - 연결 / 채널 / 소비자 등록에 실패하거나 연결이 끊기면 대기 후 처음부터 다시 구성
+        """
+        self._stopping = False
+        attempt = 0
+        while not self._stopping:
+            self._closed = asyncio.Event()
+            self._set_state("connecting")
+            try:
+                await asyncio.wait_for(self.start(), self.settings.STARTUP_RABBITMQ_TIMEOUT_SECONDS)
+            except Exception as e:
+                await self._close_connection()
+                if self._stopping:
+                    break
+                delay = self._backoff(attempt)
+                attempt += 1
+                self._set_state("disconnected")
+                logger.error(f"RabbitMQ 연결 실패, {delay:.1f}초 후 다시 시도합니다: {e!r}")
+                await asyncio.sleep(delay)
+                continue
+
+            attempt = 0
+            self._set_state("connected")
+            logger.info("RabbitMQ 연결 완료")
+            await self._closed.wait()
+            if self._stopping:
+                break
+
+            self._set_state("disconnected")
+            RABBITMQ_RECONNECTS.inc()
+            logger.warning("RabbitMQ 연결이 끊어졌습니다. 다시 연결합니다.")
+            await self._close_connection()
+        self._set_state("disconnected")
+
+    async def start(self):
+        self.connection = await aio_pika.connect(
+            host=self.settings.RABBITMQ_HOST,
+            port=self.settings.RABBITMQ_PORT,
+            login=self.settings.RABBITMQ_USER,
+            password=self.settings.RABBITMQ_PASS,
+            heartbeat=self.settings.RABBITMQ_HEARTBEAT,  # heartbeat 설정 (초 단위)
+        )
+        self.connection.close_callbacks.add(self._on_connection_closed)
+        self.channel = await self.connection.channel()
+        await self.retry_scheduler.start(self.connection)
+        await self.channel.declare_queue("responseQueue", durable=True)
+        await self.publisher.start(self.connection)
+
+        for consumer in self.consumers.values():
+            await self._start_consumer(consumer, self.connection)
+
+    async def get_queue_depths(self, queue_names: List[str]) -> Dict[str, int]:
+        """큐별 대기 메시지 수 조회 (passive 선언이므로 큐 설정은 변경하지 않음)"""
+        depths: Dict[str, int] = {}
+        if not self.is_connected:
+            return depths
+        if self.channel is None or self.channel.is_closed:
+            # 없는 큐를 passive 선언하면 채널이 닫히므로 다시 생성
+            self.channel = await self.connection.channel()
+        for queue_name in queue_names:
+            queue = await self.channel.declare_queue(queue_name, passive=True)
+            depths[queue_name] = queue.declaration_result.message_count
+        return depths
+
+    async def _close_connection(self):
+        if self.connection is not None and not self.connection.is_closed:
+            try:
+                await self.connection.close()
+            except Exception as e:
+                logger.warning(f"RabbitMQ 연결 종료 실패: {e!r}")
+        self.connection = None
+        self.channel = None
+
+    async def stop(self):
+        self._stopping = True
+        if self._closed is not None:
+            self._closed.set()
+        for task in self._restart_tasks.values():
+            task.cancel()
+        self._restart_tasks.clear()
+        for consumer in self.consumers.values():
+            try:
+                await consumer.stop()
+            except Exception as e:
+                logger.warning(f"{consumer.queue_name} 소비 중지 실패: {e}")
+        try:
+            await self.publisher.stop()
+        except Exception as e:
+            logger.warning(f"응답 발행기 종료 실패: {e}")
+        await self._close_connection()
@@ -0,0 +1,153 @@
+# app/rabbitmq/publisher.py
+import asyncio
+import itertools
+import logging
+from typing import List, Optional, Tuple
+
+import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractConnection
+
+logger = logging.getLogger(__name__)
+
+# 발행 대기열 종료 표시
+_CLOSE = object()
+
+
+class ResponsePublisher:
+    """
+    응답 / 재시도 메시지 전용 발행기
+    - 소비 채널과 분리된 전용 채널 풀(publisher confirms 사용)에서 발행
+    - 워커는 발행 대기열에 메시지를 넘기고 브로커 확인(confirm)만 기다림
+    - 발행 태스크가 대기열에 쌓인 메시지를 최대 batch_size 개씩 꺼내
+      채널 풀에 나눠 동시에 발행하고 confirm 을 한꺼번에 기다림 (왕복 대기 최소화)
+    - 채널이 모두 닫혔으면 다시 열고, 발행 태스크가 예외로 종료되면 다시 시작
+    """
+
+    def __init__(self, settings):
+        self.channel_count = max(1, settings.RESPONSE_PUBLISHER_CHANNELS)
+        self.batch_size = max(1, settings.RESPONSE_PUBLISH_BATCH_SIZE)
+        self.published = 0
+        self.failed = 0
+        self._connection: Optional[AbstractConnection] = None
+        self._channels: List[AbstractChannel] = []
+        self._next_channel = itertools.cycle([])
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self, connection: AbstractConnection):
+        self._connection = connection
+        self._stopping = False
+        await self._open_channels()
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            self._start_task()
+        logger.info(f"응답 발행기 시작 (채널 수: {self.channel_count})")
+
+    async def stop(self):
+        """대기열에 남은 메시지를 모두 발행한 뒤 채널 종료"""
+        self._stopping = True
+        if self._task is not None and not self._task.done():
+            await self._queue.put(_CLOSE)
+            await self._task
+        self._task = None
+        for channel in self._channels:
+            if not channel.is_closed:
+                await channel.close()
+        self._channels = []
+
+    async def publish(self, message: aio_pika.Message, routing_key: str):
+        """
+        메시지를 발행 대기열에 넣고 브로커 확인을 기다림
+        - 발행에 실패하면 예외를 그대로 전달
+        """
+        if self._queue is None:
+            raise RuntimeError("응답 발행기가 시작되지 않았습니다.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, routing_key, future))
+        await future
+
+    async def _open_channels(self):
+        self._channels = [
+            await self._connection.channel(publisher_confirms=True) for _ in range(self.channel_count)
+        ]
+        self._next_channel = itertools.cycle(self._channels)
+
+    async def _pick_channel(self) -> AbstractChannel:
+        """
+        열린 채널을 순서대로 반환
+        - 모두 닫혔거나 채널 풀이 비어 있으면 다시 열고, 연결이 끊겨 열 수 없으면 예외
+        """
+        for _ in range(len(self._channels)):
+            channel = next(self._next_channel)
+            if not channel.is_closed:
+                return channel
+        if self._connection is None or self._connection.is_closed:
+            raise RuntimeError("응답 발행 채널을 열 수 없습니다. (브로커 연결 끊김)")
+        logger.warning("응답 발행 채널이 모두 닫혀 다시 엽니다.")
+        await self._open_channels()
+        return next(self._next_channel)
+
+    def _start_task(self):
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task):
+        # 종료 요청 없이 예외로 끝나면 대기열에 남은 메시지가 발행되지 않으므로 다시 시작
+        if task.cancelled() or task.exception() is None or self._stopping:
+            return
+        logger.error(f"응답 발행 태스크 비정상 종료: {task.exception()!r} - 다시 시작합니다.")
+        self._start_task()
+
+    async def _run(self):
+        closing = False
+        while not closing:
+            batch: List[Tuple[aio_pika.Message, str, asyncio.Future]] = []
+            item = await self._queue.get()
+            while True:
+                if item is _CLOSE:
+                    closing = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size or self._queue.empty():
+                    break
+                item = self._queue.get_nowait()
+            if not batch:
+                continue
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                logger.error(f"메시지 일괄 발행 중 오류 발생: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _flush(self, batch: List[Tuple[aio_pika.Message, str, asyncio.Future]]):
+        try:
+            channels = [await self._pick_channel() for _ in batch]
+        except Exception as e:
+            # 채널이 없으면 이번 묶음은 실패로 처리하고 발행 태스크는 계속 진행
+            results = [e] * len(batch)
+        else:
+            results = await asyncio.gather(
+                *(
+                    channel.default_exchange.publish(message, routing_key=routing_key)
+                    for channel, (message, routing_key, _) in zip(channels, batch)
+                ),
+                return_exceptions=True,
+            )
+        for (_, routing_key, future), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                self.failed += 1
+                logger.error(f"메시지 발행 실패 ({routing_key}): {result}")
+                if not future.done():
+                    future.set_exception(result)
+            else:
+                self.published += 1
+                if not future.done():
+                    future.set_result(None)
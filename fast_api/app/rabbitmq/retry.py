@@ -0,0 +1,140 @@
+# app/rabbitmq/retry.py
+import logging
+from typing import Optional, Set
+
+import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractIncomingMessage
+from aio_pika.exceptions import ChannelPreconditionFailed
+
+from ..bedrock.errors import is_transient_error
+
+logger = logging.getLogger(__name__)
+
+# 재시도 횟수를 기록하는 메시지 헤더
+RETRY_ATTEMPT_HEADER = "x-retry-attempt"
+
+
+class RetryableError(Exception):
+    """
+    브로커 지연 큐를 통해 다시 처리해야 하는 오류
+    - 메시지 핸들러가 일시적인 오류(스로틀링 등)를 만나면 이 예외로 감싸서 던짐
+    """
+
+
+def should_retry(error) -> bool:
+    """
+    스로틀링 / 일시적인 서버 오류인지 판단
+    - 메시지 문자열이 아니라 Bedrock 오류 코드(ClientError 의 Error.Code, 스트림 예외 이벤트)와 HTTP 상태로 판단
+    - botocore 연결 / 읽기 시간 초과, 연결 끊김도 재시도 (그 외 BotoCoreError 는 재시도하지 않음)
+    - 서비스가 HTTPException 으로 감싼 경우에도 원래 오류(__cause__ / __context__)를 확인
+    """
+    return is_transient_error(error)
+
+
+def get_attempt(message: AbstractIncomingMessage) -> int:
+    """지금까지 재시도한 횟수 (최초 수신이면 0)"""
+    try:
+        return int((message.headers or {}).get(RETRY_ATTEMPT_HEADER, 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+class RetryScheduler:
+    """
+    실패한 메시지를 지연 큐로 다시 발행해 일정 시간 뒤 원래 큐로 돌려보냄
+    - 재시도 차수마다 TTL 이 고정된 지연 큐(<큐 이름>.retry.<차수>)를 사용
+      (큐 단위 TTL 이라 앞 메시지가 만료되기 전에 뒤 메시지가 막히지 않음)
+    - 만료된 메시지는 기본 exchange 를 통해 원래 큐로 dead-letter 됨
+    - 원래 큐의 선언 인자는 건드리지 않음 (Spring 이 선언한 큐와 충돌 방지)
+    - 대기 중에는 워커를 점유하지 않으므로 다른 메시지 처리가 계속됨
+    - 지연 큐는 소비 채널과 분리된 전용 채널에서 선언
+      (선언이 거부되면 브로커가 채널을 닫으므로 소비 채널이 닫혀 소비가 멈추지 않도록 함)
+    """
+
+    def __init__(self, settings):
+        self.max_retries = settings.QUEUE_RETRY_MAX_ATTEMPTS
+        self.backoff_factor = settings.QUEUE_RETRY_BACKOFF_SECONDS
+        self.max_backoff = settings.QUEUE_RETRY_MAX_BACKOFF_SECONDS
+        self._declared: Set[str] = set()
+        self._connection: Optional[AbstractConnection] = None
+        self._channel: Optional[AbstractChannel] = None
+
+    async def start(self, connection: AbstractConnection):
+        """(재)연결 시 호출 - 새 연결에서 지연 큐를 다시 선언하도록 초기화"""
+        self._connection = connection
+        self._channel = None
+        self._declared.clear()
+
+    def calculate_delay(self, attempt: int) -> float:
+        """
+        재시도 대기 시간 (초)
+        - 초기 대기 시간(backoff_factor)에 지수 증가를 적용
+        - 최대 대기 시간(max_backoff)을 초과하지 않도록 제한
+        """
+        return min(self.backoff_factor * (2 ** (attempt - 1)), self.max_backoff)
+
+    def delay_queue_name(self, queue_name: str, attempt: int) -> str:
+        return f"{queue_name}.retry.{attempt}"
+
+    async def schedule(self, publisher, queue_name: str, message: AbstractIncomingMessage) -> Optional[int]:
+        """
+        메시지를 다음 차수의 지연 큐로 발행
+        - 재시도 횟수를 모두 소진했으면 발행하지 않고 None 반환
+        - reply_to / correlation_id 를 그대로 유지해 최종 응답이 원래 요청자에게 전달되도록 함
+        - 발행은 publisher(ResponsePublisher)를 통해 브로커 확인까지 기다림
+        """
+        attempt = get_attempt(message) + 1
+        if attempt >= self.max_retries:
+            return None
+
+        delay = self.calculate_delay(attempt)
+        delay_queue = self.delay_queue_name(queue_name, attempt)
+        if delay_queue not in self._declared:
+            await self._declare(delay_queue, delay, queue_name)
+
+        headers = dict(message.headers or {})
+        headers[RETRY_ATTEMPT_HEADER] = attempt
+        await publisher.publish(
+            aio_pika.Message(
+                body=message.body,
+                headers=headers,
+                content_type=message.content_type,
+                content_encoding=message.content_encoding,
+                correlation_id=message.correlation_id,
+                reply_to=message.reply_to,
+                message_id=message.message_id,
+                type=message.type,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            ),
+            routing_key=delay_queue,
+        )
+        logger.warning(
+            f"{queue_name} 재시도 예약 - {delay:.0f}초 후 재시도합니다. (시도 횟수: {attempt}/{self.max_retries})"
+        )
+        return attempt
+
+    async def _declare(self, delay_queue: str, delay: float, queue_name: str):
+        channel = await self._get_channel()
+        try:
+            await channel.declare_queue(
+                delay_queue,
+                durable=True,
+                arguments={
+                    "x-message-ttl": int(delay * 1000),
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": queue_name,
+                },
+            )
+        except ChannelPreconditionFailed as e:
+            # 다른 TTL 등으로 이미 선언된 큐 - 채널이 닫혔으므로 새 채널에서 존재만 확인하고 기존 설정 사용
+            logger.warning(f"{delay_queue} 가 다른 설정으로 이미 선언되어 있어 기존 큐를 사용합니다: {e}")
+            channel = await self._get_channel()
+            await channel.declare_queue(delay_queue, passive=True)
+        self._declared.add(delay_queue)
+
+    async def _get_channel(self) -> AbstractChannel:
+        if self._channel is None or self._channel.is_closed:
+            if self._connection is None or self._connection.is_closed:
+                raise RuntimeError("재시도 채널을 열 수 없습니다. (브로커 연결 끊김)")
+            self._channel = await self._connection.channel()
+        return self._channel
@@ -115,86 +115,233 @@
 #                 status_code=500,
 #                 detail="모델 응답 처리 실패"
 #             )
-import boto3
+import asyncio
 import json
-import re
 import time
-from botocore.config import Config
+from typing import Dict, List, Optional, Tuple
 from fastapi import HTTPException
 import logging
+from ..bedrock.client import get_bedrock_registry
+from ..bedrock.errors import is_throttling_error
+from ..bedrock.rate_limiter import Priority
+from ..cache.generation_cache import get_generation_cache, make_cache_key
+from ..cache.near_duplicate import get_near_duplicate_index
+from ..cache.singleflight import SingleFlight
+from ..utils.normalization import collapse_spaces, normalize_title, normalize_titles
+from ..utils.prompt_compaction import compact_qna
+from ..utils.tracing import POST_PROCESS, PROMPT_BUILD, RESPONSE_PARSE, span
 
 logger = logging.getLogger(__name__)
 
 
 class DevLogSummaryService:
-    def __init__(self, settings):
-        try:
-            session = boto3.Session(
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_REGION
-            )
+    # 프롬프트를 변경하면 버전을 올려 이전 캐시 결과가 재사용되지 않도록 함
+    PROMPT_VERSION = "v3"
+    FALLBACK_TITLE = "제목 생성 실패"
 
-            config = Config(
-                retries={"max_attempts": 3, "mode": "adaptive"}
-            )
+    # 제목 작성 규칙 (단건/일괄 생성 프롬프트에서 공통 사용)
+    TITLE_RULES = """1. 30자 이내로 작성할 것
+2. 주요 작업, 문제, 해결 과정을 포괄적으로 요약할 것
+3. 각 작업과 이슈를 쉼표로 구분해 표현할 것
+4. 제목이 개발일지 전체를 대표하도록 작성할 것
 
-            self.client = session.client(
-                "bedrock-runtime",
-                config=config
-            )
+정확한 예시:
+- 회고 설계 완료, API 호출 문제 해결
+- FAST API 설계, 회고 로직 연결 성공
+- 오류 해결, AWS 호출 문제 지원 완료"""
 
-            self.model_id = "anthropic.claude-3-haiku-20240307-v1:0"
+    def __init__(self, settings):
+        try:
+            # 모든 서비스가 공유하는 Bedrock 클라이언트 사용
+            # 클라이언트 생성은 첫 사용 시점으로 미룸 (import 시 boto3 초기화 비용 제거)
+            self.registry = get_bedrock_registry(settings)
+            self.model_id = self.registry.model_id
+            self.cache = get_generation_cache(settings)
+            self.near_duplicates = get_near_duplicate_index(settings)
+            self.singleflight = SingleFlight()
+            self.prompt_compaction = settings.PROMPT_COMPACTION_ENABLED
+            self.batch_max_size = settings.TITLE_BATCH_MAX_SIZE
             logger.info("Bedrock 클라이언트 초기화 성공!")
-            logger.info(f"AWS 세션 설정 성공: {session}")
-            logger.info(f"Bedrock 클라이언트 설정 성공: {self.client}")
 
         except Exception as e:
             logger.error(f"Bedrock 클라이언트 초기화 실패: {e}")
             raise
 
+    @property
+    def invoker(self):
+        # 공유 클라이언트는 애플리케이션 시작 시 스레드에서 미리 생성 (아직 없으면 첫 호출 시 호출 스레드에서 생성)
+        return self.registry.get_invoker()
+
     def clean_response(self, text: str, max_length: int = 30) -> str:
-        """응답을 정제하는 헬퍼 함수"""
-        # 여러 줄이 있는 경우 첫 줄만 선택
-        first_line = text.strip().split('\n')[0]
-
-        # 숫자로 시작하는 경우 제거
-        text = re.sub(r'^\d+\.?\s*', '', first_line)
-        # 영문자 제거 (한글과 숫자만 유지)
-        text = re.sub('[a-zA-Z]', '', text)
-        # 특수문자 제거 (쉼표와 공백은 허용)
-        text = re.sub(r'[-=+#/\?:^$.@*\"※~&%ㆍ!』\|\(\)\[\]\<\>`\'…》]', '', text)
-        # 마침표 제거
-        text = text.replace('.', '')
-        # 연속된 공백 제거
-        text = re.sub(r'\s+', ' ', text)
-
-        # 길이 제한 적용 시 자연스러운 끝부분 찾기
-        if len(text) > max_length:
-            truncated = text[:max_length]
-            last_comma = truncated.rfind(',')
-            if last_comma != -1 and last_comma > max_length * 0.5:
-                text = text[:last_comma].strip()
+        """응답을 정제하는 헬퍼 함수 (app/utils/normalization.py 의 제목 정제 사용)"""
+        return normalize_title(text, max_length)
+
+    async def generate_summary(self, qna_list: list) -> str:
+        """
+        - 동일한 입력으로 생성한 제목이 캐시에 있으면 모델 호출 없이 반환
+        - 띄어쓰기 / 문장부호 / 일부 문장만 다른 이전 입력이 있으면 그 제목을 재사용
+        - 같은 입력으로 동시에 들어온 요청은 하나의 모델 호출 결과를 공유
+        """
+        cache_key = make_cache_key("title", self._canonical_input(qna_list), self.model_id, self.PROMPT_VERSION)
+        cached = await self.cache.get("title", cache_key)
+        if cached is not None:
+            logger.info("제목 캐시 적중")
+            return cached
+
+        similar = await self._find_similar(qna_list)
+        if similar is not None:
+            return similar
+
+        return await self.singleflight.do(cache_key, lambda: self._generate_and_cache(qna_list, cache_key))
+
+    async def _generate_and_cache(self, qna_list: list, cache_key: str) -> str:
+        title = await self._generate_summary(qna_list)
+        if title and title != self.FALLBACK_TITLE:
+            await self.cache.set("title", cache_key, title)
+            await self.near_duplicates.add("title", self._scope, self._similarity_text(qna_list), title)
+        return title
+
+    @property
+    def _scope(self) -> str:
+        return f"{self.model_id}:{self.PROMPT_VERSION}"
+
+    def _similarity_text(self, qna_list: list) -> str:
+        # 질문은 고정 문구이므로 답변만 비교
+        return "\n".join(str(item.get('answer', "")) for item in qna_list)
+
+    async def _find_similar(self, qna_list: list) -> Optional[str]:
+        matches = await self.near_duplicates.query("title", self._scope, self._similarity_text(qna_list))
+        if not matches:
+            return None
+        similarity, title = matches[0]
+        logger.info(f"유사 개발일지 제목 재사용 (유사도 {similarity:.2f})")
+        return title
+
+    async def generate_summaries(self, qna_lists: List[list]) -> List[str]:
+        """
+        여러 개발일지의 제목을 일괄 생성 (입력과 같은 순서로 반환)
+        - 캐시에 있는 항목은 제외하고, 같은 입력은 한 번만 생성
+        - 다른 요청에서 이미 생성 중인 입력은 그 결과를 공유 (single-flight)
+        - 나머지는 최대 TITLE_BATCH_MAX_SIZE 개씩 묶어 묶음당 한 번의 모델 호출로 생성
+        """
+        keys = [
+            make_cache_key("title", self._canonical_input(qna_list), self.model_id, self.PROMPT_VERSION)
+            for qna_list in qna_lists
+        ]
+
+        results: Dict[str, str] = {}
+        pending: Dict[str, list] = {}
+        for key, qna_list in zip(keys, qna_lists):
+            if key in results or key in pending:
+                continue
+            cached = await self.cache.get("title", key)
+            if cached is None:
+                cached = await self._find_similar(qna_list)
+            if cached is not None:
+                results[key] = cached
             else:
-                last_space = truncated.rfind(' ')
-                if last_space != -1 and last_space > max_length * 0.5:
-                    text = text[:last_space].strip()
-                else:
-                    text = truncated.strip()
+                pending[key] = qna_list
 
-        return text
+        items = list(pending.items())
+        chunks = [items[i:i + self.batch_max_size] for i in range(0, len(items), self.batch_max_size)]
+        for chunk_result in await asyncio.gather(*(self._generate_chunk(chunk) for chunk in chunks)):
+            results.update(chunk_result)
 
-    async def generate_summary(self, qna_list: list) -> str:
+        logger.info(f"제목 일괄 생성 - 요청 {len(qna_lists)}건, 생성 대상 {len(items)}건, 묶음 {len(chunks)}개")
+        return [results[key] for key in keys]
+
+    async def _generate_chunk(self, items: List[Tuple[str, list]]) -> Dict[str, str]:
+        # 모든 항목을 single-flight 에 등록 (확인과 등록 사이에 await 가 없어 동시에 들어온 묶음끼리도 중복 생성하지 않음)
+        # - 다른 요청 / 묶음에서 이미 생성 중인 항목은 그 호출 결과를 공유
+        # - 나머지가 두 건 이상이면 묶음 호출 하나를 만들어 항목별 키에 연결
+        fresh = [(key, qna_list) for key, qna_list in items if key not in self.singleflight]
+        batch = asyncio.ensure_future(self._generate_batch(fresh)) if len(fresh) > 1 else None
+
+        async def title_of(key: str) -> str:
+            return (await batch)[key]
+
+        tasks = []
+        for key, qna_list in items:
+            if batch is not None:
+                func = lambda key=key: title_of(key)
+            else:
+                func = lambda key=key, qna_list=qna_list: self._generate_and_cache(qna_list, key)
+            tasks.append(self.singleflight.start(key, func))
+        titles = await asyncio.gather(*(asyncio.shield(task) for task in tasks))
+        return {key: title for (key, _), title in zip(items, titles)}
+
+    async def _generate_batch(self, items: List[Tuple[str, list]]) -> Dict[str, str]:
         try:
-            if not self.client:
-                logger.error("AWS 클라이언트가 제대로 초기화되지 않았습니다.")
-                raise HTTPException(
-                    status_code=500,
-                    detail="AWS 클라이언트 초기화 오류"
-                )
+            titles = await self._generate_summary_batch([qna_list for _, qna_list in items])
+        except ValueError as e:
+            # 묶음 응답을 해석하지 못한 경우에만 개별 생성으로 전환
+            # (항목 키는 이미 single-flight 에 등록되어 있으므로 generate_summary 를 거치지 않음)
+            logger.warning(f"제목 일괄 생성 응답 해석 실패, 개별 생성으로 전환: {e}")
+            titles = await asyncio.gather(*(self._generate_and_cache(qna_list, key) for key, qna_list in items))
+            return {key: title for (key, _), title in zip(items, titles)}
+
+        result = {}
+        for (key, qna_list), title in zip(items, titles):
+            result[key] = title
+            if title:
+                await self.cache.set("title", key, title)
+                await self.near_duplicates.add("title", self._scope, self._similarity_text(qna_list), title)
+        return result
 
+    async def _generate_summary_batch(self, qna_lists: List[list]) -> List[str]:
+        """여러 개발일지를 하나의 프롬프트로 묶어 제목 JSON 배열을 생성"""
+        start_time = time.time()
+        with span(PROMPT_BUILD):
+            prompt = self._create_batch_prompt(qna_lists)
+        payload = {
+            "anthropic_version": "bedrock-2023-05-31",
+            # 제목 하나당 약 60토큰 + JSON 배열 여유분
+            "max_tokens": 60 * len(qna_lists) + 50,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.1
+        }
+
+        try:
+            response_body = await self.invoker.invoke(
+                self.model_id, payload, priority=Priority.INTERACTIVE, service="title"
+            )
+        except Exception as e:
+            if not is_throttling_error(e):
+                raise
+            logger.error("요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+            raise HTTPException(
+                status_code=429,
+                detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요."
+            )
+
+        with span(RESPONSE_PARSE):
+            text = self._process_response(response_body)["title"]
+            titles = self._parse_batch_titles(text, len(qna_lists))
+
+        logger.info(f"제목 일괄 생성 소요 시간: {time.time() - start_time:.2f}초 ({len(qna_lists)}건)")
+        with span(POST_PROCESS):
+            return normalize_titles(titles, max_length=35)
+
+    def _parse_batch_titles(self, text: str, expected: int) -> List[str]:
+        start, end = text.find('['), text.rfind(']')
+        if start == -1 or end <= start:
+            raise ValueError("응답에서 JSON 배열을 찾을 수 없습니다.")
+        titles = json.loads(text[start:end + 1])
+        if not isinstance(titles, list) or len(titles) != expected or not all(isinstance(t, str) for t in titles):
+            raise ValueError(f"제목 {expected}개의 문자열 배열이 아닙니다.")
+        return titles
+
+    def _canonical_input(self, qna_list: list) -> list:
+        return [
+            [collapse_spaces(item.get('question', "")), collapse_spaces(item.get('answer', ""))]
+            for item in qna_list
+        ]
+
+    async def _generate_summary(self, qna_list: list) -> str:
+        try:
             start_time = time.time()
-            prompt = self._create_prompt(qna_list)
+            with span(PROMPT_BUILD):
+                prompt = self._create_prompt(qna_list)
 
             messages = [
                 {
@@ -210,17 +357,17 @@ class DevLogSummaryService:
                 "temperature": 0.1
             }
 
-            response = self.client.invoke_model(
-                modelId=self.model_id,
-                contentType="application/json",
-                accept="application/json",
-                body=json.dumps(payload)
+            # 모델 호출 (전용 스레드 풀에서 실행되어 이벤트 루프를 막지 않음)
+            response_body = await self.invoker.invoke(
+                self.model_id, payload, priority=Priority.INTERACTIVE, service="title"
             )
 
-            result = self._process_response(response)
+            with span(RESPONSE_PARSE):
+                result = self._process_response(response_body)
 
             # 응답 정제
-            clean_title = self.clean_response(result["title"], max_length=35)
+            with span(POST_PROCESS):
+                clean_title = self.clean_response(result["title"], max_length=35)
 
             end_time = time.time()
             execution_time = end_time - start_time
@@ -228,45 +375,58 @@ class DevLogSummaryService:
 
             return clean_title
 
-        except self.client.exceptions.ThrottlingException:
-            logger.error("요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
-            raise HTTPException(
-                status_code=429,
-                detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요."
-            )
         except Exception as e:
+            if is_throttling_error(e):
+                logger.error("요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+                raise HTTPException(
+                    status_code=429,
+                    detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요."
+                )
             logger.error(f"서버에서 발생한 에러: {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail="서버에서 예기치 못한 에러가 발생했습니다."
             )
 
-    def _create_prompt(self, qna_list: list) -> str:
-        qna_text = "\n\n".join([
+    def _format_qna(self, qna_list: list) -> str:
+        if self.prompt_compaction:
+            # '질문: 답변' 한 줄 형식 (빈 답변 생략)
+            return compact_qna(qna_list)
+        return "\n\n".join([
             f"[질문]\n{item['question']}\n\n[답변]\n{item['answer']}"
             for item in qna_list
         ])
 
+    def _create_prompt(self, qna_list: list) -> str:
+        qna_text = self._format_qna(qna_list)
+
         return f"""
 다음 규칙을 준수하여 위 개발일지 내용을 요약해주세요:
-1. 30자 이내로 작성할 것
-2. 주요 작업, 문제, 해결 과정을 포괄적으로 요약할 것
-3. 각 작업과 이슈를 쉼표로 구분해 표현할 것
-4. 제목이 개발일지 전체를 대표하도록 작성할 것
-
-정확한 예시:
-- 회고 설계 완료, API 호출 문제 해결
-- FAST API 설계, 회고 로직 연결 성공
-- 오류 해결, AWS 호출 문제 지원 완료
+{self.TITLE_RULES}
 
 개발일지 내용:
 {qna_text}
 """
 
-    def _process_response(self, response: dict) -> dict:
-        try:
-            result = json.loads(response['body'].read().decode("utf-8"))
+    def _create_batch_prompt(self, qna_lists: List[list]) -> str:
+        devlogs_text = "\n\n".join(
+            f"[개발일지 {index}]\n{self._format_qna(qna_list)}"
+            for index, qna_list in enumerate(qna_lists, start=1)
+        )
+
+        return f"""
+다음은 {len(qna_lists)}개의 개발일지입니다. 각 개발일지마다 아래 규칙을 준수하여 제목을 하나씩 작성해주세요:
+{self.TITLE_RULES}
 
+출력 형식:
+- 개발일지 번호 순서대로 제목 {len(qna_lists)}개를 담은 JSON 문자열 배열 하나만 출력할 것
+- 예: ["제목 1", "제목 2"]
+
+{devlogs_text}
+"""
+
+    def _process_response(self, result: dict) -> dict:
+        try:
             if 'content' in result and isinstance(result['content'], list):
                 for content_item in result['content']:
                     if content_item.get('type') == 'text':
@@ -275,7 +435,7 @@ class DevLogSummaryService:
                         }
 
             return {
-                "title": "제목 생성 실패"
+                "title": self.FALLBACK_TITLE
             }
 
         except Exception as e:
@@ -1,84 +1,244 @@
-import boto3
 import json
 import logging
-from botocore.config import Config
+import time
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException
 from app.schemas.experience_schema import Keyword, ExtractedExperience, ExperienceResponse
+from app.bedrock.client import get_bedrock_registry
+from app.bedrock.rate_limiter import Priority
+from app.cache.generation_cache import get_generation_cache, make_cache_key
+from app.cache.near_duplicate import get_near_duplicate_index
+from app.cache.singleflight import SingleFlight
+from app.metrics import RESPONSE_PARSE_RESULTS
+from app.utils.json_repair import NOT_FOUND, SALVAGED, salvage_array_items
+from app.utils.json_stream import JsonArrayItemParser
+from app.utils.keywords import KeywordIndex, best_keyword, rank_keywords
+from app.utils.normalization import collapse_spaces, normalize_experience
+from app.utils.tracing import POST_PROCESS, PROMPT_BUILD, RESPONSE_PARSE, add_span, log_payload, span
 
 logger = logging.getLogger(__name__)
 
 
 class ExperienceService:
+    # 프롬프트를 변경하면 버전을 올려 이전 캐시 결과가 재사용되지 않도록 함
+    PROMPT_VERSION = "v2"
+
     def __init__(self, settings):
         try:
-            session = boto3.Session(
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_REGION
-            )
-            config = Config(retries={"max_attempts": 3, "mode": "adaptive"})
-            self.client = session.client("bedrock-runtime", config=config)
-            self.model_id = "anthropic.claude-3-haiku-20240307-v1:0"
+            # 모든 서비스가 공유하는 Bedrock 클라이언트 사용
+            # 클라이언트 생성은 첫 사용 시점으로 미룸 (import 시 boto3 초기화 비용 제거)
+            self.registry = get_bedrock_registry(settings)
+            self.model_id = self.registry.model_id
+            self.cache = get_generation_cache(settings)
+            self.near_duplicates = get_near_duplicate_index(settings)
+            self.singleflight = SingleFlight()
+            self.keyword_top_k = settings.EXPERIENCE_KEYWORD_TOP_K
+            self.keyword_match_cutoff = settings.EXPERIENCE_KEYWORD_MATCH_CUTOFF
             logger.info("Bedrock 클라이언트 초기화 성공!")
         except Exception as e:
             logger.error(f"Bedrock 클라이언트 초기화 실패: {e}")
             raise
 
-    async def generate_experience(self, retrospective_content: str, keywords: list[Keyword]) -> ExperienceResponse:
-        try:
-            # 키워드 목록 생성
-            keyword_list = ', '.join([f"{k.name}(id:{str(k.id)})" for k in keywords])
-
-            # Prompt 생성
-            prompt = f"""
-            회고 내용을 분석하여 최대 4개의 핵심 경험을 추출하고, 각 경험에 적합한 **단일 키워드**를 매칭해주세요.
-
-            [회고 내용]
-            {retrospective_content}
-
-            [사용 가능한 키워드 목록]
-            {keyword_list}
-
-            [작성 요구사항]
-            1. 회고 내용에서 최대 4개의 핵심 경험 추출
-            2. 각 경험별 필수 포함 요소:
-               - 20자 이내의 요약된 제목
-               - 담당한 구체적인 업무와 역할
-               - 사용한 기술과 도구 명시
-               - 정량적인 수치로 표현된 성과 (예: 30% 향상, 50% 단축 등)
-               - 업무 수행을 통해 향상된 역량
-
-            3. 각 경험에는 **하나의 키워드(ID와 이름)**만 매칭
-            4. 다른 경험과 내용이 중복되지 않도록 작성
-
-            [필수 규칙]
-            - 각 경험은 300-700자의 하나의 문단으로 작성
-            - 키워드는 반드시 하나씩만 포함
-            - 구체적인 수치와 성과 반드시 포함
-            - 추상적인 표현이나 일반적인 협업 내용 제외
-
-            [출력 형식]
+    @property
+    def invoker(self):
+        # 공유 클라이언트는 애플리케이션 시작 시 스레드에서 미리 생성 (아직 없으면 첫 호출 시 호출 스레드에서 생성)
+        return self.registry.get_invoker()
+
+    async def generate_experience(self, retrospective_content: str, keywords: list[Keyword] | KeywordIndex) -> ExperienceResponse:
+        """
+        - keywords 는 키워드 목록 또는 이미 만든 KeywordIndex (중복 ID 가 있으면 ValueError)
+        - 동일한 회고 내용과 키워드 집합으로 생성한 경험이 캐시에 있으면 모델 호출 없이 반환
+        - 회고 내용이 거의 같은 이전 결과가 있고 그 키워드가 현재 키워드 목록에 모두 있으면 재사용
+        - 같은 입력으로 동시에 들어온 요청은 하나의 모델 호출 결과를 공유
+        """
+        index = self.keyword_index(keywords)
+        cache_key = self._cache_key(retrospective_content, index.keywords)
+        cached = await self.cache.get("experience", cache_key)
+        if cached is not None:
+            logger.info("경험 추출 캐시 적중")
+            return ExperienceResponse(**cached)
+
+        similar = await self._find_similar(retrospective_content, index)
+        if similar is not None:
+            return similar
+
+        return await self.singleflight.do(
+            cache_key,
+            lambda: self._generate_and_cache(retrospective_content, index, cache_key)
+        )
+
+    def keyword_index(self, keywords: list[Keyword] | KeywordIndex) -> KeywordIndex:
+        """요청의 키워드 인덱스 (요청마다 한 번만 생성, 중복 ID 가 있으면 ValueError)"""
+        if isinstance(keywords, KeywordIndex):
+            return keywords
+        return KeywordIndex(keywords, self.keyword_match_cutoff)
+
+    def _select_keywords(self, retrospective_content: str, index: KeywordIndex) -> list[Keyword]:
+        """프롬프트에 넣을 키워드 (키워드가 많으면 회고 내용과 관련 높은 상위 EXPERIENCE_KEYWORD_TOP_K 개)"""
+        selected = rank_keywords(retrospective_content, index.keywords, self.keyword_top_k)
+        if len(selected) < len(index):
+            logger.info(f"경험 추출 키워드 선별: {len(index)}개 중 {len(selected)}개")
+        return selected
+
+    def _cache_key(self, retrospective_content: str, keywords: list[Keyword]) -> str:
+        canonical = {
+            "content": collapse_spaces(retrospective_content),
+            "keywords": sorted([k.id, collapse_spaces(k.name)] for k in keywords),
+        }
+        return make_cache_key("experience", canonical, self.model_id, self.PROMPT_VERSION)
+
+    async def _generate_and_cache(self, retrospective_content: str, index: KeywordIndex, cache_key: str) -> ExperienceResponse:
+        result = await self._generate_experience(retrospective_content, index)
+        if result.experiences:
+            await self.cache.set("experience", cache_key, result.dict())
+            await self.near_duplicates.add("experience", self._scope, retrospective_content, result.dict())
+        return result
+
+    @property
+    def _scope(self) -> str:
+        return f"{self.model_id}:{self.PROMPT_VERSION}"
+
+    async def _find_similar(self, retrospective_content: str, index: KeywordIndex) -> Optional[ExperienceResponse]:
+        matches = await self.near_duplicates.query("experience", self._scope, retrospective_content)
+        for similarity, value in matches:
+            adapted = self._adapt_keywords(value, index)
+            if adapted is not None:
+                logger.info(f"유사 회고 내용의 경험 재사용 (유사도 {similarity:.2f})")
+                return adapted
+        return None
+
+    def _adapt_keywords(self, value: dict, index: KeywordIndex) -> Optional[ExperienceResponse]:
+        """
+        이전 결과의 키워드를 현재 요청의 키워드 목록에 맞춤 (KeywordIndex.match)
+        - 현재 목록에 없는 키워드가 하나라도 있으면 재사용하지 않음 (None)
+        """
+        experiences = []
+        for exp in value.get('experiences', []):
+            matched = []
+            for keyword in exp.get('keywords', []):
+                current = index.match(keyword)
+                if current is None:
+                    return None
+                matched.append({"id": current.id, "name": current.name})
+            experiences.append({**exp, "keywords": matched})
+        if not experiences:
+            return None
+        return ExperienceResponse(experiences=experiences)
+
+    async def stream_experience(self, retrospective_content: str, keywords: list[Keyword] | KeywordIndex,
+                                priority: int = Priority.INTERACTIVE) -> AsyncIterator[ExtractedExperience]:
+        """
+        경험을 스트리밍으로 생성 (Bedrock response-stream API)
+        - 모델 출력 JSON 을 조각 단위로 파싱해 경험 객체가 닫히는 즉시 반환
+        - 캐시에 있으면 캐시된 경험을 바로 반환하고, 스트림이 끝나면 전체 결과를 캐시에 저장
+        - 배열 형식을 찾지 못한 경우 전체 응답을 한 번에 파싱 (generate_experience 와 동일)
+        - 기본 우선순위는 INTERACTIVE (HTTP 스트리밍), 큐 메시지의 부분 응답은 BULK 로 호출
+        """
+        index = self.keyword_index(keywords)
+        cache_key = self._cache_key(retrospective_content, index.keywords)
+        cached = await self.cache.get("experience", cache_key)
+        if cached is not None:
+            logger.info("경험 추출 캐시 적중 (스트리밍)")
+            for experience in ExperienceResponse(**cached).experiences:
+                yield experience
+            return
+
+        similar = await self._find_similar(retrospective_content, index)
+        if similar is not None:
+            for experience in similar.experiences:
+                yield experience
+            return
+
+        prompt = self._create_prompt(retrospective_content, self._select_keywords(retrospective_content, index))
+        payload = self._create_payload(prompt)
+        parser = JsonArrayItemParser("experiences")
+        parts = []
+        experiences = []
+        async for event in self.invoker.invoke_stream(self.model_id, payload, priority=priority, service="experience"):
+            if event.get('type') != 'content_block_delta':
+                continue
+            text = event.get('delta', {}).get('text', "")
+            if not text:
+                continue
+            parts.append(text)
+            for exp in parser.feed(text):
+                experience = self._to_experience(exp, index)
+                if experience is None:
+                    continue
+                experiences.append(experience)
+                yield experience
+
+        if not parser.started:
+            logger.warning("경험 스트림에서 'experiences' 배열을 찾지 못해 전체 응답을 파싱합니다.")
+            experiences_data, status = salvage_array_items("".join(parts), 'experiences')
+            RESPONSE_PARSE_RESULTS.labels("experience", status if experiences_data else "failed").inc()
+            if not experiences_data:
+                raise ValueError("'experiences' 키가 누락되었습니다.")
+            for experience in self._to_experiences(experiences_data, index, status == SALVAGED):
+                experiences.append(experience)
+                yield experience
+        elif parser.errors:
+            logger.warning(f"경험 스트림 파싱 실패 항목 {parser.errors}개 제외")
+
+        if experiences and not parser.errors:
+            result = ExperienceResponse(experiences=experiences).dict()
+            await self.cache.set("experience", cache_key, result)
+            await self.near_duplicates.add("experience", self._scope, retrospective_content, result)
+
+    def _create_prompt(self, retrospective_content: str, keywords: list[Keyword]) -> str:
+        # 키워드 목록 생성
+        keyword_list = ', '.join([f"{k.name}(id:{str(k.id)})" for k in keywords])
+
+        # Prompt 생성
+        prompt = f"""
+        회고 내용을 분석하여 최대 4개의 핵심 경험을 추출하고, 각 경험에 적합한 **단일 키워드**를 매칭해주세요.
+
+        [회고 내용]
+        {retrospective_content}
+
+        [사용 가능한 키워드 목록]
+        {keyword_list}
+
+        [작성 요구사항]
+        1. 회고 내용에서 최대 4개의 핵심 경험 추출
+        2. 각 경험별 필수 포함 요소:
+           - 20자 이내의 요약된 제목
+           - 담당한 구체적인 업무와 역할
+           - 사용한 기술과 도구 명시
+           - 정량적인 수치로 표현된 성과 (예: 30% 향상, 50% 단축 등)
+           - 업무 수행을 통해 향상된 역량
+
+        3. 각 경험에는 **하나의 키워드(ID와 이름)**만 매칭
+        4. 다른 경험과 내용이 중복되지 않도록 작성
+
+        [필수 규칙]
+        - 각 경험은 300-700자의 하나의 문단으로 작성
+        - 키워드는 반드시 하나씩만 포함
+        - 구체적인 수치와 성과 반드시 포함
+        - 추상적인 표현이나 일반적인 협업 내용 제외
+
+        [출력 형식]
+        {{
+          "experiences": [
             {{
-              "experiences": [
-                {{
-                  "title": "경험 1의 요약 제목 (20자 이내)",
-                  "content": "경험 1의 내용 (300-700자)",
-                  "keywords": [
-                    {{"id": 1, "name": "키워드 1"}}
-                  ]
-                }},
-                {{
-                  "title": "경험 2의 요약 제목 (20자 이내)",
-                  "content": "경험 2의 내용 (300-700자)",
-                  "keywords": [
-                    {{"id": 2, "name": "키워드 2"}}
-                  ]
-                }}
+              "title": "경험 1의 요약 제목 (20자 이내)",
+              "content": "경험 1의 내용 (300-700자)",
+              "keywords": [
+                {{"id": 1, "name": "키워드 1"}}
+              ]
+            }},
+            {{
+              "title": "경험 2의 요약 제목 (20자 이내)",
+              "content": "경험 2의 내용 (300-700자)",
+              "keywords": [
+                {{"id": 2, "name": "키워드 2"}}
               ]
             }}
-            """
+          ]
+        }}
+        """
 
-            #             prompt = f"""
+        #             prompt = f"""
 # 회고 내용을 분석하여 최대 4개의 핵심 경험을 추출하고, 각 경험에 적합한 키워드를 매칭해주세요.
 #
 # [회고 내용]
@@ -125,75 +285,141 @@ class ExperienceService:
 #   ]
 # }}
 # """
-            logger.debug(f"최종 생성된 프롬프트: {prompt}")
+        return prompt
+
+    def _create_payload(self, prompt: str) -> dict:
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 2500,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.5
+        }
+
+    def _to_experience(self, exp: dict, index: KeywordIndex) -> Optional[ExtractedExperience]:
+        # 필요한 키 확인
+        if not all(key in exp for key in ('title', 'content', 'keywords')):
+            logger.error(f"경험 데이터 구조 오류: {exp}")
+            raise ValueError("경험 데이터에 필요한 키('title', 'content', 'keywords')가 누락되었습니다.")
+
+        # 제목 20자 / 내용 700자 이내로 정제
+        exp = normalize_experience(exp)
+
+        # 반환된 키워드를 요청의 키워드 목록과 맞춤 (목록에 없는 키워드는 제외)
+        returned = exp['keywords'] if isinstance(exp['keywords'], list) else []
+        keywords = index.reconcile(returned)
+        if len(keywords) < len(returned):
+            logger.warning(f"목록에 없는 키워드 제외: {returned}")
+        if not keywords:
+            # 남은 키워드가 없으면 경험 내용과 가장 관련 높은 키워드로 대체 (다시 호출하지 않음)
+            fallback = best_keyword(f"{exp['title']} {exp['content']}", index.keywords)
+            if fallback is None:
+                logger.warning(f"매칭할 키워드가 없어 경험 제외: {exp['title']}")
+                return None
+            keywords = [fallback]
+
+        return ExtractedExperience(
+            title=exp['title'],
+            content=exp['content'],
+            keywords=keywords
+        )
+
+    def _to_experiences(self, experiences_data: list, index: KeywordIndex, salvaged: bool = False) -> list[ExtractedExperience]:
+        """
+        경험 항목 목록 검증 및 처리
+        - 복구한 응답(salvaged)이면 구조가 맞지 않는 항목만 제외하고 나머지는 유지
+        - 매칭할 키워드가 없는 항목은 제외
+        """
+        experiences = []
+        for exp in experiences_data:
+            try:
+                experience = self._to_experience(exp, index)
+            except (ValueError, TypeError):
+                if not salvaged:
+                    raise
+                logger.warning(f"복구한 경험 항목 제외: {exp}")
+                continue
+            if experience is not None:
+                experiences.append(experience)
+        return experiences
+
+    async def _parse_experiences(self, payload: dict, text: str, index: KeywordIndex) -> list[ExtractedExperience]:
+        """
+        모델 응답 텍스트에서 경험 목록 추출
+        - 설명 문장 / 코드 블록 / 끝의 쉼표 / 잘린 응답을 고쳐서 복구 가능한 경험을 모두 사용
+        - JSON 은 시작됐지만 완성된 경험이 하나도 없으면 (max_tokens 로 잘림 등)
+          전체를 다시 생성하지 않고 기존 출력에 이어서 쓰도록 한 번만 추가 호출
+        """
+        with span(RESPONSE_PARSE):
+            experiences_data, status = salvage_array_items(text, 'experiences')
+
+        if not experiences_data and status == SALVAGED:
+            logger.warning("경험 응답에서 완성된 항목을 찾지 못해 이어쓰기를 요청합니다.")
+            text = await self._continue_output(payload, text)
+            with span(RESPONSE_PARSE):
+                experiences_data, status = salvage_array_items(text, 'experiences')
+            if experiences_data:
+                status = "continued"
+
+        if experiences_data is None or not experiences_data and status in (SALVAGED, NOT_FOUND):
+            RESPONSE_PARSE_RESULTS.labels("experience", "failed").inc()
+            logger.error(f"'experiences' 키가 누락되었습니다: {text[:200]}")
+            raise ValueError("'experiences' 키가 누락되었습니다.")
+
+        RESPONSE_PARSE_RESULTS.labels("experience", status).inc()
+        if status != "parsed":
+            logger.warning(f"경험 응답 복구 ({status}) - 경험 {len(experiences_data)}개")
+        return self._to_experiences(experiences_data, index, salvaged=status in (SALVAGED, "continued"))
+
+    async def _continue_output(self, payload: dict, text: str) -> str:
+        """이전 출력을 assistant 메시지로 이어 붙여 남은 부분만 생성 (마지막 공백은 허용되지 않음)"""
+        partial = text.rstrip()
+        continuation = dict(payload, messages=payload["messages"] + [{"role": "assistant", "content": partial}])
+        response_body = await self.invoker.invoke(self.model_id, continuation, service="experience")
+        content = response_body.get('content') or [{}]
+        return partial + content[0].get('text', "")
+
+    async def _generate_experience(self, retrospective_content: str, index: KeywordIndex) -> ExperienceResponse:
+        try:
+            prompt_start = time.perf_counter()
+            prompt = self._create_prompt(retrospective_content, self._select_keywords(retrospective_content, index))
+            add_span(PROMPT_BUILD, time.perf_counter() - prompt_start)
+            log_payload(logger, "최종 생성된 프롬프트", prompt, level=logging.DEBUG)
 
             # Bedrock API 요청
-            messages = [{"role": "user", "content": prompt}]
-            payload = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 2500,
-                "messages": messages,
-                "temperature": 0.5
-            }
-
-            response = self.client.invoke_model(
-                modelId=self.model_id,
-                contentType="application/json",
-                accept="application/json",
-                body=json.dumps(payload)
-            )
-
-            response_body = json.loads(response['body'].read().decode("utf-8"))
+            payload = self._create_payload(prompt)
+
+            # 모델 호출 (전용 스레드 풀에서 실행되어 이벤트 루프를 막지 않음)
+            response_body = await self.invoker.invoke(self.model_id, payload, service="experience")
             logger.info("Bedrock API 응답 수신 완료")
 
             if 'content' in response_body:
                 content_data = response_body['content']
 
                 # 로깅: 응답 데이터 타입 및 내용 확인
-                logger.debug(f"'content' 데이터 타입: {type(content_data)}")
-                logger.debug(f"'content' 데이터 내용: {content_data}")
+                logger.debug("'content' 데이터 타입: %s", type(content_data))
+                log_payload(logger, "'content' 데이터 내용", content_data, level=logging.DEBUG)
 
                 if isinstance(content_data, list) and len(content_data) > 0 and 'text' in content_data[0]:
-                    # 'text' 필드에 포함된 JSON 문자열을 파싱
-                    parsed_json = json.loads(content_data[0]['text'])
-
-                    # 예상 구조에 따라 'experiences' 키 처리
-                    if 'experiences' in parsed_json:
-                        experiences_data = parsed_json['experiences']
-
-                        # 각 경험 항목 검증 및 처리
-                        experiences = []
-                        for exp in experiences_data:
-                            # 필요한 키 확인
-                            if not all(key in exp for key in ('title', 'content', 'keywords')):
-                                logger.error(f"경험 데이터 구조 오류: {exp}")
-                                raise ValueError("경험 데이터에 필요한 키('title', 'content', 'keywords')가 누락되었습니다.")
-
-                            experiences.append(
-                                ExtractedExperience(
-                                    title=exp['title'],
-                                    content=exp['content'],
-                                    keywords=exp['keywords']
-                                )
-                            )
-                    else:
-                        logger.error(f"'experiences' 키가 누락되었습니다: {parsed_json}")
-                        raise ValueError("'experiences' 키가 누락되었습니다.")
+                    # 'text' 필드에 포함된 JSON 문자열을 파싱 (형식 오류는 복구 후 사용)
+                    experiences = await self._parse_experiences(payload, content_data[0]['text'], index)
                 else:
                     logger.error(f"'content' 데이터 구조가 예상과 다릅니다: {content_data}")
                     raise ValueError("'content' 데이터 구조가 예상과 다릅니다.")
 
-                return ExperienceResponse(experiences=experiences)
+                with span(POST_PROCESS):
+                    return ExperienceResponse(experiences=experiences)
             else:
                 logger.error("'content' 필드가 응답에 없습니다.")
                 raise ValueError("'content' 필드가 응답에 없습니다.")
 
-        except ValueError as e:
-            logger.error(f"입력 데이터 오류 발생: {e}")
-            raise HTTPException(status_code=400, detail=str(e))
         except json.JSONDecodeError as e:
+            # ValueError 의 하위 클래스이므로 먼저 처리
             logger.error(f"JSON 파싱 오류 발생: {e}")
             raise HTTPException(status_code=500, detail="경험 생성 중 JSON 파싱 오류가 발생했습니다.")
+        except ValueError as e:
+            # 모델 응답 구조 / 내용 오류 (요청 검증은 호출 전에 끝나므로 서버 오류로 처리)
+            logger.error(f"모델 응답 처리 오류 발생: {e}")
+            raise HTTPException(status_code=500, detail="경험 생성 중 오류가 발생했습니다.")
         except Exception as e:
             logger.error(f"경험 생성 중 예상치 못한 오류 발생: {e}")
             raise HTTPException(status_code=500, detail="경험 생성 중 오류가 발생했습니다.")
\ No newline at end of file
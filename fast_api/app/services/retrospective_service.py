@@ -1,98 +1,320 @@
 # app/services/retrospective_service.py
-import boto3
-import json
+import asyncio
 import logging
-from typing import List
-from botocore.config import Config
+from typing import AsyncIterator, List, Optional
 from fastapi import HTTPException
 from ..schemas.retrospective_schema import DailyLog
+from ..bedrock.client import get_bedrock_registry
+from ..bedrock.rate_limiter import Priority
+from ..cache.generation_cache import get_generation_cache, make_cache_key
+from ..cache.singleflight import SingleFlight
+from .retrospective_state import get_retrospective_state_store
+from ..utils.normalization import collapse_spaces, normalize_retrospective
+from ..utils.prompt_compaction import compact_daily_logs, measure_savings
+from ..utils.tracing import PROMPT_BUILD, RESPONSE_PARSE, span
 
 logger = logging.getLogger(__name__)
 
 class RetrospectiveService:
+    # 프롬프트를 변경하면 버전을 올려 이전 캐시 결과가 재사용되지 않도록 함
+    PROMPT_VERSION = "v3"
+
+    # 회고록 작성 지침 (단일 호출과 map-reduce 의 reduce 단계에서 공통 사용)
+    RETROSPECTIVE_GUIDELINE = """
+    개발일지를 바탕으로 구체적이고 완성도 높은 프로젝트 회고록을 작성해주세요.
+    각 섹션은 아래의 가이드라인을 참고하여 구체적 사례와 팀원 협업을 언급하고, 수치적 성과를 포함해주세요:
+
+    1. [잘한 점 & 성과]
+    - 프로젝트 기간 동안 성공적으로 달성된 작업 및 개선 사항
+    - 주요 성과와 성과 수치(예: 비용 절감, 속도 향상 등)
+    - 전체 시스템 아키텍처 개선 및 구현 사례
+
+    2. [어려웠던 점 & 해결 과정]
+    - 작업 중 발생한 구체적인 문제 상황과 해결을 위한 시도들
+    - 문제를 극복하기 위한 대안 및 각 선택의 결과
+    - 협업이 중요한 역할을 했던 사례 (예: Git 충돌 해결 등)
+
+    3. [기술 스택 & 아키텍처]
+    - 이번 프로젝트에서 활용한 주요 기술 스택 및 모델들
+    - 시스템 아키텍처와 그로 인한 성능 개선
+    - 보안 처리, 인증 방식, 데이터 처리 효율성 등
+
+    5. 작성 지침
+    - 글자 수 2000자 내외
+    - 기술 용어는 개발일지에 기록된 그대로 사용
+    """
+
     def __init__(self, settings):
         try:
-            session = boto3.Session(
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_REGION
-            )
-            config = Config(retries={"max_attempts": 3, "mode": "adaptive"})
-            self.client = session.client("bedrock-runtime", config=config)
-            self.model_id = "anthropic.claude-3-haiku-20240307-v1:0"
+            # 모든 서비스가 공유하는 Bedrock 클라이언트 사용
+            # 클라이언트 생성은 첫 사용 시점으로 미룸 (import 시 boto3 초기화 비용 제거)
+            self.registry = get_bedrock_registry(settings)
+            self.model_id = self.registry.model_id
+            self.cache = get_generation_cache(settings)
+            self.singleflight = SingleFlight()
+
+            # 긴 프로젝트는 기간별 요약 후 합치는 map-reduce 방식으로 생성
+            self.map_reduce_threshold = settings.RETROSPECTIVE_MAP_REDUCE_THRESHOLD
+            self.window_max_chars = settings.RETROSPECTIVE_WINDOW_MAX_CHARS
+            self.map_concurrency = settings.RETROSPECTIVE_MAP_CONCURRENCY
+            # 이전 요청에서 만든 구간 요약을 저장해 두고 새로 추가되거나 바뀐 구간만 다시 요약
+            self.state = get_retrospective_state_store(settings)
+
+            # 반복되는 템플릿 질문을 한 번만 적는 압축 형식으로 개발일지를 전달
+            self.prompt_compaction = settings.PROMPT_COMPACTION_ENABLED
             logger.info("Bedrock 클라이언트 초기화 성공!")
         except Exception as e:
             logger.error(f"Bedrock 클라이언트 초기화 실패: {e}")
             raise
 
-    async def generate_retrospective(self, dev_logs: List[DailyLog]) -> str:
-        try:
-            # 프롬프트 생성
-            prompt_parts = [
-                """
-                다음은 프로젝트 개발 기간 동안의 상세한 개발일지입니다.
-                각 일자별로 진행된 작업, 발생한 문제, 해결 방안을 기록했습니다.
-                이 내용을 바탕으로 프로젝트 회고록을 작성해주세요.
-
-                [개발일지 목록]
-                """
-            ]
-            
-            for log in dev_logs:
-                prompt_parts.append(f"\n날짜: {log.date}\n제목: {log.summary}\n\n[상세 내용]")
-                for qa in log.daily_log:
-                    prompt_parts.append(f"\n{qa.question}\n{qa.answer}")
-            
-            prompt_parts.append(
-                """
-                개발일지를 바탕으로 구체적이고 완성도 높은 프로젝트 회고록을 작성해주세요.
-                각 섹션은 아래의 가이드라인을 참고하여 구체적 사례와 팀원 협업을 언급하고, 수치적 성과를 포함해주세요:
-
-                1. [잘한 점 & 성과]
-                - 프로젝트 기간 동안 성공적으로 달성된 작업 및 개선 사항
-                - 주요 성과와 성과 수치(예: 비용 절감, 속도 향상 등)
-                - 전체 시스템 아키텍처 개선 및 구현 사례
-
-                2. [어려웠던 점 & 해결 과정]
-                - 작업 중 발생한 구체적인 문제 상황과 해결을 위한 시도들
-                - 문제를 극복하기 위한 대안 및 각 선택의 결과
-                - 협업이 중요한 역할을 했던 사례 (예: Git 충돌 해결 등)
-
-                3. [기술 스택 & 아키텍처]
-                - 이번 프로젝트에서 활용한 주요 기술 스택 및 모델들
-                - 시스템 아키텍처와 그로 인한 성능 개선
-                - 보안 처리, 인증 방식, 데이터 처리 효율성 등
-
-                5. 작성 지침
-                - 글자 수 2000자 내외
-                - 기술 용어는 개발일지에 기록된 그대로 사용
-                """
-            )
-            
-            prompt = "".join(prompt_parts)
-            
-            messages = [{"role": "user", "content": prompt}]
-            payload = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 2500,
-                "messages": messages
+    @property
+    def invoker(self):
+        # 공유 클라이언트는 애플리케이션 시작 시 스레드에서 미리 생성 (아직 없으면 첫 호출 시 호출 스레드에서 생성)
+        return self.registry.get_invoker()
+
+    async def generate_retrospective(self, dev_logs: List[DailyLog], project_id: Optional[str] = None) -> str:
+        """
+        - 동일한 개발일지로 생성한 회고록이 캐시에 있으면 모델 호출 없이 반환
+        - 같은 개발일지로 동시에 들어온 요청은 하나의 모델 호출 결과를 공유
+        - project_id 가 있으면 그 프로젝트의 이전 구간 요약 정리에 사용 (캐시 키에는 포함하지 않음)
+        """
+        cache_key = self._cache_key(dev_logs)
+        cached = await self.cache.get("retrospective", cache_key)
+        if cached is not None:
+            logger.info("회고록 캐시 적중")
+            return cached
+
+        return await self.singleflight.do(cache_key, lambda: self._generate_and_cache(dev_logs, cache_key, project_id))
+
+    async def _generate_and_cache(self, dev_logs: List[DailyLog], cache_key: str,
+                                  project_id: Optional[str] = None) -> str:
+        retrospective = await self._generate_retrospective(dev_logs, project_id)
+        if retrospective:
+            await self.cache.set("retrospective", cache_key, retrospective)
+        return retrospective
+
+    def _cache_key(self, dev_logs: List[DailyLog]) -> str:
+        return make_cache_key("retrospective", self._canonical(dev_logs), self.model_id, self.PROMPT_VERSION)
+
+    def _window_key(self, window: List[DailyLog]) -> str:
+        # 요약 프롬프트는 압축 형식 사용 여부에 따라 달라지므로 버전에 함께 포함
+        version = f"{self.PROMPT_VERSION}:{'compact' if self.prompt_compaction else 'verbose'}"
+        return make_cache_key("retrospective_window", self._canonical(window), self.model_id, version)
+
+    def _canonical(self, dev_logs: List[DailyLog]) -> list:
+        return [
+            {
+                "date": collapse_spaces(log.date),
+                "summary": collapse_spaces(log.summary),
+                "qna": [[collapse_spaces(qa.question), collapse_spaces(qa.answer)] for qa in log.daily_log],
             }
-            
-            response = self.client.invoke_model(
-                modelId=self.model_id,
-                contentType="application/json",
-                accept="application/json",
-                body=json.dumps(payload)
-            )
-            return self._process_response(response)
+            for log in dev_logs
+        ]
+
+    async def _generate_retrospective(self, dev_logs: List[DailyLog], project_id: Optional[str] = None) -> str:
+        try:
+            # 긴 프로젝트는 map 단계 모델 호출이 prompt_build 에 포함됨
+            with span(PROMPT_BUILD):
+                prompt = await self._build_prompt(dev_logs, project_id)
+            payload = self._create_payload(prompt)
+
+            # 모델 호출 (전용 스레드 풀에서 실행되어 이벤트 루프를 막지 않음)
+            response_body = await self.invoker.invoke(self.model_id, payload, service="retrospective")
+            with span(RESPONSE_PARSE):
+                return self._process_response(response_body)
         except Exception as e:
             logger.error(f"회고록 생성 중 오류 발생: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
-    def _process_response(self, response: dict) -> str:
+    async def stream_retrospective(self, dev_logs: List[DailyLog], project_id: Optional[str] = None,
+                                   priority: int = Priority.INTERACTIVE) -> AsyncIterator[str]:
+        """
+        회고록을 스트리밍으로 생성 (Bedrock response-stream API)
+        - 생성된 텍스트 조각을 도착하는 대로 반환
+        - 프롬프트는 generate_retrospective 와 동일 (긴 프로젝트는 map 단계 후 reduce 단계만 스트리밍)
+        - 캐시에 있으면 완성된 회고록을 한 번에 반환하고, 스트림이 끝나면 결과를 캐시에 저장
+        - 사용자가 응답을 기다리는 스트림이므로 기본 우선순위는 INTERACTIVE (map 단계 호출 포함)
+        """
+        cache_key = self._cache_key(dev_logs)
+        cached = await self.cache.get("retrospective", cache_key)
+        if cached is not None:
+            logger.info("회고록 캐시 적중 (스트리밍)")
+            yield cached
+            return
+
+        prompt = await self._build_prompt(dev_logs, project_id, priority)
+        payload = self._create_payload(prompt)
+
+        parts = []
+        async for event in self.invoker.invoke_stream(self.model_id, payload, priority=priority,
+                                                      service="retrospective"):
+            if event.get('type') == 'content_block_delta':
+                text = event.get('delta', {}).get('text', "")
+                if text:
+                    parts.append(text)
+                    yield text
+
+        retrospective = normalize_retrospective("".join(parts))
+        if retrospective:
+            await self.cache.set("retrospective", cache_key, retrospective)
+
+    def _create_prompt(self, dev_logs: List[DailyLog]) -> str:
+        prompt_parts = [
+            """
+            다음은 프로젝트 개발 기간 동안의 상세한 개발일지입니다.
+            각 일자별로 진행된 작업, 발생한 문제, 해결 방안을 기록했습니다.
+            이 내용을 바탕으로 프로젝트 회고록을 작성해주세요.
+
+            [개발일지 목록]
+            """
+        ]
+        prompt_parts.extend(self._format_logs(dev_logs))
+        prompt_parts.append(self.RETROSPECTIVE_GUIDELINE)
+        return "".join(prompt_parts)
+
+    def _format_logs(self, dev_logs: List[DailyLog]) -> List[str]:
+        if self.prompt_compaction:
+            return ["\n" + compact_daily_logs(dev_logs) + "\n"]
+        return self._format_logs_verbose(dev_logs)
+
+    def _format_logs_verbose(self, dev_logs: List[DailyLog]) -> List[str]:
+        prompt_parts = []
+        for log in dev_logs:
+            prompt_parts.append(f"\n날짜: {log.date}\n제목: {log.summary}\n\n[상세 내용]")
+            for qa in log.daily_log:
+                prompt_parts.append(f"\n{qa.question}\n{qa.answer}")
+        return prompt_parts
+
+    async def _build_prompt(self, dev_logs: List[DailyLog], project_id: Optional[str] = None,
+                            priority: int = Priority.BULK) -> str:
+        """
+        최종 회고록 생성에 사용할 프롬프트 생성
+        - 개발일지 분량이 기준 이하이면 기존과 같이 전체 개발일지로 한 번에 생성
+        - 기준을 넘으면 기간(window)별 요약을 동시에 만든 뒤(map) 요약들로 회고록을 생성(reduce)
+        - 이전 요청에서 요약한 구간은 저장된 요약을 사용 (새로 추가되거나 바뀐 구간만 요약)
+        """
+        log_text = "".join(self._format_logs(dev_logs))
+        if self.prompt_compaction:
+            stats = measure_savings("".join(self._format_logs_verbose(dev_logs)), log_text)
+            logger.info(f"회고록 프롬프트 압축: {stats}")
+
+        input_size = len(log_text)
+        if input_size <= self.map_reduce_threshold:
+            return self._create_prompt(dev_logs)
+
+        windows = self._split_windows(dev_logs)
+        logger.info(f"회고록 map-reduce 생성 - 입력 {input_size}자, 구간 {len(windows)}개")
+
+        summaries = await self._summarize_windows(windows, project_id, priority)
+        return self._create_reduce_prompt(windows, summaries)
+
+    async def _summarize_windows(self, windows: List[List[DailyLog]], project_id: Optional[str] = None,
+                                 priority: int = Priority.BULK) -> List[str]:
+        """
+        구간별 요약 (map 단계)
+        - 구간 내용 해시로 저장된 요약을 조회해 없는 구간만 동시에 요약
+        - 구간은 날짜순으로 앞에서부터 나누므로 개발일지가 하루 추가되면 보통 마지막 구간만 다시 요약
+        - 재사용한 요약을 포함해 현재 구간 요약을 모두 이 요청(project_id)의 것으로 저장하고,
+          project_id 가 있으면 그 프로젝트의 현재 구간에 없는 이전 요약은 정리
+        """
+        keys = [self._window_key(window) for window in windows]
+        stored = await self.state.get_summaries(keys)
+        missing = [index for index, key in enumerate(keys) if not stored.get(key)]
+        logger.info(f"회고록 구간 요약 재사용 {len(windows) - len(missing)}개 / 새로 요약 {len(missing)}개")
+
+        semaphore = asyncio.Semaphore(self.map_concurrency)
+
+        async def summarize(window: List[DailyLog]) -> str:
+            async with semaphore:
+                return await self._summarize_window(window, priority)
+
+        created = await asyncio.gather(*(summarize(windows[index]) for index in missing))
+        summaries = dict(stored)
+        for index, summary in zip(missing, created):
+            summaries[keys[index]] = summary
+
+        await self.state.save(
+            [
+                {
+                    "content_hash": keys[index],
+                    "start_date": str(windows[index][0].date),
+                    "end_date": str(windows[index][-1].date),
+                    "log_count": len(windows[index]),
+                    "summary": summaries[key],
+                }
+                for index, key in enumerate(keys) if summaries.get(key)
+            ],
+            project_id,
+            keys,
+        )
+        return [summaries[key] for key in keys]
+
+    def _split_windows(self, dev_logs: List[DailyLog]) -> List[List[DailyLog]]:
+        """날짜순으로 정렬한 개발일지를 구간별 글자 수 한도에 맞춰 연속된 기간으로 분할"""
+        windows: List[List[DailyLog]] = []
+        current: List[DailyLog] = []
+        current_size = 0
+        for log in sorted(dev_logs, key=lambda log: log.date):
+            size = sum(len(part) for part in self._format_logs([log]))
+            if current and current_size + size > self.window_max_chars:
+                windows.append(current)
+                current, current_size = [], 0
+            current.append(log)
+            current_size += size
+        if current:
+            windows.append(current)
+        return windows
+
+    async def _summarize_window(self, window: List[DailyLog], priority: int = Priority.BULK) -> str:
+        """한 구간의 개발일지를 회고록 작성용으로 요약 (map 단계)"""
+        prompt_parts = [
+            f"""
+            다음은 프로젝트 개발 기간 중 {window[0].date} ~ {window[-1].date} 의 개발일지입니다.
+            이후 프로젝트 전체 회고록 작성에 사용할 수 있도록 이 기간의 내용을 요약해주세요.
+
+            [개발일지 목록]
+            """
+        ]
+        prompt_parts.extend(self._format_logs(window))
+        prompt_parts.append(
+            """
+
+            [요약 지침]
+            - 수행한 작업, 발생한 문제와 해결 과정, 사용한 기술을 빠짐없이 포함
+            - 수치, 기술 용어, 고유 명사는 개발일지에 기록된 그대로 유지
+            - 800자 이내의 개조식으로 작성
+            """
+        )
+        payload = self._create_payload("".join(prompt_parts), max_tokens=1000)
+        response_body = await self.invoker.invoke(self.model_id, payload, priority=priority, service="retrospective")
+        return self._process_response(response_body)
+
+    def _create_reduce_prompt(self, windows: List[List[DailyLog]], summaries: List[str]) -> str:
+        prompt_parts = [
+            """
+            다음은 프로젝트 개발 기간을 여러 구간으로 나누어 요약한 개발일지입니다.
+            각 구간별로 진행된 작업, 발생한 문제, 해결 방안을 정리했습니다.
+            이 내용을 바탕으로 프로젝트 회고록을 작성해주세요.
+
+            [구간별 개발일지 요약]
+            """
+        ]
+        for window, summary in zip(windows, summaries):
+            prompt_parts.append(f"\n기간: {window[0].date} ~ {window[-1].date}\n{summary}\n")
+        prompt_parts.append(self.RETROSPECTIVE_GUIDELINE)
+        return "".join(prompt_parts)
+
+    def _create_payload(self, prompt: str, max_tokens: int = 2500) -> dict:
+        messages = [{"role": "user", "content": prompt}]
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": messages
+        }
+
+    def _process_response(self, result: dict) -> str:
         try:
-            result = json.loads(response['body'].read().decode("utf-8"))
-            return result.get('content', [{}])[0].get('text', "").strip()
+            return normalize_retrospective(result.get('content', [{}])[0].get('text', ""))
         except Exception as e:
             logger.error(f"응답 처리 중 오류 발생: {e}")
             raise HTTPException(status_code=500, detail="모델 응답 처리 실패")
@@ -0,0 +1,119 @@
+# app/services/retrospective_state.py
+import asyncio
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from ..database import Base, SessionLocal, engine
+from ..models.retrospective_window import UNOWNED, RetrospectiveWindow, utcnow
+
+logger = logging.getLogger(__name__)
+
+
+class RetrospectiveStateStore:
+    """
+    회고록 구간(window) 요약 저장소 (SQLAlchemy, app/database.py)
+    - 구간 내용 해시로 이전 요청(다른 프로젝트 포함)에서 만든 요약을 조회
+    - 요약은 (project_id, content_hash) 로 저장해 프로젝트마다 사용 중인 구간을 따로 관리
+    - 프로젝트 ID 가 있으면 그 프로젝트의 현재 구간에 없는 이전 요약을 정리
+    - 오래 사용하지 않은 요약(TTL)과 프로젝트 ID 없는 요약의 최대 개수 초과분도 저장할 때 정리
+    - DB 작업은 스레드에서 실행하고, 실패해도 회고록 생성은 계속 진행 (요약을 새로 생성)
+    """
+
+    def __init__(self, settings):
+        self.enabled = settings.RETROSPECTIVE_STATE_ENABLED
+        self.ttl = timedelta(seconds=settings.RETROSPECTIVE_STATE_TTL_SECONDS)
+        self.max_unowned = settings.RETROSPECTIVE_STATE_MAX_UNOWNED
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _ensure_table(self):
+        if self._ready:
+            return
+        with self._lock:
+            if not self._ready:
+                Base.metadata.create_all(bind=engine, tables=[RetrospectiveWindow.__table__])
+                self._ready = True
+
+    async def get_summaries(self, content_hashes: List[str]) -> Dict[str, str]:
+        """저장된 구간 요약 {content_hash: summary} (없거나 조회에 실패하면 빈 dict)"""
+        if not self.enabled or not content_hashes:
+            return {}
+        try:
+            return await asyncio.to_thread(self._get_summaries, content_hashes)
+        except Exception as e:
+            logger.warning(f"회고록 구간 요약 조회 실패: {e}")
+            return {}
+
+    async def save(self, windows: List[dict], project_id: Optional[str] = None,
+                   keep_hashes: Iterable[str] = ()):
+        """
+        구간 요약 저장
+        - windows: content_hash / start_date / end_date / log_count / summary 를 가진 dict 목록
+          (재사용한 구간도 포함해 이 요청이 사용한 구간을 모두 전달, 사용 시각 갱신)
+        - project_id 가 있으면 keep_hashes 에 없는 그 프로젝트의 이전 구간 요약은 삭제
+        """
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self._save, windows, project_id, set(keep_hashes))
+        except Exception as e:
+            logger.warning(f"회고록 구간 요약 저장 실패: {e}")
+
+    def _get_summaries(self, content_hashes: List[str]) -> Dict[str, str]:
+        self._ensure_table()
+        with SessionLocal() as db:
+            rows = db.query(RetrospectiveWindow).filter(
+                RetrospectiveWindow.content_hash.in_(content_hashes)
+            ).all()
+            return {row.content_hash: row.summary for row in rows}
+
+    def _save(self, windows: List[dict], project_id: Optional[str], keep_hashes: set):
+        self._ensure_table()
+        owner = project_id or UNOWNED
+        now = utcnow()
+        with SessionLocal() as db:
+            for window in windows:
+                db.merge(RetrospectiveWindow(project_id=owner, used_at=now, **window))
+            if project_id:
+                stale = db.query(RetrospectiveWindow).filter(RetrospectiveWindow.project_id == owner)
+                if keep_hashes:
+                    stale = stale.filter(RetrospectiveWindow.content_hash.notin_(keep_hashes))
+                removed = stale.delete(synchronize_session=False)
+                if removed:
+                    logger.info(f"프로젝트 {project_id} 이전 구간 요약 {removed}개 정리")
+            expired = db.query(RetrospectiveWindow).filter(
+                RetrospectiveWindow.used_at < now - self.ttl
+            ).delete(synchronize_session=False)
+            if expired:
+                logger.info(f"오래 사용하지 않은 구간 요약 {expired}개 정리")
+            db.flush()
+            overflow = [
+                content_hash for (content_hash,) in db.query(RetrospectiveWindow.content_hash)
+                .filter(RetrospectiveWindow.project_id == UNOWNED)
+                .order_by(RetrospectiveWindow.used_at.desc())
+                .offset(self.max_unowned)
+                .all()
+            ]
+            if overflow:
+                db.query(RetrospectiveWindow).filter(
+                    RetrospectiveWindow.project_id == UNOWNED,
+                    RetrospectiveWindow.content_hash.in_(overflow),
+                ).delete(synchronize_session=False)
+                logger.info(f"프로젝트 ID 없는 구간 요약 {len(overflow)}개 정리 (최대 {self.max_unowned}개)")
+            db.commit()
+
+
+_store: Optional[RetrospectiveStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_retrospective_state_store(settings) -> RetrospectiveStateStore:
+    """프로세스 전체에서 공유하는 회고록 구간 요약 저장소 반환"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RetrospectiveStateStore(settings)
+    return _store
@@ -0,0 +1,114 @@
+# app/utils/json_repair.py
+import json
+from typing import Any, List, Optional, Tuple
+
+from .json_stream import JsonArrayItemParser
+
+# JSON 구분자로 잘못 쓰인 따옴표 (문자열 밖에서만 " 로 취급)
+_SMART_QUOTES = "“”„"
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+def extract_json_block(text: str) -> Optional[str]:
+    """
+    모델 응답에서 JSON 부분만 추출
+    - 앞뒤 설명 문장이나 코드 블록 표시(```json)는 제외
+    - 닫히지 않은 경우(max_tokens 로 잘림) 시작 위치부터 끝까지 반환
+    """
+    starts = [index for index in (text.find('{'), text.find('[')) if index != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    closer = _CLOSERS[text[start]]
+    end = text.rfind(closer)
+    if end <= start:
+        return text[start:].rstrip().rstrip('`').rstrip()
+    return text[start:end + 1]
+
+
+def repair_json(text: str) -> str:
+    """
+    흔한 모델 출력 오류를 고친 JSON 문자열 반환 (문자열 상태를 추적하며 한 번 훑음)
+    - 닫는 괄호 앞의 쉼표 제거
+    - 문자열 밖의 둥근 따옴표(“ ”)를 " 로 치환
+    - 문자열 안의 줄바꿈 / 탭을 이스케이프
+    - 잘린 응답을 닫지는 않음 (완성된 원소만 salvage_array_items 에서 복구)
+    """
+    result: List[str] = []
+    in_string = False
+    smart_string = False
+    escape = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"' or smart_string and char in _SMART_QUOTES and _ends_value(text, index + 1):
+                in_string = False
+                char = '"'
+            elif char == '\n':
+                char = '\\n'
+            elif char == '\t':
+                char = '\\t'
+            elif char == '\r':
+                continue
+            result.append(char)
+            continue
+
+        if char == '"' or char in _SMART_QUOTES:
+            in_string = True
+            smart_string = char != '"'
+            char = '"'
+        elif char in '}]':
+            _drop_trailing_comma(result)
+        result.append(char)
+    return "".join(result)
+
+
+def _ends_value(text: str, index: int) -> bool:
+    # 둥근 따옴표로 시작한 문자열은 뒤에 구분자가 오는 둥근 따옴표에서만 닫음 (본문 안의 인용은 유지)
+    rest = text[index:].lstrip()
+    return not rest or rest[0] in ':,}]'
+
+
+def _drop_trailing_comma(result: List[str]):
+    index = len(result) - 1
+    while index >= 0 and result[index].isspace():
+        index -= 1
+    if index >= 0 and result[index] == ',':
+        del result[index]
+
+
+# salvage_array_items 결과 상태
+PARSED = "parsed"          # 그대로 파싱 성공
+REPAIRED = "repaired"      # 고친 뒤 전체 파싱 성공
+SALVAGED = "salvaged"      # 완성된 원소만 복구 (잘렸거나 고칠 수 없는 응답)
+NOT_FOUND = "not_found"    # JSON 이 없음
+
+
+def salvage_array_items(text: str, key: str) -> Tuple[Optional[List[Any]], str]:
+    """
+    모델 응답에서 key 배열의 원소를 최대한 복구
+    1. JSON 부분만 추출해 그대로 파싱
+    2. 쉼표 / 따옴표 / 줄바꿈을 고쳐 다시 파싱
+    3. 잘린 응답이면 완성된 원소만 하나씩 복구 (작성 중이던 마지막 원소는 버림)
+    - (원소 목록, 상태) 반환, 전체 파싱은 됐지만 key 가 없으면 원소 목록은 None
+    """
+    block = extract_json_block(text)
+    if block is None:
+        return None, NOT_FOUND
+
+    for candidate, status in ((block, PARSED), (repair_json(block), REPAIRED)):
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, list):
+            return parsed, status
+        if isinstance(parsed, dict) and isinstance(parsed.get(key), list):
+            return parsed[key], status
+        return None, status
+
+    parser = JsonArrayItemParser(key, repair=repair_json)
+    return parser.feed(block), SALVAGED
@@ -0,0 +1,107 @@
+# app/utils/json_stream.py
+import json
+from typing import Any, Callable, List, Optional
+
+
+class JsonArrayItemParser:
+    """
+    스트리밍으로 도착하는 JSON 텍스트에서 특정 키 배열의 원소 객체를 완성되는 대로 꺼내는 파서
+    - 예: {"experiences": [{...}, {...}]} 에서 key="experiences" 이면 각 {...} 가 닫히는 즉시 반환
+    - 문자열 / 이스케이프 상태와 중첩 깊이만 추적하고, 완성된 원소만 json.loads 로 변환
+    - 배열 앞뒤의 설명 문장이나 코드 블록 표시(```json)는 무시
+    - repair 가 있으면 파싱에 실패한 원소를 고쳐서 한 번 더 시도
+    """
+
+    def __init__(self, key: str, repair: Optional[Callable[[str], str]] = None):
+        self.key = key
+        self.repair = repair
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._target_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self.errors = 0
+
+    def feed(self, text: str) -> List[Any]:
+        """텍스트 조각을 추가하고 이번 조각으로 완성된 원소 목록을 반환"""
+        self._buffer += text
+        items = []
+        buffer = self._buffer
+        stack = self._stack
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if stack and stack[-1] == '{':
+                        self._last_string = buffer[self._string_start:pos]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = pos + 1
+            elif char == ':':
+                if stack and stack[-1] == '{':
+                    self._pending_key = self._last_string
+            elif char == '{':
+                if self._target_depth is not None and len(stack) == self._target_depth:
+                    self._item_start = pos
+                stack.append('{')
+                self._pending_key = None
+            elif char == '[':
+                if self._target_depth is None and self._pending_key == self.key:
+                    self._target_depth = len(stack) + 1
+                stack.append('[')
+                self._pending_key = None
+            elif char in '}]':
+                if stack:
+                    stack.pop()
+                if char == '}' and self._item_start is not None and len(stack) == self._target_depth:
+                    item = self._decode(buffer[self._item_start:pos + 1])
+                    if item is not None:
+                        items.append(item)
+                    self._item_start = None
+                elif char == ']' and self._target_depth is not None and len(stack) < self._target_depth:
+                    # 대상 배열 종료 - 이후 텍스트는 무시
+                    self._target_depth = -1
+                self._pending_key = None
+            elif char == ',':
+                self._pending_key = None
+            pos += 1
+
+        # 처리한 앞부분은 버림 (진행 중인 원소 / 문자열 시작 위치는 유지)
+        keep = min(i for i in (pos, self._item_start, self._string_start if self._in_string else None) if i is not None)
+        self._buffer = buffer[keep:]
+        self._pos = pos - keep
+        if self._item_start is not None:
+            self._item_start -= keep
+        if self._in_string:
+            self._string_start -= keep
+        return items
+
+    @property
+    def started(self) -> bool:
+        """대상 배열이 시작되었는지 여부"""
+        return self._target_depth is not None
+
+    def _decode(self, text: str) -> Optional[Any]:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        if self.repair is not None:
+            try:
+                return json.loads(self.repair(text))
+            except json.JSONDecodeError:
+                pass
+        # 원소 하나가 깨져도 나머지 원소는 계속 반환
+        self.errors += 1
+        return None
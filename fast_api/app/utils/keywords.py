@@ -0,0 +1,142 @@
+# app/utils/keywords.py
+import difflib
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from ..schemas.experience_schema import Keyword
+
+_WORD = re.compile(r"\w+")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+# BM25 파라미터 (일반적인 기본값)
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+
+def normalize_keyword_name(name: str) -> str:
+    """비교용 키워드 이름 (소문자, 공백 / 문장부호 제거)"""
+    return "".join(char for char in str(name).lower() if char.isalnum())
+
+
+def terms(text: str) -> List[str]:
+    """
+    검색어 단위 분리
+    - 영문 / 숫자 단어는 그대로, 한글 등은 글자 2-gram 으로 분리 (조사가 붙은 어절도 매칭되도록)
+    """
+    result = []
+    for word in _WORD.findall(str(text).lower()):
+        if word.isascii() or len(word) < 2:
+            result.append(word)
+        else:
+            result.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return result
+
+
+class KeywordIndex:
+    """
+    요청 하나의 키워드 목록 인덱스 (요청마다 한 번 생성)
+    - ID → 키워드, 정규화한 이름 → 키워드 조회
+    - 같은 ID 가 두 번 있으면 ValueError
+    - 모델이 반환한 키워드를 목록의 키워드로 맞추고 목록에 없는 키워드는 제외
+    """
+
+    def __init__(self, keywords: Iterable[Keyword], match_cutoff: float = 0.8):
+        self.keywords: List[Keyword] = list(keywords)
+        self.match_cutoff = match_cutoff
+        self.by_id: Dict[int, Keyword] = {}
+        self.by_name: Dict[str, Keyword] = {}
+        for keyword in self.keywords:
+            if keyword.id in self.by_id:
+                raise ValueError("키워드 목록에 중복된 ID가 있습니다.")
+            self.by_id[keyword.id] = keyword
+            self.by_name.setdefault(normalize_keyword_name(keyword.name), keyword)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def match(self, keyword: dict) -> Optional[Keyword]:
+        """
+        모델이 반환한 키워드({"id", "name"})에 해당하는 목록의 키워드
+        - ID 와 이름이 모두 맞거나 ID 만 맞으면 ID 로, ID 가 없거나 틀리면 이름으로 찾음
+        - 이름은 정규화 후 일치 → 유사도(match_cutoff 이상) 순으로 비교
+        """
+        if not isinstance(keyword, dict):
+            return None
+        keyword_id = keyword.get('id')
+        try:
+            keyword_id = int(keyword_id)
+        except (TypeError, ValueError):
+            keyword_id = None
+        name = normalize_keyword_name(keyword.get('name', ""))
+
+        found = self.by_id.get(keyword_id)
+        if found is not None and (not name or normalize_keyword_name(found.name) == name):
+            return found
+        if name:
+            by_name = self.by_name.get(name)
+            if by_name is not None:
+                return by_name
+            close = difflib.get_close_matches(name, list(self.by_name), n=1, cutoff=self.match_cutoff)
+            if close:
+                return self.by_name[close[0]]
+        # 이름이 전혀 다르면 ID 만 맞는 경우라도 사용 (이름을 바꿔 쓴 경우)
+        return found
+
+    def reconcile(self, keywords: Iterable[dict]) -> List[Keyword]:
+        """모델이 반환한 키워드 목록을 목록의 키워드로 바꿈 (없는 키워드 제외, 중복 제거)"""
+        result: List[Keyword] = []
+        seen = set()
+        for keyword in keywords or []:
+            matched = self.match(keyword)
+            if matched is not None and matched.id not in seen:
+                seen.add(matched.id)
+                result.append(matched)
+        return result
+
+
+def rank_keywords(content: str, keywords: List[Keyword], top_k: int) -> List[Keyword]:
+    """
+    회고 내용과 관련 높은 키워드 top_k 개 선택 (BM25)
+    - 회고 내용을 문장 단위 문서로 나누고 키워드 이름을 검색어로 점수 계산
+    - 키워드 수가 top_k 이하이거나 top_k 가 0 이면 그대로 반환
+    - 점수가 같으면 원래 순서 유지, 반환 순서도 원래 목록 순서
+    """
+    if top_k <= 0 or len(keywords) <= top_k:
+        return list(keywords)
+
+    documents = [Counter(terms(sentence)) for sentence in _SENTENCE_SPLIT.split(content) if sentence.strip()]
+    if not documents:
+        return list(keywords[:top_k])
+    lengths = [sum(document.values()) for document in documents]
+    average_length = sum(lengths) / len(documents) or 1.0
+    document_frequency: Counter = Counter()
+    for document in documents:
+        document_frequency.update(document.keys())
+
+    def score(keyword: Keyword) -> float:
+        total = 0.0
+        for term in set(terms(keyword.name)):
+            frequency = document_frequency.get(term)
+            if not frequency:
+                continue
+            idf = math.log(1 + (len(documents) - frequency + 0.5) / (frequency + 0.5))
+            for document, length in zip(documents, lengths):
+                count = document.get(term)
+                if count:
+                    norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * length / average_length)
+                    total += idf * count * (_BM25_K1 + 1) / (count + norm)
+        return total
+
+    scores = [score(keyword) for keyword in keywords]
+    ranked = sorted(range(len(keywords)), key=lambda index: (-scores[index], index))[:top_k]
+    return [keywords[index] for index in sorted(ranked)]
+
+
+def best_keyword(text: str, keywords: List[Keyword]) -> Optional[Keyword]:
+    """text 와 가장 관련 높은 키워드 하나 (관련 키워드가 없으면 None)"""
+    ranked = rank_keywords(text, keywords, 1)
+    if not ranked or not set(terms(ranked[0].name)) & set(terms(text)):
+        return None
+    return ranked[0]
@@ -0,0 +1,64 @@
+# app/utils/micro_batcher.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    짧은 시간 창(window) 동안 들어온 요청을 모아 한 번에 처리
+    - 첫 요청 후 window 초가 지나거나 max_size 개가 모이면 batch_func 호출
+    - batch_func 는 입력 리스트와 같은 순서의 결과 리스트를 반환해야 함
+    - batch_func 가 실패하면 묶음에 포함된 모든 요청에 같은 예외 전달
+    """
+
+    def __init__(self, batch_func: Callable[[List[Any]], Awaitable[List[Any]]], window_seconds: float, max_size: int):
+        self.batch_func = batch_func
+        self.window_seconds = window_seconds
+        self.max_size = max(1, max_size)
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 실행 중인 묶음 처리 태스크 (참조를 유지해 완료 전에 회수되지 않도록 함)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"묶음 처리 태스크 오류: {task.exception()!r}")
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        logger.info(f"묶음 처리 시작 - {len(batch)}건")
+        try:
+            results = list(await self.batch_func([item for item, _ in batch]))
+            if len(results) != len(batch):
+                raise ValueError(f"묶음 처리 결과 수가 요청 수와 다릅니다. ({len(results)}/{len(batch)})")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
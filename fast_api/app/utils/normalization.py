@@ -0,0 +1,134 @@
+# app/utils/normalization.py
+import re
+import string
+from typing import Dict, Iterable, List, Optional
+
+# 모델 응답 정제용 문자 변환 테이블 (모듈 로드 시 한 번만 생성)
+# - 정규식을 여러 번 적용하는 대신 str.translate 한 번으로 삭제 / 치환 처리
+
+# 제목에서 제거할 특수문자 (쉼표와 공백은 허용)
+_TITLE_SPECIAL_CHARS = "-=+#/?:^$.@*\"※~&%ㆍ!』|()[]<>`'…》"
+# 제목: 영문자와 특수문자 삭제 (한글, 숫자, 쉼표, 공백만 유지)
+_TITLE_TABLE = str.maketrans("", "", string.ascii_letters + _TITLE_SPECIAL_CHARS)
+
+# 제목 앞의 번호 ("1. ", "2 ")와 연속 공백 (모듈 로드 시 한 번만 컴파일)
+_TITLE_NUMBER = re.compile(r'^\d+\.?\s*')
+_SPACES = re.compile(r'\s+')
+
+# 제어 문자 (탭 / 줄바꿈 제외) 삭제, 특수 공백은 일반 공백으로 치환
+_CONTROL_CHARS = "".join(chr(code) for code in range(32) if chr(code) not in "\t\n")
+_SPECIAL_SPACES = "\u00a0\u2002\u2003\u2009\u202f\u3000"
+_TEXT_TABLE = str.maketrans(
+    {**{char: None for char in _CONTROL_CHARS + "\u200b\ufeff"}, **{char: " " for char in _SPECIAL_SPACES}}
+)
+
+# 경험 제목 / 내용 앞뒤에서 제거할 문자 (따옴표, 목록 기호)
+_EXPERIENCE_STRIP_CHARS = " \t\n\"'`*-•#"
+
+# 문장 끝으로 볼 문자
+_SENTENCE_ENDS = ".!?。"
+
+TITLE_MAX_LENGTH = 35
+EXPERIENCE_TITLE_MAX_LENGTH = 20
+EXPERIENCE_CONTENT_MAX_LENGTH = 700
+
+
+def collapse_spaces(text: str) -> str:
+    """앞뒤 공백 제거 및 연속 공백/줄바꿈을 하나의 공백으로 정리 (캐시 키 / 프롬프트 입력 정규화에도 사용)"""
+    return " ".join(str(text).split())
+
+
+def truncate(text: str, max_length: int, min_ratio: float = 0.5, sentence: bool = False) -> str:
+    """
+    길이 제한 적용 시 자연스러운 끝부분(한국어 어절 경계)에서 자름
+    - sentence=True 이면 문장 끝(마침표 등)을 먼저 찾음
+    - 쉼표, 공백 순으로 경계를 찾되 max_length * min_ratio 보다 앞이면 그냥 자름
+    """
+    if len(text) <= max_length:
+        return text
+    truncated = text[:max_length]
+    minimum = max_length * min_ratio
+
+    if sentence:
+        # 마침표 바로 뒤가 잘린 위치이거나 공백인 경우만 문장 끝으로 인정
+        end = max(truncated.rfind(mark) for mark in _SENTENCE_ENDS)
+        if end > minimum and (end + 1 == len(truncated) or truncated[end + 1].isspace()):
+            return truncated[:end + 1].strip()
+
+    last_comma = truncated.rfind(',')
+    if last_comma != -1 and last_comma > minimum:
+        return truncated[:last_comma].strip()
+
+    last_space = truncated.rfind(' ')
+    if last_space != -1 and last_space > minimum:
+        return truncated[:last_space].strip()
+    return truncated.strip()
+
+
+def normalize_title(text: str, max_length: int = TITLE_MAX_LENGTH) -> str:
+    """
+    개발일지 제목 정제
+    - 첫 줄만 사용하고 앞의 번호("1. ")를 제거
+    - 영문자 / 특수문자 제거 (한글, 숫자, 쉼표, 공백만 유지)
+    - 연속 공백을 하나로 줄이고 어절 경계에서 max_length 자 이내로 자름
+    - 결과는 기존 DevLogSummaryService.clean_response 의 정규식 처리와 동일
+      (자르지 않은 경우 앞뒤 공백 한 칸은 그대로 유지)
+    """
+    first_line = text.strip().split('\n', 1)[0]
+    text = _TITLE_NUMBER.sub('', first_line, count=1).translate(_TITLE_TABLE)
+    return truncate(_SPACES.sub(' ', text), max_length)
+
+
+def normalize_titles(texts: Iterable[str], max_length: int = TITLE_MAX_LENGTH) -> List[str]:
+    return [normalize_title(text, max_length) for text in texts]
+
+
+def normalize_body(text: str) -> str:
+    """
+    긴 본문 정제 (회고록 / 경험 내용)
+    - 제어 문자(\r 포함) 제거, 특수 공백 치환, 줄 끝 공백 제거
+    - 빈 줄은 최대 한 줄까지만 유지
+    """
+    lines = [line.rstrip() for line in text.translate(_TEXT_TABLE).split('\n')]
+    result: List[str] = []
+    for line in lines:
+        if not line and (not result or not result[-1]):
+            continue
+        result.append(line)
+    return "\n".join(result).strip()
+
+
+def normalize_retrospective(text: str, max_length: Optional[int] = None) -> str:
+    """회고록 정제 (max_length 가 있으면 문장 경계에서 자름)"""
+    text = normalize_body(text)
+    if max_length is not None:
+        text = truncate(text, max_length, sentence=True)
+    return text
+
+
+def normalize_retrospectives(texts: Iterable[str], max_length: Optional[int] = None) -> List[str]:
+    return [normalize_retrospective(text, max_length) for text in texts]
+
+
+def normalize_experience(experience: Dict, title_max_length: int = EXPERIENCE_TITLE_MAX_LENGTH,
+                         content_max_length: int = EXPERIENCE_CONTENT_MAX_LENGTH) -> Dict:
+    """
+    경험 항목 정제 (title / content 외의 키는 그대로 유지)
+    - 제목: 한 줄로 정리하고 따옴표 / 목록 기호 제거 후 어절 경계에서 자름
+    - 내용: 본문 정제 후 문장 경계에서 자름
+    """
+    normalized = dict(experience)
+    title = experience.get('title')
+    if isinstance(title, str):
+        title = collapse_spaces(title.translate(_TEXT_TABLE)).strip(_EXPERIENCE_STRIP_CHARS)
+        normalized['title'] = truncate(title, title_max_length)
+    content = experience.get('content')
+    if isinstance(content, str):
+        content = normalize_body(content).strip(_EXPERIENCE_STRIP_CHARS)
+        normalized['content'] = truncate(content, content_max_length, sentence=True)
+    return normalized
+
+
+def normalize_experiences(experiences: Iterable[Dict], title_max_length: int = EXPERIENCE_TITLE_MAX_LENGTH,
+                          content_max_length: int = EXPERIENCE_CONTENT_MAX_LENGTH) -> List[Dict]:
+    return [normalize_experience(exp, title_max_length, content_max_length) for exp in experiences]
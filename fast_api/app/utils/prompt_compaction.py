@@ -0,0 +1,110 @@
+# app/utils/prompt_compaction.py
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List
+
+from .normalization import collapse_spaces
+
+_HANGUL = re.compile(r'[가-힣]')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 근사치 (비교용)
+    - 한글 음절은 음절당 약 1토큰, 그 외 문자는 약 4자당 1토큰으로 계산
+    """
+    hangul = len(_HANGUL.findall(text))
+    return hangul + math.ceil((len(text) - hangul) / 4)
+
+
+@dataclass
+class CompactionStats:
+    original_chars: int
+    compact_chars: int
+    original_tokens: int
+    compact_tokens: int
+
+    @property
+    def saved_ratio(self) -> float:
+        if self.original_tokens == 0:
+            return 0.0
+        return 1 - self.compact_tokens / self.original_tokens
+
+    def __str__(self) -> str:
+        return (
+            f"{self.original_chars}자 → {self.compact_chars}자, "
+            f"토큰 약 {self.original_tokens} → {self.compact_tokens} ({self.saved_ratio:.0%} 절감)"
+        )
+
+
+def measure_savings(original: str, compact: str) -> CompactionStats:
+    return CompactionStats(
+        original_chars=len(original),
+        compact_chars=len(compact),
+        original_tokens=estimate_tokens(original),
+        compact_tokens=estimate_tokens(compact),
+    )
+
+
+def find_common_questions(dev_logs, min_share: float = 0.5) -> List[str]:
+    """
+    여러 날에 반복되는 템플릿 질문 목록 (처음 등장한 순서)
+    - 2일 이상, 전체 일수의 min_share 이상에서 답변이 있는 질문
+    """
+    if len(dev_logs) < 2:
+        return []
+
+    counts: Counter = Counter()
+    order: Dict[str, int] = {}
+    for log in dev_logs:
+        for question in {collapse_spaces(qa.question) for qa in log.daily_log if collapse_spaces(qa.answer)}:
+            counts[question] += 1
+        for qa in log.daily_log:
+            order.setdefault(collapse_spaces(qa.question), len(order))
+
+    threshold = max(2, math.ceil(len(dev_logs) * min_share))
+    common = [question for question, count in counts.items() if count >= threshold]
+    return sorted(common, key=lambda question: order[question])
+
+
+def compact_daily_logs(dev_logs, min_share: float = 0.5) -> str:
+    """
+    일별 개발일지를 압축된 형식으로 변환
+    - 반복되는 질문은 머리말에 한 번만 번호와 함께 적고, 일자별로는 번호와 답변만 기록
+    - 답변이 비어 있는 질문은 생략
+    """
+    common = find_common_questions(dev_logs, min_share)
+    numbers = {question: index for index, question in enumerate(common, start=1)}
+
+    lines: List[str] = []
+    if common:
+        lines.append("[공통 질문]")
+        lines.extend(f"Q{numbers[question]}. {question}" for question in common)
+        lines.append("(각 일자의 Q번호 뒤에 해당 질문의 답변을 기록, 답변이 없는 질문은 생략)")
+
+    for log in dev_logs:
+        lines.append("")
+        lines.append(f"날짜: {log.date} | 제목: {collapse_spaces(log.summary)}")
+        for qa in log.daily_log:
+            answer = collapse_spaces(qa.answer)
+            if not answer:
+                continue
+            question = collapse_spaces(qa.question)
+            if question in numbers:
+                lines.append(f"Q{numbers[question]}: {answer}")
+            else:
+                lines.append(f"{question}: {answer}")
+
+    return "\n".join(lines)
+
+
+def compact_qna(qna_list: list) -> str:
+    """질문-답변 리스트를 '질문: 답변' 한 줄 형식으로 변환 (답변이 빈 항목은 생략)"""
+    lines = []
+    for item in qna_list:
+        answer = collapse_spaces(item.get('answer', ""))
+        if answer:
+            lines.append(f"- {collapse_spaces(item.get('question', ''))}: {answer}")
+    return "\n".join(lines)
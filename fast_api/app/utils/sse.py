@@ -0,0 +1,21 @@
+# app/utils/sse.py
+import json
+from typing import Optional
+
+
+def format_sse(data: dict, event: Optional[str] = None) -> str:
+    """
+    Server-Sent Events 형식의 메시지 문자열 생성
+    - data 는 한 줄짜리 JSON 으로 직렬화
+    """
+    message = f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event:
+        message = f"event: {event}\n" + message
+    return message
+
+
+# 프록시(nginx 등)가 스트림을 버퍼링하지 않도록 하는 응답 헤더
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
@@ -0,0 +1,133 @@
+# app/utils/tracing.py
+import json
+import logging
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..metrics import STAGE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# 요청 처리 단계 이름
+DECODE = "decode"
+VALIDATE = "validate"
+PROMPT_BUILD = "prompt_build"
+RATE_LIMIT_WAIT = "rate_limit_wait"
+MODEL_CALL = "model_call"
+RESPONSE_PARSE = "response_parse"
+POST_PROCESS = "post_process"
+PUBLISH = "publish"
+
+# 페이로드 로깅 설정 (configure_payload_logging 으로 변경)
+_payload_sample_rate = 0.0
+_payload_max_chars = 500
+
+
+class Trace:
+    """하나의 요청(메시지 / HTTP 요청)에 대한 단계별 소요 시간 기록"""
+
+    def __init__(self, name: str, trace_id: str, detail: str = ""):
+        self.name = name
+        self.trace_id = trace_id
+        self.detail = detail
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+
+    def add(self, stage: str, seconds: float):
+        self.spans.append((stage, seconds))
+        STAGE_LATENCY.labels(self.name, stage).observe(seconds)
+
+    def summary(self) -> str:
+        # 같은 단계가 여러 번 실행된 경우(map-reduce 등) 합산
+        totals: Dict[str, float] = {}
+        for stage, seconds in self.spans:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        stages = " ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in totals.items())
+        total = (time.perf_counter() - self.started) * 1000
+        name = f"{self.name} {self.detail}" if self.detail else self.name
+        return f"[trace] {name} {self.trace_id} 총 {total:.1f}ms | {stages}"
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+@contextmanager
+def start_trace(name: str, trace_id: Optional[str] = None, detail: str = "") -> Iterator[Trace]:
+    """
+    요청 단위 trace 시작 (correlation_id 를 trace_id 로 사용)
+    - 같은 컨텍스트에서 실행되는 span 은 모두 이 trace 에 기록됨
+    - 종료 시 단계별 소요 시간을 한 줄로 기록
+    - name 은 메트릭 라벨로도 사용되므로 경로 등 가변 값은 detail 에 전달
+    """
+    trace = Trace(name, trace_id or new_trace_id(), detail)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        # 기록된 단계가 없는 요청(/healthz, /metrics 등)은 DEBUG 로만 기록
+        logger.log(logging.INFO if trace.spans else logging.DEBUG, trace.summary())
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """현재 trace 에 단계 소요 시간 기록 (trace 가 없으면 아무것도 하지 않음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(stage, time.perf_counter() - start_time)
+
+
+def add_span(stage: str, seconds: float):
+    """직접 측정한 단계 소요 시간을 현재 trace 에 기록"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+def configure_payload_logging(settings):
+    global _payload_sample_rate, _payload_max_chars
+    _payload_sample_rate = settings.PAYLOAD_LOG_SAMPLE_RATE
+    _payload_max_chars = settings.PAYLOAD_LOG_MAX_CHARS
+
+
+def log_payload(log: logging.Logger, label: str, payload: Any, level: int = logging.INFO):
+    """
+    메시지 / 응답 / 프롬프트 본문 로깅
+    - PAYLOAD_LOG_SAMPLE_RATE 비율로만 기록하고 PAYLOAD_LOG_MAX_CHARS 자로 자름
+    - 샘플링되지 않으면 직렬화하지 않음 (긴 한글 본문의 포맷 비용 절감)
+    """
+    if not log.isEnabledFor(level) or random.random() >= _payload_sample_rate:
+        return
+    if isinstance(payload, str):
+        text = payload
+    else:
+        try:
+            text = json.dumps(payload, ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            text = str(payload)
+    if len(text) > _payload_max_chars:
+        text = f"{text[:_payload_max_chars]}... (총 {len(text)}자)"
+    trace_id = current_trace_id()
+    if trace_id:
+        log.log(level, "%s [%s]: %s", label, trace_id, text)
+    else:
+        log.log(level, "%s: %s", label, text)
@@ -0,0 +1,159 @@
+# benchmarks/fake_bedrock.py
+"""
+벤치마크용 로컬 bedrock-runtime 대체 서버
+- InvokeModel(POST /model/{modelId}/invoke) 만 지원 (스트리밍 API 는 지원하지 않음)
+- 응답 지연 분포(로그 정규 분포), 스로틀링 비율, 응답 크기를 설정 가능
+- 프롬프트 내용으로 제목 / 제목 일괄 / 경험 / 회고록 요청을 구분해 각 서비스가 파싱 가능한 응답을 반환
+
+단독 실행:
+    python -m benchmarks.fake_bedrock --port 8787 --latency-ms 800 --throttle-rate 0.05
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_KEYWORD_ID = re.compile(r'([^,\s()]+)\(id:(\d+)\)')
+_BATCH_ITEM = re.compile(r'\[개발일지 \d+\]')
+_FILLER = "사이드바 상태관리 수정과 공통 컴포넌트 구현을 진행하며 렌더링 성능을 개선했습니다. "
+
+
+@dataclass
+class FakeBedrockConfig:
+    latency_ms: float = 800.0      # 응답 지연 중앙값
+    latency_sigma: float = 0.4     # 로그 정규 분포 표준편차 (0 이면 고정 지연)
+    throttle_rate: float = 0.0     # ThrottlingException 으로 응답할 비율
+    response_chars: int = 1500     # 회고록 / 경험 내용 길이 (글자 수)
+
+
+def _filler(length: int) -> str:
+    repeat = math.ceil(length / len(_FILLER))
+    return (_FILLER * repeat)[:length]
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 2)
+
+
+class FakeBedrockHandler(BaseHTTPRequestHandler):
+    config = FakeBedrockConfig()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # 요청마다 출력하지 않음
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if not self.path.endswith("/invoke"):
+            self._send(404, {"message": "스트리밍 API 는 지원하지 않습니다."})
+            return
+
+        config = self.config
+        if config.latency_ms > 0:
+            delay = config.latency_ms / 1000
+            if config.latency_sigma > 0:
+                delay *= random.lognormvariate(0, config.latency_sigma)
+            time.sleep(delay)
+
+        if random.random() < config.throttle_rate:
+            self._send(429, {"message": "Too many requests, please wait before trying again."},
+                       error_type="ThrottlingException")
+            return
+
+        prompt = "".join(
+            message["content"] if isinstance(message["content"], str)
+            else "".join(part.get("text", "") for part in message["content"])
+            for message in body.get("messages", [])
+        )
+        text = self._generate(prompt)
+        self._send(200, {
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": _estimate_tokens(prompt), "output_tokens": _estimate_tokens(text)},
+        })
+
+    def _generate(self, prompt: str) -> str:
+        size = self.config.response_chars
+        if "[사용 가능한 키워드 목록]" in prompt:
+            keywords = [{"id": int(kid), "name": name} for name, kid in _KEYWORD_ID.findall(prompt)]
+            experiences = [
+                {
+                    "title": f"경험 {index + 1} 요약 제목",
+                    "content": _filler(min(size, 700)),
+                    "keywords": [keyword],
+                }
+                for index, keyword in enumerate(keywords[:4])
+            ]
+            return json.dumps({"experiences": experiences}, ensure_ascii=False)
+        batch_size = len(_BATCH_ITEM.findall(prompt))
+        if batch_size:
+            return json.dumps([f"상태관리 및 컴포넌트 구현 {i + 1}" for i in range(batch_size)], ensure_ascii=False)
+        if "회고록" in prompt:
+            return _filler(size)
+        return "사이드바 상태관리 및 모달 컴포넌트 구현"
+
+    def _send(self, status: int, payload: dict, error_type: str = None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if error_type:
+            self.send_header("x-amzn-ErrorType", f"{error_type}:http://internal.amazon.com/coral/")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeBedrockServer:
+    """백그라운드 스레드에서 실행되는 가짜 bedrock-runtime 서버"""
+
+    def __init__(self, config: FakeBedrockConfig, host: str = "127.0.0.1", port: int = 0):
+        handler = type("ConfiguredHandler", (FakeBedrockHandler,), {"config": config})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBedrockServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 bedrock-runtime 서버")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.4)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--response-chars", type=int, default=1500)
+    args = parser.parse_args()
+
+    config = FakeBedrockConfig(args.latency_ms, args.latency_sigma, args.throttle_rate, args.response_chars)
+    server = FakeBedrockServer(config, port=args.port).start()
+    print(f"가짜 bedrock-runtime 서버 실행 중: {server.endpoint_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/normalization_bench.py
+"""
+응답 정제(app/utils/normalization.py) 마이크로 벤치마크
+- 항목당 처리 시간(µs)을 출력하고, 제목 정제는 기존 정규식 방식과 비교
+
+실행 (fast_api 디렉터리에서):
+    python -m benchmarks.normalization_bench --number 20000
+"""
+import argparse
+import re
+import timeit
+
+from app.utils.normalization import (
+    normalize_experience,
+    normalize_experiences,
+    normalize_retrospective,
+    normalize_title,
+    normalize_titles,
+)
+
+TITLE = "1. Title: 사이드바 상태관리 수정과 공통 컴포넌트 구현, 모달 컴포넌트 설계 (React/TypeScript)\n설명: ..."
+EXPERIENCE = {
+    "title": "\"OAuth2 기반 소셜 로그인 구현과 보안 강화\"",
+    "content": "소셜로그인 기능 개발을 통해 사용자의 편의성과 보안성을 동시에 강화하는 경험을 했습니다.  " * 12,
+    "keywords": [{"id": 1, "name": "API"}],
+}
+RETROSPECTIVE = ("이번 프로젝트는 NLP 모델 개선과 한국어 모델 탐색을 중심으로 진행되었습니다.   \r\n\r\n\r\n" * 30)
+
+
+def legacy_clean_response(text: str, max_length: int = 30) -> str:
+    """기존 DevLogSummaryService.clean_response (비교용)"""
+    first_line = text.strip().split('\n')[0]
+    text = re.sub(r'^\d+\.?\s*', '', first_line)
+    text = re.sub('[a-zA-Z]', '', text)
+    text = re.sub(r'[-=+#/\?:^$.@*\"※~&%ㆍ!』\|\(\)\[\]\<\>`\'…》]', '', text)
+    text = text.replace('.', '')
+    text = re.sub(r'\s+', ' ', text)
+    if len(text) > max_length:
+        truncated = text[:max_length]
+        last_comma = truncated.rfind(',')
+        if last_comma != -1 and last_comma > max_length * 0.5:
+            text = text[:last_comma].strip()
+        else:
+            last_space = truncated.rfind(' ')
+            if last_space != -1 and last_space > max_length * 0.5:
+                text = text[:last_space].strip()
+            else:
+                text = truncated.strip()
+    return text
+
+
+def measure(label: str, func, number: int, items: int = 1):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    per_item = seconds / (number * items) * 1_000_000
+    print(f"{label:<36} {per_item:>8.2f} µs/건")
+    return per_item
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 정제 마이크로 벤치마크")
+    parser.add_argument("--number", type=int, default=20000, help="측정 반복 횟수")
+    parser.add_argument("--batch", type=int, default=50, help="일괄 API 의 묶음 크기")
+    args = parser.parse_args()
+
+    titles = [TITLE] * args.batch
+    experiences = [EXPERIENCE] * args.batch
+    batch_number = max(1, args.number // args.batch)
+
+    legacy = measure("제목 - 기존 정규식", lambda: legacy_clean_response(TITLE, 35), args.number)
+    current = measure("제목 - normalize_title", lambda: normalize_title(TITLE), args.number)
+    measure("제목 - normalize_titles (일괄)", lambda: normalize_titles(titles), batch_number, args.batch)
+    measure("경험 - normalize_experience", lambda: normalize_experience(EXPERIENCE), args.number)
+    measure("경험 - normalize_experiences (일괄)", lambda: normalize_experiences(experiences), batch_number, args.batch)
+    measure("회고록 - normalize_retrospective", lambda: normalize_retrospective(RETROSPECTIVE), max(1, args.number // 10))
+    print(f"\n제목 정제: 기존 대비 {legacy / current:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# benchmarks/run.py
+"""
+오프라인 부하 / 처리량 벤치마크
+- 가짜 bedrock-runtime 서버(fake_bedrock.py)를 띄우고 애플리케이션이 그 서버를 호출하도록 설정
+- HTTP 엔드포인트(/generate/title, /generate/summary, /generate/experience)와
+  큐 메시지 핸들러(titleQueue, retrospectiveQueue, experienceQueue)를 동시성을 높여가며 호출
+- 대상 / 동시성별 처리량(건/초)과 p50 / p95 / p99 지연 시간을 출력하고
+  결과를 benchmarks/results/ 에 JSON 으로 저장해 직전 결과와 비교
+
+실행 (fast_api 디렉터리에서):
+    python -m benchmarks.run --levels 1,8,32 --requests 64 --latency-ms 300 --throttle-rate 0.02
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .fake_bedrock import FakeBedrockConfig, FakeBedrockServer
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+TARGETS = [
+    "http_title", "http_summary", "http_experience",
+    "queue_title", "queue_retrospective", "queue_experience",
+]
+
+
+def title_input(index: int) -> list:
+    return [
+        {"question": "오늘 수행한 작업은 무엇인가요?", "answer": f"사이드바 상태관리 수정과 공통 컴포넌트 구현 #{index}"},
+        {"question": "어려웠던 점은 무엇인가요?", "answer": "모달 컴포넌트 설계 시 고려사항이 많았음"},
+    ]
+
+
+def retrospective_input(index: int, days: int = 10) -> list:
+    return [
+        {
+            "date": f"2024-10-{day + 1:02d}",
+            "summary": f"상태관리 및 컴포넌트 구현 {day + 1}일차",
+            "daily_log": [
+                {"question": "오늘 수행한 작업은 무엇인가요?", "answer": f"요청 {index} - 로그인 API 연동과 토큰 갱신 처리 ({day + 1}일차)"},
+                {"question": "어려웠던 점은 무엇인가요?", "answer": "토큰 만료 시점의 동시 요청 처리"},
+                {"question": "내일 할 일은 무엇인가요?", "answer": ""},
+            ],
+        }
+        for day in range(days)
+    ]
+
+
+def experience_input(index: int) -> dict:
+    return {
+        "retrospective_content": f"요청 {index} - 소셜로그인 기능 개발을 통해 사용자의 편의성과 보안성을 동시에 강화하는 경험을 했습니다. " * 5,
+        "keywords": [
+            {"id": 1, "name": "API"},
+            {"id": 2, "name": "보안"},
+            {"id": 3, "name": "성능"},
+            {"id": 4, "name": "협업"},
+        ],
+    }
+
+
+async def asgi_post(app, path: str, payload) -> Tuple[int, bytes]:
+    """HTTP 서버 없이 ASGI 애플리케이션을 직접 호출 (네트워크 비용 제외)"""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 0), "server": ("benchmark", 80),
+    }
+    received = False
+    status = 500
+    chunks: List[bytes] = []
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+def build_targets(main) -> Dict[str, Callable[[int], Awaitable[bool]]]:
+    """대상별 요청 함수 (성공 여부 반환, 실패는 False 또는 예외)"""
+
+    async def http(path: str, payload) -> bool:
+        status, _ = await asgi_post(main.app, path, payload)
+        return status == 200
+
+    async def queue(handler, payload) -> bool:
+        body = json.dumps({"data": payload}, ensure_ascii=False).encode("utf-8")
+        return await handler(body) is not None
+
+    return {
+        "http_title": lambda i: http("/generate/title", title_input(i)),
+        "http_summary": lambda i: http("/generate/summary", retrospective_input(i)),
+        "http_experience": lambda i: http("/generate/experience", experience_input(i)),
+        "queue_title": lambda i: queue(main.on_title_queue_message, title_input(i)),
+        "queue_retrospective": lambda i: queue(main.on_retrospective_queue_message, retrospective_input(i)),
+        "queue_experience": lambda i: queue(main.on_experience_queue_message, experience_input(i)),
+    }
+
+
+def percentile(values: List[float], ratio: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(ratio * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+async def run_level(func: Callable[[int], Awaitable[bool]], concurrency: int, total: int, offset: int) -> dict:
+    """동시성 concurrency 로 total 건을 처리하고 통계 반환"""
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < total:
+            index = offset + next_index
+            next_index += 1
+            start_time = time.perf_counter()
+            try:
+                ok = await func(index)
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start_time)
+            else:
+                errors += 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def load_previous(current: Path) -> Optional[dict]:
+    files = sorted(path for path in RESULTS_DIR.glob("*.json") if path != current)
+    if not files:
+        return None
+    return json.loads(files[-1].read_text(encoding="utf-8"))
+
+
+def compare(previous: dict, results: List[dict]):
+    """직전 결과 대비 처리량 / p95 변화율 출력"""
+    before = {(r["target"], r["concurrency"]): r for r in previous["results"]}
+    print(f"\n직전 결과와 비교 ({previous['meta']['commit']}, {previous['meta']['timestamp']})")
+    for result in results:
+        old = before.get((result["target"], result["concurrency"]))
+        if old is None or not old["throughput_rps"] or not old["p95_ms"] or not result["p95_ms"]:
+            continue
+        throughput = result["throughput_rps"] / old["throughput_rps"] - 1
+        p95 = result["p95_ms"] / old["p95_ms"] - 1
+        print(f"  {result['target']:<20} c={result['concurrency']:<4} 처리량 {throughput:+.0%}  p95 {p95:+.0%}")
+
+
+def configure_environment(endpoint_url: str, rate_limit: bool):
+    """
+    애플리케이션 import 전에 환경 변수 설정 (캐시는 끄고 가짜 서버를 호출)
+    - 유사 입력 인덱스 / 회고록 구간 요약 저장도 끄고, 로컬 파일 경로는 임시 디렉터리로 지정 (개발 환경의 .cache 를 건드리지 않음)
+    """
+    scratch = tempfile.mkdtemp(prefix="bbogle-benchmark-")
+    os.environ["BEDROCK_ENDPOINT_URL"] = endpoint_url
+    os.environ["CACHE_ENABLED"] = "false"
+    os.environ["CACHE_DB_PATH"] = os.path.join(scratch, "generation_cache.db")
+    os.environ["NEAR_DUPLICATE_ENABLED"] = "false"
+    os.environ["NEAR_DUPLICATE_DB_PATH"] = os.path.join(scratch, "near_duplicate.db")
+    os.environ["RETROSPECTIVE_STATE_ENABLED"] = "false"
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch, 'bbogle_ai.db')}"
+    os.environ["BEDROCK_RATE_LIMIT_ENABLED"] = "true" if rate_limit else "false"
+    os.environ["PAYLOAD_LOG_SAMPLE_RATE"] = "0"
+    for key, value in {
+        "AWS_REGION": "us-east-1", "AWS_ACCESS_KEY_ID": "benchmark", "AWS_SECRET_ACCESS_KEY": "benchmark",
+        "RABBITMQ_USER": "guest", "RABBITMQ_PASS": "guest", "RABBITMQ_HOST": "localhost", "RABBITMQ_PORT": "5672",
+    }.items():
+        os.environ.setdefault(key, value)
+
+
+async def run(args) -> List[dict]:
+    import logging
+    from app import main
+
+    # 요청마다 남는 INFO 로그가 측정에 영향을 주지 않도록 경고 이상만 출력
+    logging.getLogger().setLevel(logging.WARNING)
+    targets = build_targets(main)
+    results = []
+    offset = 0
+    for target in args.targets:
+        for level in args.levels:
+            total = max(args.requests, level)
+            result = await run_level(targets[target], level, total, offset)
+            offset += total
+            result["target"] = target
+            results.append(result)
+            print(
+                f"{target:<20} c={level:<4} {result['throughput_rps']:>8.2f} 건/초  "
+                f"p50 {result['p50_ms']}ms  p95 {result['p95_ms']}ms  p99 {result['p99_ms']}ms  "
+                f"오류 {result['errors']}/{total}"
+            )
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 부하 / 처리량 벤치마크")
+    parser.add_argument("--levels", default="1,4,16,64", help="동시성 단계 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=64, help="단계별 요청 수 (동시성보다 작으면 동시성 값 사용)")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="대상 (쉼표 구분)")
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.4)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--response-chars", type=int, default=1500)
+    parser.add_argument("--rate-limit", action="store_true", help="Bedrock 속도 제한기 사용")
+    parser.add_argument("--label", default="", help="결과 파일에 남길 설명")
+    parser.add_argument("--no-save", action="store_true", help="결과를 저장하지 않음")
+    args = parser.parse_args(argv)
+    args.levels = [int(level) for level in args.levels.split(",")]
+    args.targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"알 수 없는 대상: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fake_config = FakeBedrockConfig(args.latency_ms, args.latency_sigma, args.throttle_rate, args.response_chars)
+    server = FakeBedrockServer(fake_config).start()
+    configure_environment(server.endpoint_url, args.rate_limit)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        server.stop()
+
+    if args.no_save:
+        return
+    meta = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "label": args.label,
+        "python": sys.version.split()[0],
+        "fake_bedrock": vars(fake_config),
+        "rate_limit": args.rate_limit,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    path = RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{meta['commit']}.json"
+    path.write_text(json.dumps({"meta": meta, "results": results}, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n결과 저장: {path}")
+
+    previous = load_previous(path)
+    if previous is not None:
+        compare(previous, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import os
+import tempfile
+
+# app.config 의 필수 설정 (테스트는 실제 AWS / RabbitMQ 에 연결하지 않음)
+# DATABASE_URL 은 개발 환경의 .cache 를 건드리지 않도록 임시 디렉터리로 지정
+for key, value in {
+    "AWS_REGION": "us-east-1", "AWS_ACCESS_KEY_ID": "test", "AWS_SECRET_ACCESS_KEY": "test",
+    "RABBITMQ_USER": "guest", "RABBITMQ_PASS": "guest", "RABBITMQ_HOST": "localhost", "RABBITMQ_PORT": "5672",
+    "DATABASE_URL": f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bbogle-test-'), 'bbogle_ai.db')}",
+}.items():
+    os.environ.setdefault(key, value)
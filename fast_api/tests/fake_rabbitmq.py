@@ -0,0 +1,104 @@
+"""브로커 없이 aio-pika 채널 / exchange / 연결 동작을 흉내 내는 테스트용 객체"""
+import asyncio
+from types import SimpleNamespace
+
+from aio_pika.exceptions import ChannelPreconditionFailed
+
+
+class FakeExchange:
+    def __init__(self, broker):
+        self.broker = broker
+
+    async def publish(self, message, routing_key):
+        await asyncio.sleep(0)
+        error = self.broker.publish_errors.pop(0) if self.broker.publish_errors else None
+        if error is not None:
+            # publisher confirm 으로 nack / 반환된 경우
+            raise error
+        self.broker.published.append((routing_key, message))
+
+
+class FakeQueue:
+    def __init__(self, name):
+        self.name = name
+        self.callback = None
+
+    async def consume(self, callback):
+        self.callback = callback
+        return f"ctag-{self.name}"
+
+    async def cancel(self, consumer_tag):
+        self.callback = None
+
+
+class FakeChannel:
+    def __init__(self, broker, publisher_confirms=False):
+        self.broker = broker
+        self.publisher_confirms = publisher_confirms
+        self.is_closed = False
+        self.prefetch_count = None
+        self.close_callbacks = set()
+        self.default_exchange = FakeExchange(broker)
+
+    async def set_qos(self, prefetch_count):
+        self.prefetch_count = prefetch_count
+
+    async def declare_queue(self, name, durable=False, arguments=None, passive=False):
+        existing = self.broker.queues.get(name)
+        if passive:
+            if existing is None:
+                raise RuntimeError(f"{name} 큐가 없습니다.")
+        elif existing is not None and arguments and existing["arguments"] != arguments:
+            # 브로커는 다른 인자로 다시 선언하면 채널을 닫음
+            self.is_closed = True
+            raise ChannelPreconditionFailed(f"inequivalent arg for queue '{name}'")
+        elif existing is None:
+            self.broker.queues[name] = {"durable": durable, "arguments": arguments or {}}
+        queue = FakeQueue(name)
+        self.broker.consumers[name] = queue
+        return queue
+
+    async def close(self):
+        self.is_closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.is_closed = False
+        self.channels = []
+        self.queues = {}
+        self.consumers = {}
+        self.published = []
+        self.publish_errors = []
+
+    async def channel(self, publisher_confirms=False):
+        channel = FakeChannel(self, publisher_confirms)
+        self.channels.append(channel)
+        return channel
+
+
+class FakeMessage:
+    def __init__(self, body=b"{}", headers=None, reply_to="amq.rabbitmq.reply-to", correlation_id="c-1"):
+        self.body = body
+        self.headers = headers
+        self.reply_to = reply_to
+        self.correlation_id = correlation_id
+        self.content_type = "application/json"
+        self.content_encoding = None
+        self.message_id = None
+        self.type = None
+        self.acked = asyncio.Event()
+
+    async def ack(self):
+        self.acked.set()
+
+
+def publisher_settings(channels=2, batch_size=10):
+    return SimpleNamespace(RESPONSE_PUBLISHER_CHANNELS=channels, RESPONSE_PUBLISH_BATCH_SIZE=batch_size)
+
+
+def retry_settings(max_attempts=3, backoff=2, max_backoff=10):
+    return SimpleNamespace(
+        QUEUE_RETRY_MAX_ATTEMPTS=max_attempts, QUEUE_RETRY_BACKOFF_SECONDS=backoff,
+        QUEUE_RETRY_MAX_BACKOFF_SECONDS=max_backoff,
+    )
@@ -0,0 +1,50 @@
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+
+from app.bedrock.errors import BedrockStreamError, is_throttling_error, is_transient_error
+
+
+def client_error(code, status):
+    return ClientError(
+        {"Error": {"Code": code, "Message": "x"}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        "InvokeModel",
+    )
+
+
+def test_client_error_codes():
+    assert is_throttling_error(client_error("ThrottlingException", 400))
+    assert is_transient_error(client_error("ServiceUnavailableException", 503))
+    assert not is_throttling_error(client_error("ValidationException", 400))
+    assert not is_transient_error(client_error("AccessDeniedException", 403))
+
+
+def test_status_code_without_known_code():
+    assert is_throttling_error(client_error("SomethingNew", 429))
+    assert is_transient_error(client_error("SomethingNew", 502))
+
+
+def test_stream_event_is_case_normalized():
+    error = BedrockStreamError({"throttlingException": {"message": "Too many requests"}})
+    assert error.code == "ThrottlingException"
+    assert is_throttling_error(error)
+
+
+def test_stream_error_uses_original_status():
+    error = BedrockStreamError({"modelStreamErrorException": {"originalStatusCode": 503}})
+    assert error.status_code == 503
+    assert is_transient_error(error)
+    assert not is_transient_error(BedrockStreamError({"validationException": {"message": "bad"}}))
+
+
+def test_message_digits_are_not_retried():
+    assert not is_transient_error(ValueError("입력 500자 초과, 429번 로그"))
+
+
+def test_wrapped_error_is_found_through_context():
+    try:
+        try:
+            raise client_error("ThrottlingException", 400)
+        except ClientError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException as wrapped:
+        assert is_throttling_error(wrapped)
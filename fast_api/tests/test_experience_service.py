@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.experience_schema import Keyword
+from app.services.experience_service import ExperienceService
+from app.utils.keywords import KeywordIndex
+
+
+class FakeInvoker:
+    def __init__(self, text):
+        self.text = text
+
+    async def invoke(self, model_id, payload, service=None):
+        return {"content": [{"type": "text", "text": self.text}]}
+
+
+def make_service(text):
+    service = ExperienceService.__new__(ExperienceService)
+    service.registry = SimpleNamespace(get_invoker=lambda: FakeInvoker(text))
+    service.model_id = "test-model"
+    service.keyword_top_k = 0
+    service.keyword_match_cutoff = 0.8
+    return service
+
+
+INDEX = KeywordIndex([Keyword(id=1, name="Redis")])
+
+
+def generate(text):
+    service = make_service(text)
+    return asyncio.run(service._generate_experience("Redis 캐시를 도입했다.", INDEX))
+
+
+def test_parsed_experiences():
+    result = generate('{"experiences": [{"title": "캐시", "content": "Redis 도입", "keywords": [{"id": 1, "name": "Redis"}]}]}')
+    assert [experience.title for experience in result.experiences] == ["캐시"]
+
+
+@pytest.mark.parametrize("text", ["응답할 수 없습니다.", '{"items": []}'])
+def test_unusable_model_output_is_a_server_error(text):
+    with pytest.raises(HTTPException) as info:
+        generate(text)
+    # 모델 응답 오류는 요청 오류(400)가 아니며 내부 내용을 노출하지 않음
+    assert info.value.status_code == 500
+    assert "experiences" not in info.value.detail
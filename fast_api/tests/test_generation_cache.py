@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.cache import generation_cache
+from app.cache.generation_cache import GenerationCache, make_cache_key
+
+
+def make_cache(tmp_path, **overrides):
+    values = dict(
+        CACHE_ENABLED=True, CACHE_TTL_SECONDS=60, CACHE_MEMORY_MAX_ENTRIES=2,
+        CACHE_DB_PATH=str(tmp_path / "cache" / "generation_cache.db"),
+        CACHE_TITLE_ENABLED=True, CACHE_RETROSPECTIVE_ENABLED=True, CACHE_EXPERIENCE_ENABLED=False,
+    )
+    values.update(overrides)
+    return GenerationCache(SimpleNamespace(**values))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_cache_key_depends_on_model_and_prompt_version():
+    key = make_cache_key("title", {"a": 1, "b": 2}, "model", "v1")
+    assert key.startswith("title:")
+    assert key == make_cache_key("title", {"b": 2, "a": 1}, "model", "v1")
+    assert key != make_cache_key("title", {"a": 1, "b": 2}, "model", "v2")
+    assert key != make_cache_key("title", {"a": 1, "b": 2}, "other", "v1")
+
+
+def test_memory_hit_and_sqlite_fallback(tmp_path):
+    cache = make_cache(tmp_path)
+
+    async def scenario():
+        assert await cache.get("title", "k") is None
+        await cache.set("title", "k", {"title": "제목"})
+        assert await cache.get("title", "k") == {"title": "제목"}
+        # 재시작한 프로세스는 메모리가 비어 있어 SQLite 에서 읽고 메모리에 다시 올림
+        restarted = make_cache(tmp_path)
+        assert await restarted.get("title", "k") == {"title": "제목"}
+        assert await restarted.get("title", "k") == {"title": "제목"}
+        return restarted
+
+    restarted = asyncio.run(scenario())
+    assert cache.stats["title"] == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+    assert restarted.stats["title"] == {"memory_hits": 1, "disk_hits": 1, "misses": 0}
+
+
+def test_lru_evicts_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path)
+    cache._memory_set("a", 1)
+    cache._memory_set("b", 2)
+    assert cache._memory_get("a") == 1
+    cache._memory_set("c", 3)
+    assert cache._memory_get("b") is None
+    assert (cache._memory_get("a"), cache._memory_get("c")) == (1, 3)
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(generation_cache.time, "time", clock.time)
+    cache = make_cache(tmp_path)
+
+    async def scenario():
+        await cache.set("title", "k", "제목")
+        clock.now += 30
+        assert await cache.get("title", "k") == "제목"
+        clock.now += 31
+        # 메모리와 SQLite 모두 만료
+        assert await cache.get("title", "k") is None
+        assert cache._disk_get("k") is None
+
+    asyncio.run(scenario())
+
+
+def test_disabled_namespace_and_disk_failure(tmp_path):
+    cache = make_cache(tmp_path)
+    blocked = tmp_path / "file"
+    blocked.write_text("")
+    # 디렉터리 대신 파일이 있어 SQLite 를 열 수 없어도 메모리 캐시로 동작
+    broken = make_cache(tmp_path, CACHE_DB_PATH=str(blocked / "generation_cache.db"))
+
+    async def scenario():
+        await cache.set("experience", "k", "경험")
+        assert await cache.get("experience", "k") is None
+        await broken.set("title", "k", "제목")
+        assert await broken.get("title", "k") == "제목"
+        assert await make_cache(tmp_path, CACHE_ENABLED=False).get("title", "k") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,69 @@
+from app.utils.json_repair import (
+    NOT_FOUND, PARSED, REPAIRED, SALVAGED, extract_json_block, repair_json, salvage_array_items,
+)
+
+ITEM_A = '{"title": "캐시 도입", "content": "응답 시간 단축"}'
+ITEM_B = '{"title": "로그인 개선", "content": "토큰 갱신"}'
+
+
+def test_plain_json_is_parsed():
+    items, status = salvage_array_items('{"experiences": [%s, %s]}' % (ITEM_A, ITEM_B), "experiences")
+    assert status == PARSED
+    assert [item["title"] for item in items] == ["캐시 도입", "로그인 개선"]
+
+
+def test_fenced_json_with_prose():
+    text = '다음은 결과입니다.\n```json\n{"experiences": [%s]}\n```\n도움이 되었길 바랍니다.' % ITEM_A
+    assert extract_json_block(text) == '{"experiences": [%s]}' % ITEM_A
+    items, status = salvage_array_items(text, "experiences")
+    assert status == PARSED
+    assert items[0]["content"] == "응답 시간 단축"
+
+
+def test_trailing_commas_are_repaired():
+    text = '{"experiences": [%s, %s,],}' % (ITEM_A, ITEM_B)
+    items, status = salvage_array_items(text, "experiences")
+    assert status == REPAIRED
+    assert len(items) == 2
+
+
+def test_smart_quotes_and_raw_newlines_are_repaired():
+    text = '{“experiences”: [{“title”: “캐시 도입”, "content": "첫 줄\n“인용” 포함"}]}'
+    items, status = salvage_array_items(text, "experiences")
+    assert status == REPAIRED
+    assert items == [{"title": "캐시 도입", "content": "첫 줄\n“인용” 포함"}]
+
+
+def test_truncated_output_keeps_completed_items():
+    text = '{"experiences": [%s, %s, {"title": "잘린 경' % (ITEM_A, ITEM_B)
+    items, status = salvage_array_items(text, "experiences")
+    assert status == SALVAGED
+    assert [item["title"] for item in items] == ["캐시 도입", "로그인 개선"]
+
+
+def test_truncated_before_any_item_is_empty_salvage():
+    items, status = salvage_array_items('{"experiences": [{"title": "잘', "experiences")
+    assert status == SALVAGED
+    assert items == []
+
+
+def test_no_json():
+    assert salvage_array_items("죄송합니다. 경험을 추출할 수 없습니다.", "experiences") == (None, NOT_FOUND)
+
+
+def test_empty_array():
+    assert salvage_array_items('{"experiences": []}', "experiences") == ([], PARSED)
+
+
+def test_missing_key_returns_none():
+    assert salvage_array_items('{"items": [1]}', "experiences") == (None, PARSED)
+
+
+def test_top_level_array():
+    items, status = salvage_array_items("[%s]" % ITEM_A, "experiences")
+    assert status == PARSED
+    assert len(items) == 1
+
+
+def test_repair_json_keeps_escapes_and_commas_inside_strings():
+    assert repair_json('{"a": "x,]", "b": "q\\"]",}') == '{"a": "x,]", "b": "q\\"]"}'
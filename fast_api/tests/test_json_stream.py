@@ -0,0 +1,63 @@
+import json
+import random
+
+from app.utils.json_repair import repair_json
+from app.utils.json_stream import JsonArrayItemParser
+
+ITEMS = [
+    {"title": "토큰 갱신", "content": "중괄호 { 와 ] 가 들어간 \"문자열\" \\ 처리", "keywords": [{"id": 1, "name": "JWT"}]},
+    {"title": "배치 작업", "content": "세션 정리", "keywords": []},
+    {"title": "캐시", "content": "응답 {시간} 30% 감소", "keywords": [{"id": 2, "name": "Redis"}]},
+]
+TEXT = "다음은 결과입니다.\n```json\n" + json.dumps(
+    {"meta": {"experiences": "아님"}, "experiences": ITEMS, "other": [{"x": 1}]}, ensure_ascii=False, indent=2
+) + "\n```\n설명 끝 {\"experiences\": [{\"title\": \"무시\"}]}"
+
+
+def feed_in_chunks(parser, text, sizes):
+    items = []
+    pos = 0
+    for size in sizes:
+        items.extend(parser.feed(text[pos:pos + size]))
+        pos += size
+    items.extend(parser.feed(text[pos:]))
+    return items
+
+
+def test_whole_text_yields_only_target_items():
+    parser = JsonArrayItemParser("experiences")
+    assert not parser.started
+    assert parser.feed(TEXT) == ITEMS
+    assert parser.started
+    assert parser.errors == 0
+
+
+def test_random_chunking_yields_same_items():
+    rng = random.Random(7)
+    for _ in range(300):
+        sizes = [rng.randint(1, 12) for _ in range(len(TEXT))]
+        assert feed_in_chunks(JsonArrayItemParser("experiences"), TEXT, sizes) == ITEMS
+
+
+def test_items_are_returned_as_soon_as_they_close():
+    parser = JsonArrayItemParser("experiences")
+    first = json.dumps(ITEMS[0], ensure_ascii=False)
+    assert parser.feed('{"experiences": [' + first[:-1]) == []
+    assert parser.feed(first[-1]) == [ITEMS[0]]
+
+
+def test_broken_item_is_skipped_or_repaired():
+    text = '{"experiences": [{"title": "a",}, {"title": b}, {"title": "c"}]}'
+    parser = JsonArrayItemParser("experiences")
+    assert parser.feed(text) == [{"title": "c"}]
+    assert parser.errors == 2
+
+    repaired = JsonArrayItemParser("experiences", repair=repair_json)
+    assert repaired.feed(text)[0] == {"title": "a"}
+    assert repaired.errors == 1
+
+
+def test_missing_key_yields_nothing():
+    parser = JsonArrayItemParser("experiences")
+    assert parser.feed('{"items": [{"title": "a"}]}') == []
+    assert not parser.started
@@ -0,0 +1,61 @@
+import pytest
+
+from app.schemas.experience_schema import Keyword
+from app.utils.keywords import KeywordIndex, best_keyword, normalize_keyword_name, rank_keywords, terms
+
+KEYWORDS = [
+    Keyword(id=1, name="Spring Boot"),
+    Keyword(id=2, name="Redis"),
+    Keyword(id=3, name="성능 개선"),
+    Keyword(id=4, name="협업"),
+]
+
+
+def test_terms_split_hangul_into_bigrams():
+    assert terms("Redis 캐시를 적용") == ["redis", "캐시", "시를", "적용"]
+    assert terms("a 가") == ["a", "가"]
+    assert normalize_keyword_name(" Spring-Boot! ") == "springboot"
+
+
+def test_duplicate_ids_are_rejected():
+    with pytest.raises(ValueError):
+        KeywordIndex([Keyword(id=1, name="a"), Keyword(id=1, name="b")])
+
+
+def test_match_by_id_name_and_similarity():
+    index = KeywordIndex(KEYWORDS)
+    assert len(index) == 4
+    assert index.match({"id": 2, "name": "Redis"}).id == 2
+    assert index.match({"id": "2"}).id == 2
+    # ID 가 틀리면 이름으로
+    assert index.match({"id": 1, "name": "redis"}).id == 2
+    assert index.match({"id": 99, "name": "springboot"}).id == 1
+    # 이름 유사도
+    assert index.match({"name": "Spring Bot"}).id == 1
+    # 이름이 전혀 다르면 ID 로
+    assert index.match({"id": 4, "name": "팀워크"}).id == 4
+    assert index.match({"id": 99, "name": "Kafka"}) is None
+    assert index.match("Redis") is None
+
+
+def test_reconcile_drops_unknown_and_duplicates():
+    index = KeywordIndex(KEYWORDS)
+    result = index.reconcile([
+        {"id": 2, "name": "Redis"}, {"name": "redis"}, {"id": 99, "name": "Kafka"}, {"id": 3, "name": "성능개선"},
+    ])
+    assert [keyword.id for keyword in result] == [2, 3]
+    assert index.reconcile(None) == []
+
+
+def test_rank_keywords_keeps_original_order():
+    content = "Redis 캐시로 응답 성능을 개선했다. 성능 개선 효과를 측정했다.\n팀원과 코드 리뷰를 했다."
+    ranked = rank_keywords(content, KEYWORDS, 2)
+    assert [keyword.id for keyword in ranked] == [2, 3]
+    assert rank_keywords(content, KEYWORDS, 0) == KEYWORDS
+    assert rank_keywords(content, KEYWORDS[:2], 2) == KEYWORDS[:2]
+    assert rank_keywords("   ", KEYWORDS, 2) == KEYWORDS[:2]
+
+
+def test_best_keyword_requires_overlap():
+    assert best_keyword("Redis 캐시 도입", KEYWORDS).id == 2
+    assert best_keyword("문서를 정리했다", KEYWORDS) is None
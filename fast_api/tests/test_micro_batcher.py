@@ -0,0 +1,52 @@
+import asyncio
+
+from app.utils.micro_batcher import MicroBatcher
+
+
+def test_flushes_when_batch_is_full():
+    batches = []
+
+    async def batch_func(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        # 창이 길어도 max_size 개가 모이면 기다리지 않고 바로 처리
+        batcher = MicroBatcher(batch_func, window_seconds=10, max_size=3)
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(3))), 1)
+
+    assert asyncio.run(scenario()) == [0, 2, 4]
+    assert batches == [[0, 1, 2]]
+
+
+def test_flushes_after_window():
+    batches = []
+
+    async def batch_func(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(batch_func, window_seconds=0.02, max_size=10)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+        assert not batcher._tasks
+        return results
+
+    assert asyncio.run(scenario()) == [0, 2, 4]
+    assert batches == [[0, 1, 2]]
+
+
+def test_failure_reaches_every_caller():
+    async def batch_func(items):
+        raise RuntimeError("모델 오류")
+
+    async def mismatched(items):
+        return items[:1]
+
+    async def scenario(func):
+        batcher = MicroBatcher(func, window_seconds=0.01, max_size=10)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(scenario(batch_func)))
+    # 결과 수가 요청 수와 다르면 일부 호출자가 영원히 기다리지 않도록 모두 실패
+    assert all(isinstance(result, ValueError) for result in asyncio.run(scenario(mismatched)))
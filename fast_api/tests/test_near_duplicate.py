@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.cache.near_duplicate import MinHasher, NearDuplicateIndex, estimate_similarity, shingles
+
+TEXT = "로그인 API 에 토큰 갱신 로직을 추가하고 만료된 세션을 정리하는 배치 작업을 구현했다. 응답 시간이 30% 줄었다."
+
+
+def make_settings(tmp_path, **overrides):
+    values = dict(
+        CACHE_ENABLED=True, NEAR_DUPLICATE_ENABLED=True, NEAR_DUPLICATE_THRESHOLD=0.85,
+        NEAR_DUPLICATE_MIN_CHARS=40, NEAR_DUPLICATE_MAX_ENTRIES=100, NEAR_DUPLICATE_NUM_PERM=128,
+        NEAR_DUPLICATE_BANDS=16, NEAR_DUPLICATE_DB_PATH=str(tmp_path / "near_duplicate.db"),
+        CACHE_TTL_SECONDS=3600, CACHE_TITLE_ENABLED=True, CACHE_EXPERIENCE_ENABLED=True,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_shingles_ignore_spacing_and_punctuation():
+    assert shingles("로그인 API, 개선!") == shingles("로그인API개선")
+    assert shingles("") == set()
+    assert shingles("ab") == {"ab"}
+
+
+def test_signature_is_deterministic_and_estimates_similarity():
+    hasher = MinHasher(128)
+    signature = hasher.signature(shingles(TEXT))
+    assert signature == MinHasher(128).signature(shingles(TEXT))
+    assert estimate_similarity(signature, signature) == 1.0
+    other = hasher.signature(shingles("회고록 map-reduce 생성을 위해 구간 요약 저장소를 만들었다. 비용이 줄었다."))
+    assert estimate_similarity(signature, other) < 0.2
+    assert hasher.signature(set()) == MinHasher(128).signature(set())
+
+
+def test_query_finds_near_duplicates_only(tmp_path):
+    index = NearDuplicateIndex(make_settings(tmp_path))
+
+    async def scenario():
+        await index.add("title", "scope", TEXT, "토큰 갱신 구현")
+        near = await index.query("title", "scope", TEXT.replace("했다.", "했다"))
+        other_scope = await index.query("title", "other", TEXT)
+        unrelated = await index.query("title", "scope", "전혀 다른 내용의 개발일지입니다. 오늘은 배포 파이프라인을 정리했습니다.")
+        return near, other_scope, unrelated
+
+    near, other_scope, unrelated = asyncio.run(scenario())
+    assert near and near[0][1] == "토큰 갱신 구현"
+    assert other_scope == []
+    assert unrelated == []
+
+
+def test_entries_are_reloaded_from_disk(tmp_path):
+    settings = make_settings(tmp_path)
+    asyncio.run(NearDuplicateIndex(settings).add("title", "scope", TEXT, "토큰 갱신 구현"))
+    matches = asyncio.run(NearDuplicateIndex(settings).query("title", "scope", TEXT))
+    assert matches[0][1] == "토큰 갱신 구현"
+
+
+def test_disabled_by_global_cache_switch_and_min_chars(tmp_path):
+    disabled = NearDuplicateIndex(make_settings(tmp_path, CACHE_ENABLED=False))
+    assert not disabled.is_enabled("title")
+    index = NearDuplicateIndex(make_settings(tmp_path))
+
+    async def scenario():
+        await index.add("title", "scope", "짧은 입력", "제목")
+        return await index.query("title", "scope", "짧은 입력")
+
+    assert asyncio.run(scenario()) == []
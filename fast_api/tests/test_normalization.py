@@ -0,0 +1,71 @@
+import random
+import re
+
+from app.utils.normalization import (
+    normalize_body,
+    normalize_experience,
+    normalize_retrospective,
+    normalize_title,
+    truncate,
+)
+
+
+def baseline_clean_response(text, max_length=30):
+    # 정규식으로 구현된 기존 DevLogSummaryService.clean_response
+    first_line = text.strip().split('\n')[0]
+    text = re.sub(r'^\d+\.?\s*', '', first_line)
+    text = re.sub('[a-zA-Z]', '', text)
+    text = re.sub(r'[-=+#/\?:^$.@*\"※~&%ㆍ!』\|\(\)\[\]\<\>`\'…》]', '', text)
+    text = text.replace('.', '')
+    text = re.sub(r'\s+', ' ', text)
+    if len(text) > max_length:
+        truncated = text[:max_length]
+        last_comma = truncated.rfind(',')
+        if last_comma != -1 and last_comma > max_length * 0.5:
+            text = text[:last_comma].strip()
+        else:
+            last_space = truncated.rfind(' ')
+            if last_space != -1 and last_space > max_length * 0.5:
+                text = text[:last_space].strip()
+            else:
+                text = truncated.strip()
+    return text
+
+
+def test_title_matches_baseline_on_random_inputs():
+    alphabet = list("가나다라 마바사,.0123456789abcXYZ!?-()[]\"'…》』ㆍ※\n\t　 ١٢０")
+    generator = random.Random(0)
+    for _ in range(20000):
+        text = "".join(generator.choice(alphabet) for _ in range(generator.randint(0, 80)))
+        max_length = generator.choice([10, 30, 35])
+        assert normalize_title(text, max_length) == baseline_clean_response(text, max_length)
+
+
+def test_title_examples():
+    assert normalize_title("1. 로그인 API 개발 완료!\n설명") == "로그인 개발 완료"
+    assert normalize_title("회원가입 기능 구현 !", 30) == "회원가입 기능 구현 "
+    assert normalize_title("가나다라마바 사아자차카타, 파하가나다 라마바사아자", 20) == "가나다라마바 사아자차카타"
+
+
+def test_truncate_prefers_comma_then_space():
+    assert truncate("가나다라마바, 사아자차카", 10) == "가나다라마바"
+    assert truncate("가나다라마바 사아자차카", 10) == "가나다라마바"
+    assert truncate("가나다 라마바사아자차카", 10) == "가나다 라마바사아자"
+
+
+def test_truncate_sentence_boundary():
+    text = "첫 번째 문장입니다. 두 번째 문장은 길어서 잘립니다."
+    assert truncate(text, 18, sentence=True) == "첫 번째 문장입니다."
+    assert truncate("버전 1.2 를 사용했습니다 그리고 계속", 12, sentence=True) == "버전 1.2 를"
+
+
+def test_body_removes_control_chars_and_extra_blank_lines():
+    text = "﻿첫 줄\r\n\n\n\n둘째 줄  \n"
+    assert normalize_body(text) == "첫 줄\n\n둘째 줄"
+    assert normalize_retrospective("  회고  \n\n\n끝 ") == "회고\n\n끝"
+
+
+def test_experience_strips_markers_and_keeps_other_keys():
+    experience = {"title": '"** 성능 개선 **"', "content": "- 캐시 도입\n\n\n응답 시간 단축", "keywords": [1]}
+    normalized = normalize_experience(experience)
+    assert normalized == {"title": "성능 개선", "content": "캐시 도입\n\n응답 시간 단축", "keywords": [1]}
@@ -0,0 +1,60 @@
+from app.schemas.retrospective_schema import DailyLog, QnAPair
+from app.utils.prompt_compaction import (
+    compact_daily_logs, compact_qna, estimate_tokens, find_common_questions, measure_savings,
+)
+
+
+def make_log(date, answers, summary="제목"):
+    return DailyLog(date=date, summary=summary, daily_log=[QnAPair(question=q, answer=a) for q, a in answers])
+
+
+LOGS = [
+    make_log("2024-01-01", [("오늘 한 일은?", "로그인 구현"), ("어려웠던 점은?", "토큰  만료\n처리"), ("기타", "회의")]),
+    make_log("2024-01-02", [("오늘 한 일은?", "배치 작업"), ("어려웠던 점은?", "")]),
+    make_log("2024-01-03", [("오늘 한 일은?", "캐시 적용"), ("어려웠던 점은?", "TTL 설정")]),
+]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("가나다") == 3
+    assert estimate_tokens("abcde") == 2
+    assert estimate_tokens("가 abc") == 2
+
+
+def test_find_common_questions():
+    assert find_common_questions(LOGS) == ["오늘 한 일은?", "어려웠던 점은?"]
+    assert find_common_questions(LOGS, min_share=1.0) == ["오늘 한 일은?"]
+    assert find_common_questions(LOGS[:1]) == []
+
+
+def test_compact_daily_logs():
+    assert compact_daily_logs(LOGS).split("\n") == [
+        "[공통 질문]",
+        "Q1. 오늘 한 일은?",
+        "Q2. 어려웠던 점은?",
+        "(각 일자의 Q번호 뒤에 해당 질문의 답변을 기록, 답변이 없는 질문은 생략)",
+        "",
+        "날짜: 2024-01-01 | 제목: 제목",
+        "Q1: 로그인 구현",
+        "Q2: 토큰 만료 처리",
+        "기타: 회의",
+        "",
+        "날짜: 2024-01-02 | 제목: 제목",
+        "Q1: 배치 작업",
+        "",
+        "날짜: 2024-01-03 | 제목: 제목",
+        "Q1: 캐시 적용",
+        "Q2: TTL 설정",
+    ]
+
+
+def test_compact_qna_and_savings():
+    qna = [{"question": "역할은?", "answer": " 백엔드\n개발 "}, {"question": "기간은?", "answer": ""}]
+    assert compact_qna(qna) == "- 역할은?: 백엔드 개발"
+
+    stats = measure_savings("가나다라", "가나")
+    assert stats.original_tokens == 4 and stats.compact_tokens == 2
+    assert stats.saved_ratio == 0.5
+    assert "50% 절감" in str(stats)
+    assert measure_savings("", "").saved_ratio == 0.0
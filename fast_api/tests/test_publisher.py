@@ -0,0 +1,82 @@
+import asyncio
+
+import aio_pika
+import pytest
+from aio_pika.exceptions import DeliveryError
+
+from app.rabbitmq.publisher import ResponsePublisher
+
+from fake_rabbitmq import FakeConnection, publisher_settings
+
+
+def message(n):
+    return aio_pika.Message(body=str(n).encode())
+
+
+def test_publishes_over_confirm_channel_pool():
+    connection = FakeConnection()
+
+    async def scenario():
+        publisher = ResponsePublisher(publisher_settings(channels=2, batch_size=3))
+        await publisher.start(connection)
+        await asyncio.gather(*(publisher.publish(message(n), f"reply-{n}") for n in range(5)))
+        await publisher.stop()
+        return publisher
+
+    publisher = asyncio.run(scenario())
+    assert sorted(key for key, _ in connection.published) == [f"reply-{n}" for n in range(5)]
+    assert (publisher.published, publisher.failed) == (5, 0)
+    assert len(connection.channels) == 2
+    assert all(channel.publisher_confirms and channel.is_closed for channel in connection.channels)
+
+
+def test_confirm_failure_reaches_only_its_caller():
+    connection = FakeConnection()
+    # 묶음의 첫 메시지만 브로커가 거부 (nack)
+    connection.publish_errors = [DeliveryError(None, None), None, None]
+
+    async def scenario():
+        publisher = ResponsePublisher(publisher_settings(channels=2, batch_size=3))
+        await publisher.start(connection)
+        results = await asyncio.gather(
+            *(publisher.publish(message(n), f"reply-{n}") for n in range(3)), return_exceptions=True
+        )
+        # 실패 후에도 발행 태스크는 계속 동작
+        await publisher.publish(message(9), "reply-9")
+        await publisher.stop()
+        return publisher, results
+
+    publisher, results = asyncio.run(scenario())
+    assert isinstance(results[0], DeliveryError)
+    assert results[1:] == [None, None]
+    assert (publisher.published, publisher.failed) == (3, 1)
+
+
+def test_closed_channels_are_reopened_or_fail_the_batch():
+    connection = FakeConnection()
+
+    async def scenario():
+        publisher = ResponsePublisher(publisher_settings(channels=2))
+        await publisher.start(connection)
+        for channel in connection.channels:
+            channel.is_closed = True
+        await publisher.publish(message(1), "reply-1")
+        assert len(connection.channels) == 4
+
+        # 연결이 끊겨 채널을 열 수 없으면 그 묶음만 실패
+        for channel in connection.channels:
+            channel.is_closed = True
+        connection.is_closed = True
+        with pytest.raises(RuntimeError):
+            await publisher.publish(message(2), "reply-2")
+        assert not publisher._task.done()
+        await publisher.stop()
+
+    asyncio.run(scenario())
+    assert [key for key, _ in connection.published] == ["reply-1"]
+
+
+def test_publish_before_start_fails():
+    publisher = ResponsePublisher(publisher_settings())
+    with pytest.raises(RuntimeError):
+        asyncio.run(publisher.publish(message(1), "reply-1"))
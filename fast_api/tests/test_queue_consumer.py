@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+from app.rabbitmq.consumer import QueueConsumer
+from app.rabbitmq.publisher import ResponsePublisher
+from app.rabbitmq.retry import RETRY_ATTEMPT_HEADER, RetryableError, RetryScheduler
+
+from fake_rabbitmq import FakeConnection, FakeMessage, publisher_settings, retry_settings
+
+
+async def start_consumer(connection, handler, concurrency=2, prefetch=None, retry=None):
+    publisher = ResponsePublisher(publisher_settings())
+    await publisher.start(connection)
+    if retry is not None:
+        await retry.start(connection)
+    consumer = QueueConsumer("titleQueue", handler, concurrency, publisher, prefetch, retry)
+    await consumer.start(await connection.channel())
+    return consumer, publisher
+
+
+def test_prefetch_defaults_to_concurrency():
+    connection = FakeConnection()
+
+    async def handler(body):
+        return None
+
+    async def scenario():
+        first, _ = await start_consumer(connection, handler, concurrency=3)
+        second, _ = await start_consumer(connection, handler, concurrency=3, prefetch=8)
+        return first.channel.prefetch_count, second.channel.prefetch_count
+
+    assert asyncio.run(scenario()) == (3, 8)
+    assert connection.queues["titleQueue"]["durable"] is True
+
+
+def test_semaphore_limits_concurrent_handlers():
+    connection = FakeConnection()
+    running = 0
+    peak = 0
+
+    async def handler(body):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"result": json.loads(body)["n"]}
+
+    async def scenario():
+        consumer, publisher = await start_consumer(connection, handler, concurrency=2, prefetch=10)
+        callback = connection.consumers["titleQueue"].callback
+        messages = [FakeMessage(json.dumps({"n": n}).encode(), correlation_id=f"c-{n}") for n in range(6)]
+        await asyncio.gather(*(callback(message) for message in messages))
+        await publisher.stop()
+        return messages
+
+    messages = asyncio.run(scenario())
+    assert peak == 2
+    assert all(message.acked.is_set() for message in messages)
+    replies = {message.correlation_id: json.loads(message.body) for _, message in connection.published}
+    assert replies == {f"c-{n}": {"result": n} for n in range(6)}
+
+
+def test_retryable_error_goes_to_delay_queue_and_acks():
+    connection = FakeConnection()
+
+    async def handler(body):
+        raise RetryableError("ThrottlingException")
+
+    async def scenario():
+        _, publisher = await start_consumer(connection, handler, retry=RetryScheduler(retry_settings()))
+        message = FakeMessage()
+        await connection.consumers["titleQueue"].callback(message)
+        await publisher.stop()
+        return message
+
+    message = asyncio.run(scenario())
+    assert message.acked.is_set()
+    # 응답 대신 지연 큐로만 재발행
+    assert [(key, published.headers) for key, published in connection.published] == [
+        ("titleQueue.retry.1", {RETRY_ATTEMPT_HEADER: 1}),
+    ]
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.bedrock.rate_limiter import AdaptiveRateLimiter, Priority, estimate_payload_tokens
+
+
+def make_limiter(**overrides):
+    values = dict(
+        BEDROCK_REQUESTS_PER_MINUTE=600, BEDROCK_TOKENS_PER_MINUTE=60000,
+        BEDROCK_RATE_LIMIT_MIN_RATIO=0.1, BEDROCK_RATE_LIMIT_RECOVERY_STEP=0.1,
+    )
+    values.update(overrides)
+    return AdaptiveRateLimiter(SimpleNamespace(**values))
+
+
+def test_estimate_payload_tokens():
+    payload = {
+        "max_tokens": 100,
+        "messages": [
+            {"role": "user", "content": "가나다"},
+            {"role": "user", "content": [{"type": "text", "text": "abcdefgh"}, {"type": "image"}]},
+        ],
+    }
+    assert estimate_payload_tokens(payload) == 3 + 2 + 100
+    assert estimate_payload_tokens({}) == 0
+
+
+def test_throttle_halves_ratio_and_success_recovers():
+    limiter = make_limiter()
+    limiter.record_throttle()
+    assert limiter.ratio == 0.5 and limiter.throttled == 1
+    assert limiter.requests.level <= 0
+    for _ in range(10):
+        limiter.record_throttle()
+    assert limiter.ratio == 0.1
+    for _ in range(20):
+        limiter.record_success(10)
+    assert limiter.ratio == 1.0
+
+
+def test_record_success_corrects_token_estimate():
+    limiter = make_limiter()
+    limiter.tokens.level = 1000
+    limiter.record_success(500, used_tokens=200)
+    assert limiter.tokens.level == 1300
+    limiter.tokens.level = limiter.tokens.capacity - 100
+    limiter.record_success(500, used_tokens=0)
+    assert limiter.tokens.level == limiter.tokens.capacity
+
+
+def test_acquire_passes_immediately_within_budget():
+    limiter = make_limiter()
+
+    async def scenario():
+        await asyncio.wait_for(limiter.acquire(100), 0.5)
+        # 버킷 용량보다 큰 요청도 용량만큼만 차감되어 통과
+        await asyncio.wait_for(limiter.acquire(10 ** 9), 0.5)
+
+    asyncio.run(scenario())
+    assert limiter.waiting == 0
+
+
+def test_waiters_are_released_in_priority_order():
+    # 초당 요청 1건 (버킷 용량 10건)
+    limiter = make_limiter(BEDROCK_REQUESTS_PER_MINUTE=60)
+    limiter.requests.level = 0
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(1, priority)
+        order.append(name)
+
+    async def scenario():
+        tasks = [asyncio.create_task(request("bulk-1", Priority.BULK))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("bulk-2", Priority.BULK)))
+        tasks.append(asyncio.create_task(request("interactive", Priority.INTERACTIVE)))
+        await asyncio.sleep(0)
+        assert limiter.waiting == 3
+        # 먼저 온 BULK 가 이미 맨 앞에 있어도 INTERACTIVE 가 앞지름
+        limiter.requests.level = 3
+        limiter._dispatch()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert order == ["interactive", "bulk-1", "bulk-2"]
+
+
+def test_cancelled_waiter_is_removed():
+    limiter = make_limiter(BEDROCK_REQUESTS_PER_MINUTE=60)
+    limiter.requests.level = 0
+
+    async def scenario():
+        task = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert limiter.waiting == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,184 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.bedrock.rate_limiter import Priority
+from app.cache.singleflight import SingleFlight
+from app.schemas.retrospective_schema import DailyLog, QnAPair
+from app.services import retrospective_state
+from app.services.retrospective_service import RetrospectiveService
+from app.services.retrospective_state import RetrospectiveStateStore
+
+
+class FakeInvoker:
+    """프롬프트 종류(map / reduce / single)와 우선순위를 기록하고 고정된 텍스트로 응답"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _kind(self, payload):
+        prompt = payload["messages"][0]["content"]
+        if "요약해주세요" in prompt:
+            return "map"
+        if "여러 구간으로 나누어 요약한" in prompt:
+            return "reduce"
+        return "single"
+
+    async def invoke(self, model_id, payload, priority=Priority.BULK, service=None):
+        kind = self._kind(payload)
+        self.calls.append((kind, priority))
+        return {"content": [{"type": "text", "text": f"{kind} 결과 {len(self.calls)}"}]}
+
+    async def invoke_stream(self, model_id, payload, priority=Priority.BULK, service=None):
+        self.calls.append((self._kind(payload), priority))
+        for text in ("회고록 ", "스트림"):
+            yield {"type": "content_block_delta", "delta": {"text": text}}
+
+
+class FakeCache:
+    async def get(self, namespace, key):
+        return None
+
+    async def set(self, namespace, key, value):
+        pass
+
+
+class FakeState:
+    def __init__(self):
+        self.summaries = {}
+        self.saved = []
+
+    async def get_summaries(self, content_hashes):
+        return {key: self.summaries[key] for key in content_hashes if key in self.summaries}
+
+    async def save(self, windows, project_id=None, keep_hashes=()):
+        self.saved.append((project_id, [window["content_hash"] for window in windows], list(keep_hashes)))
+        self.summaries.update({window["content_hash"]: window["summary"] for window in windows})
+
+
+def make_service(threshold=100000, window_max_chars=100000, state=None):
+    service = RetrospectiveService.__new__(RetrospectiveService)
+    invoker = FakeInvoker()
+    service.registry = SimpleNamespace(get_invoker=lambda: invoker)
+    service.model_id = "test-model"
+    service.cache = FakeCache()
+    service.singleflight = SingleFlight()
+    service.map_reduce_threshold = threshold
+    service.window_max_chars = window_max_chars
+    service.map_concurrency = 2
+    service.state = state or FakeState()
+    service.prompt_compaction = True
+    return service, invoker
+
+
+def make_logs(count, answer="작업 내용 " * 20):
+    return [
+        DailyLog(
+            date=f"2024-01-{day:02d}", summary=f"{day}일차",
+            daily_log=[QnAPair(question="오늘 한 일은?", answer=f"{day}일 {answer}")],
+        )
+        for day in range(1, count + 1)
+    ]
+
+
+def test_stream_uses_interactive_priority_for_map_and_reduce():
+    service, invoker = make_service(threshold=100, window_max_chars=500)
+
+    async def scenario():
+        return [text async for text in service.stream_retrospective(make_logs(6))]
+
+    assert asyncio.run(scenario()) == ["회고록 ", "스트림"]
+    assert {kind for kind, _ in invoker.calls} == {"map", "reduce"}
+    assert {priority for _, priority in invoker.calls} == {Priority.INTERACTIVE}
+
+
+def test_generate_uses_bulk_priority():
+    service, invoker = make_service(threshold=100, window_max_chars=500)
+    asyncio.run(service.generate_retrospective(make_logs(6)))
+    assert {priority for _, priority in invoker.calls} == {Priority.BULK}
+
+
+def test_below_threshold_uses_single_call_without_state():
+    state = FakeState()
+    service, invoker = make_service(threshold=100000, state=state)
+    result = asyncio.run(service.generate_retrospective(make_logs(3), "p1"))
+    assert result == "single 결과 1"
+    assert invoker.calls == [("single", Priority.BULK)]
+    assert state.saved == []
+
+
+def test_split_windows_keeps_date_order_and_size_limit():
+    service, _ = make_service(window_max_chars=500)
+    logs = make_logs(6)
+    windows = service._split_windows(list(reversed(logs)))
+    assert [log for window in windows for log in window] == logs
+    assert len(windows) > 1
+    for window in windows:
+        # 구간 크기는 일자별 개발일지 글자 수의 합으로 계산
+        size = sum(len(part) for log in window for part in service._format_logs([log]))
+        assert size <= service.window_max_chars or len(window) == 1
+
+
+def test_map_reduce_summarizes_each_window_and_reduces_in_order():
+    service, invoker = make_service(threshold=100, window_max_chars=500)
+    logs = make_logs(6)
+    windows = service._split_windows(logs)
+    result = asyncio.run(service.generate_retrospective(logs))
+
+    kinds = [kind for kind, _ in invoker.calls]
+    assert kinds == ["map"] * len(windows) + ["reduce"]
+    assert result == f"reduce 결과 {len(windows) + 1}"
+
+    prompt = service._create_reduce_prompt(windows, ["첫 요약", "둘째 요약"] + ["요약"] * (len(windows) - 2))
+    assert prompt.index("첫 요약") < prompt.index("둘째 요약")
+    assert f"기간: {windows[0][0].date} ~ {windows[0][-1].date}" in prompt
+
+
+def test_only_new_window_is_summarized_again():
+    state = FakeState()
+    service, invoker = make_service(threshold=100, window_max_chars=500, state=state)
+    logs = make_logs(9)
+    first_windows = service._split_windows(logs[:8])
+    asyncio.run(service._summarize_windows(first_windows, "p1"))
+    invoker.calls.clear()
+
+    windows = service._split_windows(logs)
+    summaries = asyncio.run(service._summarize_windows(windows, "p1"))
+    assert len(summaries) == len(windows)
+    # 앞 구간은 그대로이고 마지막 구간만 바뀌어 다시 요약
+    assert windows[:-1] == first_windows[:-1]
+    assert [kind for kind, _ in invoker.calls] == ["map"]
+    # 재사용한 구간을 포함해 현재 구간을 모두 이 프로젝트 것으로 저장
+    project_id, saved, keep = state.saved[-1]
+    assert project_id == "p1"
+    assert saved == keep == [service._window_key(window) for window in windows]
+
+
+@pytest.fixture
+def state_store(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'state.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(retrospective_state, "engine", engine)
+    monkeypatch.setattr(retrospective_state, "SessionLocal", sessionmaker(bind=engine))
+    return RetrospectiveStateStore(SimpleNamespace(
+        RETROSPECTIVE_STATE_ENABLED=True, RETROSPECTIVE_STATE_TTL_SECONDS=3600, RETROSPECTIVE_STATE_MAX_UNOWNED=100,
+    ))
+
+
+def test_projects_share_window_summaries_without_pruning_each_other(state_store):
+    service, invoker = make_service(threshold=100, window_max_chars=500, state=state_store)
+    logs = make_logs(6)
+    windows = service._split_windows(logs)
+
+    asyncio.run(service._summarize_windows(windows, "p1"))
+    assert len(invoker.calls) == len(windows)
+    # 같은 개발일지의 다른 프로젝트는 저장된 요약을 재사용
+    asyncio.run(service._summarize_windows(windows, "p2"))
+    assert len(invoker.calls) == len(windows)
+
+    # p1 의 개발일지가 바뀌어 이전 구간을 정리해도 p2 가 사용하는 요약은 유지
+    asyncio.run(service._summarize_windows(service._split_windows(make_logs(6, answer="다른 내용 " * 20)), "p1"))
+    stored = asyncio.run(state_store.get_summaries([service._window_key(window) for window in windows]))
+    assert len(stored) == len(windows)
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.retrospective_window import UNOWNED, RetrospectiveWindow, utcnow
+from app.services import retrospective_state
+from app.services.retrospective_state import RetrospectiveStateStore
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'state.db'}", connect_args={"check_same_thread": False})
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(retrospective_state, "engine", engine)
+    monkeypatch.setattr(retrospective_state, "SessionLocal", factory)
+    return factory
+
+
+def make_store(**overrides):
+    values = dict(
+        RETROSPECTIVE_STATE_ENABLED=True,
+        RETROSPECTIVE_STATE_TTL_SECONDS=3600,
+        RETROSPECTIVE_STATE_MAX_UNOWNED=100,
+    )
+    values.update(overrides)
+    return RetrospectiveStateStore(SimpleNamespace(**values))
+
+
+def window(content_hash, summary=None):
+    return {
+        "content_hash": content_hash, "start_date": "2024-01-01", "end_date": "2024-01-07",
+        "log_count": 7, "summary": summary or f"{content_hash} 요약",
+    }
+
+
+def rows(factory):
+    with factory() as db:
+        return sorted((row.project_id, row.content_hash) for row in db.query(RetrospectiveWindow).all())
+
+
+def test_summaries_are_shared_across_projects(session_factory):
+    store = make_store()
+
+    async def scenario():
+        await store.save([window("a"), window("b")], "p1", ["a", "b"])
+        return await store.get_summaries(["a", "b", "c"])
+
+    assert asyncio.run(scenario()) == {"a": "a 요약", "b": "b 요약"}
+
+
+def test_prune_keeps_windows_another_project_still_uses(session_factory):
+    store = make_store()
+
+    async def scenario():
+        await store.save([window("a"), window("b")], "p1", ["a", "b"])
+        # p2 가 p1 이 만든 a 를 재사용
+        await store.save([window("a")], "p2", ["a"])
+        # p1 의 구간이 바뀌어 a 를 더 이상 사용하지 않음
+        await store.save([window("b"), window("c")], "p1", ["b", "c"])
+        return await store.get_summaries(["a"])
+
+    assert asyncio.run(scenario()) == {"a": "a 요약"}
+    assert rows(session_factory) == [("p1", "b"), ("p1", "c"), ("p2", "a")]
+
+
+def test_unowned_windows_are_capped_and_expire(session_factory):
+    store = make_store(RETROSPECTIVE_STATE_MAX_UNOWNED=2)
+
+    async def scenario():
+        await store.save([window("old")], None, ["old"])
+        await store.save([window("mid")], None, ["mid"])
+        await store.save([window("new")], None, ["new"])
+
+    asyncio.run(scenario())
+    assert rows(session_factory) == [(UNOWNED, "mid"), (UNOWNED, "new")]
+
+    with session_factory() as db:
+        db.query(RetrospectiveWindow).filter(RetrospectiveWindow.content_hash == "mid").update(
+            {"used_at": utcnow() - timedelta(hours=2)}
+        )
+        db.commit()
+    asyncio.run(store.save([window("new")], None, ["new"]))
+    assert rows(session_factory) == [(UNOWNED, "new")]
+
+
+def test_disabled_store_does_nothing(session_factory):
+    store = make_store(RETROSPECTIVE_STATE_ENABLED=False)
+
+    async def scenario():
+        await store.save([window("a")], "p1", ["a"])
+        return await store.get_summaries(["a"])
+
+    assert asyncio.run(scenario()) == {}
+    assert not store._ready
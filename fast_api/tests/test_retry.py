@@ -0,0 +1,124 @@
+import asyncio
+from types import SimpleNamespace
+
+from botocore.exceptions import (
+    ClientError, ConnectTimeoutError, EndpointConnectionError, NoCredentialsError, ReadTimeoutError,
+)
+from fastapi import HTTPException
+
+from app.bedrock.errors import BedrockStreamError
+from app.rabbitmq.publisher import ResponsePublisher
+from app.rabbitmq.retry import RETRY_ATTEMPT_HEADER, RetryScheduler, should_retry
+
+from fake_rabbitmq import FakeConnection, FakeMessage, publisher_settings, retry_settings
+
+
+def client_error(code, status):
+    return ClientError(
+        {"Error": {"Code": code, "Message": "x"}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        "InvokeModel",
+    )
+
+
+def wrapped(error):
+    # 서비스가 원래 오류를 HTTPException 으로 감싸는 방식
+    try:
+        try:
+            raise error
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException as e:
+        return e
+
+
+def test_retries_transient_bedrock_errors():
+    assert should_retry(client_error("ThrottlingException", 400))
+    assert should_retry(client_error("ServiceUnavailableException", 503))
+    assert should_retry(BedrockStreamError({"throttlingException": {"message": "slow down"}}))
+    assert should_retry(wrapped(client_error("ThrottlingException", 400)))
+
+
+def test_retries_botocore_timeouts():
+    assert should_retry(ReadTimeoutError(endpoint_url="https://bedrock"))
+    assert should_retry(ConnectTimeoutError(endpoint_url="https://bedrock"))
+    assert should_retry(EndpointConnectionError(endpoint_url="https://bedrock"))
+    assert should_retry(wrapped(ReadTimeoutError(endpoint_url="https://bedrock")))
+    assert not should_retry(NoCredentialsError())
+
+
+def test_does_not_retry_on_message_digits():
+    assert not should_retry(ValueError("회고 내용이 500자를 넘습니다"))
+    assert not should_retry(HTTPException(status_code=500, detail="모델 응답 처리 실패"))
+    assert not should_retry(wrapped(client_error("ValidationException", 400)))
+
+
+def test_delay_grows_exponentially_up_to_max():
+    scheduler = RetryScheduler(SimpleNamespace(
+        QUEUE_RETRY_MAX_ATTEMPTS=5, QUEUE_RETRY_BACKOFF_SECONDS=2, QUEUE_RETRY_MAX_BACKOFF_SECONDS=10,
+    ))
+    assert [scheduler.calculate_delay(attempt) for attempt in range(1, 5)] == [2, 4, 8, 10]
+    assert scheduler.delay_queue_name("titleQueue", 2) == "titleQueue.retry.2"
+
+
+def schedule(scheduler, message, connection, queue_name="titleQueue"):
+    async def scenario():
+        publisher = ResponsePublisher(publisher_settings())
+        await publisher.start(connection)
+        await scheduler.start(connection)
+        try:
+            return await scheduler.schedule(publisher, queue_name, message)
+        finally:
+            await publisher.stop()
+
+    return asyncio.run(scenario())
+
+
+def test_schedule_increments_attempt_header_until_cap():
+    scheduler = RetryScheduler(retry_settings(max_attempts=3))
+    connection = FakeConnection()
+    message = FakeMessage(b'{"data": 1}', headers={"trace": "t"}, correlation_id="c-9")
+
+    assert schedule(scheduler, message, connection) == 1
+    routing_key, published = connection.published[-1]
+    assert routing_key == "titleQueue.retry.1"
+    assert published.headers == {"trace": "t", RETRY_ATTEMPT_HEADER: 1}
+    assert (published.body, published.correlation_id, published.reply_to) == (
+        b'{"data": 1}', "c-9", "amq.rabbitmq.reply-to",
+    )
+
+    message.headers = published.headers
+    assert schedule(scheduler, message, connection) == 2
+    assert connection.published[-1][0] == "titleQueue.retry.2"
+
+    # 최대 재시도 횟수에 도달하면 더 이상 발행하지 않음
+    message.headers = connection.published[-1][1].headers
+    assert schedule(scheduler, message, connection) is None
+    assert len(connection.published) == 2
+
+
+def test_delay_queue_dead_letters_back_to_original_queue():
+    scheduler = RetryScheduler(retry_settings(backoff=2))
+    connection = FakeConnection()
+    schedule(scheduler, FakeMessage(headers={RETRY_ATTEMPT_HEADER: 1}), connection)
+    assert connection.queues["titleQueue.retry.2"] == {
+        "durable": True,
+        "arguments": {
+            "x-message-ttl": 4000,
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": "titleQueue",
+        },
+    }
+    # 지연 큐는 소비 채널이 아닌 재시도 전용 채널에서 선언
+    assert scheduler._channel in connection.channels and not scheduler._channel.publisher_confirms
+
+
+def test_existing_delay_queue_with_other_ttl_is_reused():
+    scheduler = RetryScheduler(retry_settings(backoff=2))
+    connection = FakeConnection()
+    connection.queues["titleQueue.retry.1"] = {"durable": True, "arguments": {"x-message-ttl": 1000}}
+
+    assert schedule(scheduler, FakeMessage(), connection) == 1
+    assert connection.queues["titleQueue.retry.1"]["arguments"] == {"x-message-ttl": 1000}
+    assert connection.published[-1][0] == "titleQueue.retry.1"
+    # 거부되어 닫힌 채널 대신 새 채널에서 확인
+    assert scheduler._channel is not None and not scheduler._channel.is_closed
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from app.cache.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "결과"
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        assert flight.in_flight == 0
+        return results
+
+    assert asyncio.run(scenario()) == ["결과"] * 5
+    assert calls == [1]
+    assert (flight.executed, flight.shared) == (1, 4)
+
+
+def test_exception_reaches_every_waiter_and_key_is_released():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("모델 오류")
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        assert "key" not in flight
+        # 실패한 키는 다음 호출에서 다시 실행
+        assert await flight.do("key", lambda: asyncio.sleep(0, result="재시도")) == "재시도"
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.executed == 2
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "결과"
+
+    async def scenario():
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "결과"
+
+
+def test_start_registers_without_awaiting():
+    flight = SingleFlight()
+
+    async def scenario():
+        task = flight.start("a", lambda: asyncio.sleep(0, result=1))
+        # 등록은 await 없이 바로 반영되어 같은 키는 같은 태스크를 받음
+        assert "a" in flight and "b" not in flight
+        assert flight.start("a", lambda: asyncio.sleep(0, result=2)) is task
+        return await task
+
+    assert asyncio.run(scenario()) == 1